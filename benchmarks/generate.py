@@ -0,0 +1,150 @@
+import math
+from datetime import datetime, timezone
+import numpy as np
+
+MU_EARTH_KM3_S2 = 398600.4418
+EARTH_RADIUS_KM = 6378.137
+
+# Power / storage settings given to every generated satellite
+DEFAULT_SATELLITE = {
+    "battery_wh": 1000.0,
+    "initial_battery_wh": 600.0,
+    "charge_rate_w": 400.0,
+    "imaging_power_w": 50.0,
+    "downlink_power_w": 40.0,
+    "idle_power_w": 5.0,
+    "storage_capacity_mb": 1000.0,
+    "initial_storage_mb": 0.0,
+    "downlink_bandwidth_mbps": 50.0,
+}
+
+
+def _checksum(line):
+    """TLE modulo-10 checksum: digits count their value, '-' counts 1."""
+    return sum(int(c) if c.isdigit() else c == "-" for c in line[:68]) % 10
+
+
+def _tle_epoch(epoch):
+    start = datetime(epoch.year, 1, 1, tzinfo=timezone.utc)
+    day = (epoch - start).total_seconds() / 86400.0 + 1.0
+    return f"{epoch.year % 100:02d}{day:012.8f}"
+
+
+def make_tle(catnum, epoch, inclination_deg, raan_deg, mean_anomaly_deg, altitude_km,
+             eccentricity=0.0001, arg_perigee_deg=0.0):
+    """
+    A syntactically valid two-line element set for a near-circular orbit.
+
+    Args:
+        catnum (int): Catalog number (1-99999).
+        epoch (datetime): TLE epoch (UTC).
+        inclination_deg, raan_deg, mean_anomaly_deg (float): Orbit angles.
+        altitude_km (float): Mean altitude above the equatorial radius.
+
+    Returns:
+        list: [line1, line2]
+    """
+    a = EARTH_RADIUS_KM + altitude_km
+    revs_per_day = math.sqrt(MU_EARTH_KM3_S2 / a ** 3) * 86400.0 / (2.0 * math.pi)
+    line1 = (f"1 {catnum:05d}U 25001A   {_tle_epoch(epoch)}  .00000000  00000-0  00000-0 0  999")
+    line2 = (f"2 {catnum:05d} {inclination_deg % 180:8.4f} {raan_deg % 360:8.4f} "
+             f"{round(eccentricity * 1e7):07d} {arg_perigee_deg % 360:8.4f} "
+             f"{mean_anomaly_deg % 360:8.4f} {revs_per_day:11.8f}    1")
+    return [line1 + str(_checksum(line1)), line2 + str(_checksum(line2))]
+
+
+def walker_delta(total, planes, phasing, inclination_deg, altitude_km, epoch, name_prefix="WD"):
+    """
+    Satellite configs for a Walker-delta constellation i:t/p/f.
+
+    Planes are spread evenly over 360 degrees of RAAN; satellites evenly
+    within each plane, offset by phasing * 360 / total degrees per plane.
+
+    Args:
+        total (int): Satellites t.
+        planes (int): Planes p (t is rounded down to a multiple of p).
+        phasing (int): Relative phasing f, 0 <= f < p.
+        inclination_deg (float): Inclination.
+        altitude_km (float): Circular altitude.
+        epoch (datetime): TLE epoch, normally the scenario start.
+
+    Returns:
+        list: Scenario satellite dicts (name, tle and DEFAULT_SATELLITE).
+    """
+    planes = max(1, min(planes, total))
+    per_plane = max(1, total // planes)
+    sats = []
+    for p in range(planes):
+        for k in range(per_plane):
+            n = len(sats)
+            anomaly = 360.0 * k / per_plane + 360.0 * phasing * p / (per_plane * planes)
+            tle = make_tle(n + 1, epoch, inclination_deg, 360.0 * p / planes, anomaly, altitude_km)
+            sats.append(dict(DEFAULT_SATELLITE, name=f"{name_prefix}-{p:02d}-{k:03d}", tle=tle))
+    return sats
+
+
+def _fibonacci_sphere(n, max_lat=90.0):
+    """n roughly evenly spaced (lat, lon) points, latitudes capped at +-max_lat."""
+    k = np.arange(n) + 0.5
+    lat = np.degrees(np.arcsin(1.0 - 2.0 * k / n)) * (max_lat / 90.0)
+    lon = (np.degrees(np.pi * (1.0 + 5.0 ** 0.5) * k) + 180.0) % 360.0 - 180.0
+    return lat, lon
+
+
+def generate_targets(count, layout="random", seed=0, max_lat=70.0):
+    """
+    Target catalog columns (see utils.catalog_loader.normalize_columns).
+
+    Args:
+        count (int): Targets M.
+        layout (str): 'random' (uniform over the sphere) or 'grid'
+            (Fibonacci lattice).
+        seed (int): Random seed for positions and priorities.
+        max_lat (float): Largest |latitude|.
+    """
+    rng = np.random.default_rng(seed)
+    if layout == "grid":
+        lat, lon = _fibonacci_sphere(count, max_lat)
+    elif layout == "random":
+        lat = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, count) * math.sin(math.radians(max_lat))))
+        lon = rng.uniform(-180.0, 180.0, count)
+    else:
+        raise ValueError(f"Unknown target layout '{layout}'; use 'random' or 'grid'")
+    return {
+        "name": np.array([f"T{j:06d}" for j in range(count)]),
+        "lat": lat,
+        "lon": lon,
+        "alt_m": np.zeros(count),
+        "priority": rng.integers(1, 6, count).astype(float),
+        "revisit_hours": np.full(count, 12.0),
+        "image_size_mb": np.full(count, 50.0),
+        "image_energy_wh": np.full(count, 5.0),
+    }
+
+
+def generate_stations(count, max_lat=78.0, antennas=1):
+    """`count` ground stations spread evenly over the globe (Fibonacci lattice)."""
+    lat, lon = _fibonacci_sphere(count, max_lat)
+    return [{"name": f"GS-{n:03d}", "lat": float(lat[n]), "lon": float(lon[n]), "alt_m": 0.0,
+             "antennas": antennas} for n in range(count)]
+
+
+def generate_scenario(sats, hours, stations=5, start_time="2025-07-17T00:00:00+00:00", timestep_sec=60,
+                      planes=None, inclination_deg=53.0, altitude_km=550.0):
+    """
+    A scenario dict with a Walker-delta constellation of `sats` satellites
+    (about sqrt(sats) planes by default, phasing 1) flying for `hours`.
+    """
+    epoch = datetime.fromisoformat(start_time)
+    # Largest plane count up to sqrt(sats) that divides the fleet evenly
+    planes = planes or max(p for p in range(1, int(math.sqrt(sats)) + 1) if sats % p == 0)
+    satellites = walker_delta(sats, planes, 1 % planes, inclination_deg, altitude_km, epoch)
+    return {
+        "start_time": start_time,
+        "duration_minutes": hours * 60.0,
+        "timestep_sec": timestep_sec,
+        "min_elevation_deg": 10,
+        "max_slew_angle_deg": 25,
+        "satellites": satellites,
+        "ground_stations": generate_stations(stations),
+    }
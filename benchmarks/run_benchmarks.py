@@ -0,0 +1,232 @@
+"""
+Scheduler benchmarks over synthetic Walker-delta constellations.
+
+Each case (satellites x targets x hours) runs in a fresh process so its
+peak RSS is its own. Results go to benchmarks/results/<date>-<commit>.json;
+pass --compare with an earlier file to flag regressions.
+
+    python benchmarks/run_benchmarks.py --preset quick
+    python benchmarks/run_benchmarks.py --sats 2,100 --targets 25,10000 --hours 3,24
+    python benchmarks/run_benchmarks.py --preset quick --compare benchmarks/results/<old>.json
+    python benchmarks/run_benchmarks.py --preset planner
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import yaml
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# (satellites, targets, hours) per case
+PRESETS = {
+    "quick": [(2, 25, 3), (10, 1000, 3), (50, 10000, 6)],
+    "full": [(2, 25, 3), (10, 1000, 24), (100, 10000, 24), (100, 100000, 24),
+             (1000, 10000, 24), (10, 1000, 168)],
+    # Imaging planner scale. It holds every opportunity (satellite step x
+    # target in view, ~44 bytes each) in memory.
+    "planner": [(50, 10000, 6), (100, 20000, 6), (200, 20000, 6), (50, 10000, 24), (100, 20000, 24)],
+}
+
+# Scenario settings of a preset's cases (--set overrides them)
+PRESET_SETTINGS = {
+    "planner": {"scheduler_mode": "planner"},
+}
+
+# Wall-time growth reported as a regression by --compare
+DEFAULT_THRESHOLD = 0.10
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def oracle_memory_mb(sats, steps, horizon_steps):
+    """
+    Megabytes held by an EnergyOracle for `sats` x `steps` once every
+    satellite has been queried at every step, as the scheduler does.
+    Uses a synthetic 95-step orbit, so no propagation is needed.
+    """
+    import numpy as np
+    from core.lookahead import EnergyOracle
+
+    sun = (np.arange(steps) % 95) < 60
+    gain = np.broadcast_to(np.where(sun, 1.0, 0.0), (sats, steps))
+    oracle = EnergyOracle(gain, np.full((sats, steps), 0.3), np.full(sats, 100.0), horizon_steps)
+    for step in range(0, steps, max(1, oracle.horizon_steps)):
+        for i in range(sats):
+            oracle.min_energy(i, step, 50.0, 1.0)
+    return oracle.nbytes / 1e6
+
+
+def run_case(sats, targets, hours, layout="random", stations=5, seed=0, overrides=None):
+    """
+    Generate one synthetic scenario and time run_simulation() on it.
+
+    Returns:
+        dict: Case parameters, wall / setup seconds, steps per second,
+        peak RSS, battery oracle megabytes (see oracle_memory_mb()),
+        output bytes, the run summary and per-phase counters.
+    """
+    from benchmarks.generate import generate_scenario, generate_targets
+    from core.lookahead import DEFAULT_HORIZON_MINUTES
+    from core.scheduler import run_simulation
+    from core.targets import TargetCatalog
+
+    t0 = time.perf_counter()
+    scenario = generate_scenario(sats, hours, stations=stations)
+    scenario.update(overrides or {})
+    scenario["profile"] = True
+    catalog = TargetCatalog.from_columns(generate_targets(targets, layout, seed))
+    setup = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "simulation_log.csv")
+        t0 = time.perf_counter()
+        with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+            summary = run_simulation(scenario, catalog, output_path)
+        wall = time.perf_counter() - t0
+        profile_path = os.path.splitext(output_path)[0] + "_profile.json"
+        with open(profile_path) as f:
+            phases = json.load(f)["phases"]
+        output_bytes = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)
+                           if os.path.join(tmp, name) != profile_path)
+
+    steps = int(scenario["duration_minutes"] * 60 / scenario["timestep_sec"])
+    return {
+        "case": f"{sats}sat-{targets}tgt-{hours:g}h",
+        "satellites": sats,
+        "targets": targets,
+        "hours": hours,
+        "steps": steps,
+        "setup_seconds": setup,
+        "wall_seconds": wall,
+        "steps_per_sec": steps / wall if wall > 0 else None,
+        "sat_steps_per_sec": steps * sats / wall if wall > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "oracle_mb": oracle_memory_mb(sats, steps, scenario.get("lookahead_horizon_minutes", DEFAULT_HORIZON_MINUTES)
+                                      * 60.0 / scenario["timestep_sec"]),
+        "output_bytes": output_bytes,
+        "summary": summary,
+        "phases": phases,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Wall-time ratio per case present in both runs.
+
+    Returns:
+        list: (case, old seconds, new seconds, ratio, regressed) tuples.
+    """
+    old = {c["case"]: c for c in baseline["cases"]}
+    rows = []
+    for case in results["cases"]:
+        prev = old.get(case["case"])
+        if prev is None:
+            continue
+        ratio = case["wall_seconds"] / prev["wall_seconds"] if prev["wall_seconds"] else float("inf")
+        rows.append((case["case"], prev["wall_seconds"], case["wall_seconds"], ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def _parse_list(value, cast):
+    return [cast(v) for v in value.split(",") if v.strip()] if value else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduler benchmarks on synthetic constellations")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick', help='Case matrix to run')
+    parser.add_argument('--sats', default=None, help='Comma-separated satellite counts (with --targets, --hours)')
+    parser.add_argument('--targets', default=None, help='Comma-separated target counts')
+    parser.add_argument('--hours', default=None, help='Comma-separated horizons in hours')
+    parser.add_argument('--layout', choices=['random', 'grid'], default='random', help='Target layout')
+    parser.add_argument('--stations', type=int, default=5, help='Ground stations')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the targets')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Scenario setting for every case, e.g. stepping=adaptive (repeatable)')
+    parser.add_argument('--output', default=None, help='Results JSON (default benchmarks/results/<date>-<commit>.json)')
+    parser.add_argument('--compare', default=None, metavar='JSON', help='Earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Slowdown reported as a regression (0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.sats or args.targets or args.hours:
+        cases = list(itertools.product(_parse_list(args.sats, int) or [2], _parse_list(args.targets, int) or [25],
+                                       _parse_list(args.hours, float) or [3]))
+    else:
+        cases = PRESETS[args.preset]
+    overrides = dict(PRESET_SETTINGS.get(args.preset, {}))
+    for item in args.set:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--set expects KEY=VALUE, got '{item}'")
+        overrides[key.strip()] = yaml.safe_load(value)
+
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": overrides,
+        "cases": [],
+    }
+    ctx = multiprocessing.get_context("spawn")
+    for sats, targets, hours in cases:
+        # A fresh process per case: peak RSS and caches are the case's own
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            case = pool.submit(run_case, sats, targets, hours, args.layout, args.stations, args.seed,
+                               overrides).result()
+        results["cases"].append(case)
+        print(f"⏱️ {case['case']:<24} {case['wall_seconds']:8.2f}s  {case['steps_per_sec']:9.1f} steps/s  "
+              f"{case['peak_rss_mb'] or 0:8.1f} MB peak  {case['oracle_mb']:7.1f} MB oracle  {case['output_bytes'] / 1e6:8.2f} MB out")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = 0
+        for case, old, new, ratio, regressed in compare(results, baseline, args.threshold):
+            regressions += regressed
+            print(f"{'🔺' if regressed else '  '} {case:<24} {old:8.2f}s -> {new:8.2f}s  x{ratio:.2f}")
+        if regressions:
+            print(f"⚠️ {regressions} case(s) slower than {baseline['commit']} by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
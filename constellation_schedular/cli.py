@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import yaml
+from utils.config_loader import load_scenario, load_yaml
+
+
+def _parse_grid(items):
+    """{key: [values]} from 'key=v1,v2,...' arguments; values are parsed as YAML scalars."""
+    grid = {}
+    for item in items or []:
+        key, sep, values = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--grid expects KEY=V1,V2,..., got '{item}'")
+        grid[key.strip()] = [yaml.safe_load(v) for v in values.split(",")]
+    return grid
+
+
+def sweep(args):
+    # Skyfield and NumPy are only imported once a command actually runs
+    from core.parallel import resolve_workers
+    from core.sweep import expand_variants, run_sweep
+    from core.targets import TargetCatalog
+
+    scenario = load_scenario(args.scenario)
+    # Variants edit targets one by one, so the sweep works on target dicts
+    targets = list(TargetCatalog.from_file(args.targets))
+    spec = load_yaml(args.sweep) if args.sweep else {}
+    grid = dict(spec.get("grid", {}))
+    grid.update(_parse_grid(args.grid))
+    distributions = spec.get("distributions", {})
+    samples = args.samples if args.samples is not None else spec.get("samples", 1)
+    seed = args.seed if args.seed is not None else spec.get("seed", 0)
+
+    variants = expand_variants(scenario, targets, grid, distributions, samples, seed)
+    print(f"🧪 Sweeping {len(variants)} variants of {args.scenario}")
+    rows = run_sweep(scenario, targets, variants, args.output_dir,
+                     workers=resolve_workers(args.workers), keep_logs=args.keep_logs)
+    best = max(rows, key=lambda r: r["priority_total"], default=None)
+    if best is not None:
+        print(f"🏆 Best priority total {best['priority_total']:.1f} from variant {best['variant']}")
+    print(f"✅ Sweep summary written to {os.path.join(args.output_dir, 'summary.csv')}")
+
+
+def trace(args):
+    from core.trace import Trace, REASONS
+
+    log = Trace(args.trace)
+    table = log.rejections(by=args.by, kind=args.kind)
+    print(f"🔎 {len(log)} events in {args.trace}; rejections by {args.by}")
+    reasons = [r for r in REASONS if any(r in counts for counts in table.values())]
+    width = max([len(args.by)] + [len(name) for name in table])
+    print(f"{args.by:<{width}}  " + "  ".join(f"{r:>9}" for r in reasons + ["total"]))
+    for name, counts in list(table.items())[:args.top]:
+        cells = [counts.get(r, 0) for r in reasons] + [sum(counts.values())]
+        print(f"{name:<{width}}  " + "  ".join(f"{n:>9}" for n in cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="constellation-schedular", description="Constellation Scheduler")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("sweep", help="Run scenario variants against one shared geometry")
+    p.add_argument('--scenario', default='scenario.yaml', help='Base scenario YAML file')
+    p.add_argument('--targets', default='targets.yaml', help='Target catalog (YAML, CSV, .npz or Parquet)')
+    p.add_argument('--sweep', default=None, metavar='YAML',
+                   help="Sweep file with 'grid', 'distributions', 'samples' and 'seed'")
+    p.add_argument('--grid', action='append', metavar='KEY=V1,V2',
+                   help='Grid values for one parameter (repeatable)')
+    p.add_argument('--samples', type=int, default=None, help='Monte Carlo draws per grid point')
+    p.add_argument('--seed', type=int, default=None, help='Random seed for the draws')
+    p.add_argument('--workers', type=int, default=None, metavar='N',
+                   help='Processes for the variant runs (0 = all cores)')
+    p.add_argument('--output-dir', default='outputs/sweep', help='Directory for summary.csv')
+    p.add_argument('--keep-logs', action='store_true', help='Keep every variant log under OUTPUT_DIR/runs')
+    p.set_defaults(func=sweep)
+
+    p = commands.add_parser("trace", help="Count rejection reasons in a decision trace")
+    p.add_argument('trace', help="Trace file written with 'trace' set (<log>_trace.npz)")
+    p.add_argument('--by', choices=['satellite', 'target'], default='satellite', help='Group counts by')
+    p.add_argument('--kind', choices=['image', 'downlink', 'candidate'], default=None,
+                   help='Only count this kind of event')
+    p.add_argument('--top', type=int, default=20, metavar='N', help='Show the N busiest rows')
+    p.set_defaults(func=trace)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import os
+import shutil
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from core.output import SpoolSink
+
+DEFAULT_WORKERS = 2
+# Jobs queued or running at once; further submissions are refused
+DEFAULT_MAX_PENDING = 8
+# Finished jobs kept for status and result requests, oldest dropped first
+# along with their output directory
+DEFAULT_MAX_FINISHED = 100
+DEFAULT_OUTPUT_ROOT = os.path.join("outputs", "jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit() when the pending limit is reached."""
+
+
+class Job:
+    """
+    One simulation request: its state, progress and streamed rows. Rows
+    are spooled to rows.ndjson in the job's output directory, so a job
+    kept for result requests holds no rows in memory.
+    """
+
+    def __init__(self, scenario, targets, output_root=DEFAULT_OUTPUT_ROOT):
+        self.id = uuid.uuid4().hex
+        self.scenario = scenario
+        self.targets = targets
+        self.output_dir = os.path.join(output_root, self.id)
+        self.status = QUEUED
+        self.steps_done = 0
+        self.steps_total = 0
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.summary = None
+        self.error = None
+        self.rows = SpoolSink(os.path.join(self.output_dir, "rows.ndjson"))
+
+    @property
+    def output_path(self):
+        return os.path.join(self.output_dir, "simulation_log.csv")
+
+    def _progress(self, step, steps):
+        self.steps_done, self.steps_total = step, steps
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": self.steps_done / self.steps_total if self.steps_total else 0.0,
+            "steps_done": self.steps_done,
+            "steps_total": self.steps_total,
+            "rows": self.rows.count,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "summary": self.summary,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Simulations run on a bounded thread pool. At most `max_pending` jobs
+    may be queued or running; submit() raises QueueFull beyond that so
+    callers can push back instead of piling up work.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING,
+                 max_finished=DEFAULT_MAX_FINISHED, output_root=DEFAULT_OUTPUT_ROOT, run=None):
+        """`run` replaces core.scheduler.run_simulation (same signature)."""
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.output_root = output_root
+        self._run_simulation = run
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._active = 0
+
+    def submit(self, scenario, targets):
+        """
+        Queue a simulation.
+
+        Returns:
+            Job
+
+        Raises:
+            QueueFull: If max_pending jobs are already queued or running.
+        """
+        with self._lock:
+            if self._active >= self.max_pending:
+                raise QueueFull(f"{self._active} simulations already queued or running")
+            self._active += 1
+            job = Job(scenario, targets, self.output_root)
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def active(self):
+        return self._active
+
+    def _run(self, job):
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            run = self._run_simulation
+            if run is None:
+                from core.scheduler import run_simulation as run
+            job.summary = run(job.scenario, job.targets, job.output_path,
+                              extra_sinks=[job.rows], progress=job._progress)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+            traceback.print_exc()
+        finally:
+            job.rows.close()
+            job.finished = time.time()
+            with self._lock:
+                self._active -= 1
+                evicted = self._evict()
+            for old in evicted:
+                shutil.rmtree(old.output_dir, ignore_errors=True)
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond max_finished; returns them."""
+        finished = [j for j in self._jobs.values() if j.status in (DONE, FAILED)]
+        evicted = finished[:max(0, len(finished) - self.max_finished)]
+        for job in evicted:
+            del self._jobs[job.id]
+        return evicted
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
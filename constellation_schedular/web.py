@@ -1,20 +1,114 @@
-from fastapi import FastAPI
+import json
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any
-from core.scheduler import run_simulation
+from core import resources
+from core import profiling
+from core.access import access_for_scenario
+from core.result_cache import open_result_cache
+from core.trace import trace_level
+from constellation_schedular.jobs import JobQueue, QueueFull
 
-app = FastAPI()
+jobs = JobQueue()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load the timescale and ephemeris before the first request, not in it
+    resources.warm()
+    yield
+    jobs.shutdown(wait=False)
+
+
+app = FastAPI(lifespan=lifespan)
 
 class SimulationRequest(BaseModel):
     scenario: Dict[str, Any]
     targets: List[Dict[str, Any]]
-    output_path: str = "outputs/api_simulation.csv"
 
-@app.post("/simulate/")
+class AccessRequest(BaseModel):
+    scenario: Dict[str, Any]
+    targets: List[Dict[str, Any]]
+
+# Scenario keys naming files the server would read or write; API jobs
+# write only under their own job directory
+CLIENT_PATH_KEYS = ("checkpoint_path", "resume_from", "cloud_raster")
+# Cache settings a client may only switch on or off (server directories)
+CLIENT_BOOL_KEYS = ("propagation_cache", "result_cache")
+
+def _client_scenario(raw):
+    """A request's scenario with the result cache on by default; 400 on server file paths."""
+    scenario = dict(raw)
+    for key in CLIENT_PATH_KEYS:
+        if scenario.get(key):
+            raise HTTPException(status_code=400, detail=f"'{key}' cannot be set through the API")
+    for key in CLIENT_BOOL_KEYS:
+        if not isinstance(scenario.get(key, False), bool):
+            raise HTTPException(status_code=400, detail=f"'{key}' must be true or false through the API")
+    try:
+        # The trace file itself always lands in the job directory
+        trace_level(scenario.get("trace"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Identical requests are answered from the result cache unless the
+    # scenario sets result_cache: false
+    scenario.setdefault("result_cache", True)
+    return scenario
+
+def _job_or_404(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+    return job
+
+@app.post("/simulate/", status_code=202)
 def simulate_endpoint(req: SimulationRequest):
-    run_simulation(req.scenario, req.targets, req.output_path)
-    # Optionally, you can read and return the JSON output
-    json_path = req.output_path.replace('.csv', '.json')
-    with open(json_path) as jf:
-        results = jf.read()
-    return {"status": "ok", "output": req.output_path, "results": results}
\ No newline at end of file
+    """Queue a simulation; poll /jobs/{id} and read /jobs/{id}/results."""
+    scenario = _client_scenario(req.scenario)
+    try:
+        job = jobs.submit(scenario, req.targets)
+    except QueueFull as e:
+        return JSONResponse(status_code=429, content={"status": "busy", "detail": str(e)},
+                            headers={"Retry-After": "5"})
+    return {"status": job.status, "job_id": job.id,
+            "status_url": f"/jobs/{job.id}", "results_url": f"/jobs/{job.id}/results"}
+
+@app.get("/jobs/{job_id}")
+def job_status_endpoint(job_id: str):
+    return _job_or_404(job_id).to_dict()
+
+@app.get("/jobs/{job_id}/results")
+def job_results_endpoint(job_id: str, offset: int = 0):
+    """Log rows as NDJSON, streamed while the job runs; starts at row `offset`."""
+    job = _job_or_404(job_id)
+    lines = (json.dumps(row, separators=(",", ":")) + "\n" for row in job.rows.follow(offset))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@app.get("/cache/stats")
+def cache_stats_endpoint():
+    """Hit / miss counters and size of the default result cache."""
+    return open_result_cache(True).stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    """Phase timers of profiled runs, job queue and result cache, in Prometheus text format."""
+    cache = open_result_cache(True).stats()
+    extra = {
+        "constellation_jobs_active": ("gauge", "Simulations queued or running.", jobs.active),
+        "constellation_result_cache_hits_total": ("counter", "Result cache hits.", cache["hits"]),
+        "constellation_result_cache_misses_total": ("counter", "Result cache misses.", cache["misses"]),
+        "constellation_result_cache_bytes": ("gauge", "Result cache size on disk.", cache["size_bytes"]),
+    }
+    return PlainTextResponse(profiling.prometheus_text(extra), media_type="text/plain; version=0.0.4")
+
+@app.post("/access/")
+def access_endpoint(req: AccessRequest):
+    access = access_for_scenario(req.scenario, req.targets)
+    windows = access.to_records(
+        [s["name"] for s in req.scenario["satellites"]],
+        [t["name"] for t in req.targets],
+        [gs["name"] for gs in req.scenario.get("ground_stations", [])],
+    )
+    return {"status": "ok", "count": len(windows), "windows": windows}
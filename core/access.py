@@ -0,0 +1,315 @@
+import numpy as np
+from skyfield.api import wgs84
+from skyfield.constants import DAY_S
+from core import resources
+from core.visibility import Geometry
+from utils.config_loader import parse_start_time
+
+TARGET = 0
+GROUND_STATION = 1
+
+WINDOW_DTYPE = np.dtype([
+    ("sat", np.int32),
+    ("kind", np.int8),
+    ("site", np.int32),
+    ("rise_sec", np.float64),
+    ("culminate_sec", np.float64),
+    ("set_sec", np.float64),
+    ("max_elev_deg", np.float32),
+])
+
+
+def _pair_windows(sat, loc, t0, t1, min_elev_deg):
+    """
+    Rise / culminate / set intervals of one satellite over one site.
+
+    Passes already in progress at t0 start at t0, and passes still in
+    progress at t1 end at t1.
+
+    Returns:
+        list: (rise_sec, culminate_sec, set_sec, max_elev_deg) tuples,
+        with times in seconds since t0.
+    """
+    times, events = sat.find_events(loc, t0, t1, altitude_degrees=min_elev_deg)
+    span_sec = (t1 - t0) * DAY_S
+    if len(events) == 0:
+        alt, _, _ = (sat - loc).at(t0).altaz()
+        if not alt.degrees > min_elev_deg:
+            return []
+        mid = t0.ts.tt_jd(t0.tt + (t1.tt - t0.tt) / 2.0)
+        mid_alt, _, _ = (sat - loc).at(mid).altaz()
+        return [(0.0, span_sec / 2.0, span_sec, float(mid_alt.degrees))]
+
+    offsets = (times.tt - t0.tt) * DAY_S
+    culm_idx = np.flatnonzero(events == 1)
+    culm_alt = {}
+    if len(culm_idx):
+        alt, _, _ = (sat - loc).at(times[culm_idx]).altaz()
+        culm_alt = dict(zip(culm_idx.tolist(), np.atleast_1d(alt.degrees).tolist()))
+
+    windows = []
+    rise = 0.0 if events[0] != 0 else None
+    best = (None, -90.0)
+    for k, (off, ev) in enumerate(zip(offsets, events)):
+        if ev == 0:
+            rise = off
+            best = (None, -90.0)
+        elif ev == 1:
+            if rise is None:
+                rise = 0.0
+            if culm_alt[k] > best[1]:
+                best = (off, culm_alt[k])
+        else:
+            if rise is None:
+                rise = 0.0
+            culm = best[0] if best[0] is not None else (rise + off) / 2.0
+            windows.append((rise, culm, off, best[1]))
+            rise = None
+            best = (None, -90.0)
+    if rise is not None:
+        culm = best[0] if best[0] is not None else (rise + span_sec) / 2.0
+        windows.append((rise, culm, span_sec, best[1]))
+    return windows
+
+
+class AccessTable:
+    """
+    Compact table of access windows for every satellite x site pair.
+
+    Each row of `windows` is one pass: satellite index, site kind
+    (TARGET or GROUND_STATION), site index, rise / culmination / set
+    offsets in seconds since `start_time`, and peak elevation.
+    Rows are sorted by (sat, kind, rise_sec). `min_elev_deg` is the
+    elevation mask the windows were found for.
+    """
+
+    def __init__(self, start_time, duration_sec, windows, min_elev_deg=None):
+        self.start_time = start_time
+        self.duration_sec = duration_sec
+        self.min_elev_deg = min_elev_deg
+        order = np.lexsort((windows["rise_sec"], windows["kind"], windows["sat"]))
+        self.windows = windows[order]
+        self._groups = {}
+        for sat in np.unique(self.windows["sat"]):
+            for kind in (TARGET, GROUND_STATION):
+                sel = (self.windows["sat"] == sat) & (self.windows["kind"] == kind)
+                self._groups[(int(sat), kind)] = self.windows[sel]
+
+    def __len__(self):
+        return len(self.windows)
+
+    def windows_for(self, sat_idx, kind=TARGET, site_idx=None):
+        """All windows for one satellite, optionally restricted to one site."""
+        w = self._groups.get((sat_idx, kind), self.windows[:0])
+        if site_idx is not None:
+            w = w[w["site"] == site_idx]
+        return w
+
+    def visible_sites(self, sat_idx, kind, seconds):
+        """Sorted indices of sites whose window contains `seconds` since start."""
+        w = self._groups.get((sat_idx, kind))
+        if w is None:
+            return np.zeros(0, dtype=np.int64)
+        hit = (w["rise_sec"] <= seconds) & (seconds <= w["set_sec"])
+        return np.unique(w["site"][hit]).astype(np.int64)
+
+    def until(self, cut_sec):
+        """
+        The windows of each satellite up to `cut_sec[sat]` seconds; passes
+        in progress there end there.
+        """
+        cut = np.asarray(cut_sec, dtype=float)[self.windows["sat"]]
+        keep = self.windows["rise_sec"] <= cut
+        w, cut = self.windows[keep].copy(), cut[keep]
+        for field in ("culminate_sec", "set_sec"):
+            w[field] = np.minimum(w[field], cut)
+        return AccessTable(self.start_time, self.duration_sec, w, self.min_elev_deg)
+
+    def window(self, lo_sec, hi_sec):
+        """
+        The windows of [lo_sec, hi_sec] as a table starting at lo_sec.
+        Passes cut by either end start or end there, as compute_access()
+        clips passes in progress at its search bounds; they keep their
+        peak elevation.
+        """
+        from datetime import timedelta
+        w = self.windows[(self.windows["set_sec"] >= lo_sec) & (self.windows["rise_sec"] <= hi_sec)].copy()
+        span = hi_sec - lo_sec
+        for field in ("rise_sec", "culminate_sec", "set_sec"):
+            w[field] = np.clip(w[field] - lo_sec, 0.0, span)
+        return AccessTable(self.start_time + timedelta(seconds=lo_sec), span, w, self.min_elev_deg)
+
+    def extend(self, other):
+        """
+        This table followed by `other`, the windows of the time range that
+        starts where this one ends. A pass cut at the boundary is joined
+        back into one window. Both tables must share one elevation mask.
+        """
+        if other.min_elev_deg != self.min_elev_deg:
+            raise ValueError(f"Cannot join access windows found for a {other.min_elev_deg} deg mask "
+                             f"to ones found for {self.min_elev_deg} deg")
+        later = other.windows.copy()
+        for field in ("rise_sec", "culminate_sec", "set_sec"):
+            later[field] += self.duration_sec
+        rows = self.windows
+        cut = rows[rows["set_sec"] >= self.duration_sec]
+        joined = np.zeros(len(later), dtype=bool)
+        if len(cut):
+            index = {(int(r["sat"]), int(r["kind"]), int(r["site"])): k for k, r in enumerate(cut)}
+            for k, r in enumerate(later):
+                hit = index.get((int(r["sat"]), int(r["kind"]), int(r["site"])))
+                if hit is None or r["rise_sec"] > self.duration_sec:
+                    continue
+                cut["set_sec"][hit] = r["set_sec"]
+                if r["max_elev_deg"] > cut["max_elev_deg"][hit]:
+                    cut["culminate_sec"][hit] = r["culminate_sec"]
+                    cut["max_elev_deg"][hit] = r["max_elev_deg"]
+                joined[k] = True
+            rows = np.concatenate((rows[rows["set_sec"] < self.duration_sec], cut))
+        return AccessTable(self.start_time, self.duration_sec + other.duration_sec,
+                           np.concatenate((rows, later[~joined])), self.min_elev_deg)
+
+    def to_records(self, sat_names, target_names, station_names):
+        """Windows as JSON-friendly dicts with ISO timestamps."""
+        from datetime import timedelta
+        records = []
+        for w in self.windows:
+            names = target_names if w["kind"] == TARGET else station_names
+            records.append({
+                "satellite": sat_names[w["sat"]],
+                "kind": "target" if w["kind"] == TARGET else "ground_station",
+                "site": names[w["site"]],
+                "rise": (self.start_time + timedelta(seconds=float(w["rise_sec"]))).isoformat(),
+                "culminate": (self.start_time + timedelta(seconds=float(w["culminate_sec"]))).isoformat(),
+                "set": (self.start_time + timedelta(seconds=float(w["set_sec"]))).isoformat(),
+                "duration_sec": float(round(w["set_sec"] - w["rise_sec"], 1)),
+                "max_elev_deg": float(round(float(w["max_elev_deg"]), 2)),
+            })
+        return records
+
+
+def compute_access(satellites, targets, ground_stations, t0, t1, min_elev_deg):
+    """
+    Find access windows for every satellite x target and satellite x
+    ground-station pair with Skyfield's rise/set root-finder.
+
+    Args:
+        satellites (list): Skyfield EarthSatellite objects.
+        targets (list): Target dicts with 'lat' and 'lon'.
+        ground_stations (list): Ground station dicts with 'lat', 'lon', 'alt_m'.
+        t0, t1 (Time): Search interval.
+        min_elev_deg (float): Elevation mask.
+
+    Returns:
+        AccessTable
+    """
+    rows = []
+    for kind, sites in ((TARGET, targets), (GROUND_STATION, ground_stations)):
+        for j, site in enumerate(sites):
+            loc = wgs84.latlon(site['lat'], site['lon'], elevation_m=site.get('alt_m', 0.0))
+            for i, sat in enumerate(satellites):
+                for rise, culm, set_, elev in _pair_windows(sat, loc, t0, t1, min_elev_deg):
+                    rows.append((i, kind, j, rise, culm, set_, elev))
+    windows = np.array(rows, dtype=WINDOW_DTYPE)
+    return AccessTable(t0.utc_datetime(), (t1 - t0) * DAY_S, windows, min_elev_deg)
+
+
+def access_for_scenario(scenario, targets, ts=None):
+    """Access table for a scenario dict as accepted by run_simulation()."""
+    ts = ts or resources.timescale()
+    start_time = parse_start_time(scenario['start_time'])
+    t0 = ts.from_datetime(start_time)
+    t1 = ts.tt_jd(t0.tt + scenario['duration_minutes'] / (24 * 60.0))
+    sats = [resources.satellite(c['tle'], c['name'], ts) for c in scenario['satellites']]
+    return compute_access(sats, targets, scenario.get('ground_stations', []),
+                          t0, t1, scenario.get('min_elevation_deg', 10))
+
+
+class AccessGeometry(Geometry):
+    """
+    Geometry whose target / ground-station lookups come from an AccessTable
+    instead of [steps x sites] elevation matrices.
+
+    The windows hold only for the mask they were found for: lookups with
+    any other `min_elev_deg` raise ValueError (build one AccessGeometry
+    per mask, as run_sweep() does). A satellite SGP4 fails for (NaN
+    positions) has no windows from the step before its first failure.
+    """
+
+    def __init__(self, geometry, access, timestep_sec):
+        super().__init__(geometry.times, geometry.sat_gcrs_km, geometry.sat_itrs_km,
+                         geometry.sunlit, None, None)
+        failed = np.isnan(geometry.sat_itrs_km).any(axis=2)
+        if failed.any():
+            cut = np.where(failed.any(axis=1), (np.argmax(failed, axis=1) - 1) * timestep_sec, np.inf)
+            access = access.until(cut)
+        self.access = access
+        self.timestep_sec = timestep_sec
+
+    def _check_mask(self, min_elev_deg):
+        built = self.access.min_elev_deg
+        if built is not None and min_elev_deg != built:
+            raise ValueError(f"Access windows were found for a {built} deg elevation mask, "
+                             f"not {min_elev_deg} deg; build the geometry for that mask")
+
+    def visible_targets(self, sat_idx, step, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        return self.access.visible_sites(sat_idx, TARGET, step * self.timestep_sec)
+
+    def over_ground(self, sat_idx, step, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        return len(self.access.visible_sites(sat_idx, GROUND_STATION, step * self.timestep_sec)) > 0
+
+    def visibility_pairs(self, sat_idx, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        w = self.access.windows_for(sat_idx, TARGET)
+        first, last = self._step_range(w)
+        counts = np.maximum(last - first + 1, 0)
+        # Expand each window into its steps, then drop overlapping duplicates
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        steps = np.repeat(first, counts) + offsets
+        sites = np.repeat(w["site"].astype(np.int64), counts)
+        base = int(sites.max(initial=0)) + 1
+        key = np.unique(steps * base + sites)
+        return key // base, key % base
+
+    def ground_steps(self, sat_idx, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        return self._window_steps(self.access.windows_for(sat_idx, GROUND_STATION))
+
+    def station_contacts(self, sat_idx, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        w = self.access.windows_for(sat_idx, GROUND_STATION)
+        first, last = self._step_range(w)
+        keep = first <= last
+        return w["site"][keep].astype(np.int64), first[keep], last[keep] + 1
+
+    def active_steps(self, sat_idx, min_elev_deg):
+        self._check_mask(min_elev_deg)
+        return self._window_steps(self.access.windows[self.access.windows["sat"] == sat_idx])
+
+    def window(self, lo, hi):
+        """Steps [lo, hi) as an AccessGeometry of their own."""
+        return AccessGeometry(Geometry.window(self, lo, hi),
+                              self.access.window(lo * self.timestep_sec, hi * self.timestep_sec),
+                              self.timestep_sec)
+
+    def extend(self, other):
+        """This geometry followed by `other`, the next steps of the same fleet and sites."""
+        return AccessGeometry(Geometry.extend(self, other), self.access.extend(other.access), self.timestep_sec)
+
+    def _window_steps(self, w):
+        """Boolean [steps] mask of steps covered by any of the windows `w`."""
+        first, last = self._step_range(w)
+        keep = first <= last
+        # Mark each [first, last] step range with a +1/-1 difference array
+        diff = np.zeros(self.steps + 1, dtype=np.int64)
+        np.add.at(diff, first[keep], 1)
+        np.add.at(diff, last[keep] + 1, -1)
+        return np.cumsum(diff[:-1]) > 0
+
+    def _step_range(self, w):
+        """First and last grid step inside each window (first > last if none)."""
+        first = np.ceil(w["rise_sec"] / self.timestep_sec).astype(np.int64)
+        last = np.minimum(np.floor(w["set_sec"] / self.timestep_sec).astype(np.int64), self.steps - 1)
+        return first, last
@@ -0,0 +1,159 @@
+import json
+import os
+import numpy as np
+from utils.config_loader import parse_start_time
+
+# Bump when the saved state changes shape
+CHECKPOINT_VERSION = 1
+
+# Per-satellite state restored on resume; power and storage parameters
+# come from the (possibly edited) scenario instead.
+FLEET_STATE = ("energy_wh", "stored_mb", "att_vec")
+
+
+class Checkpoint:
+    """
+    Simulation state at a step boundary: what a resumed run needs to
+    carry on exactly where the saved one stopped.
+
+    Attributes:
+        time (datetime): Start of the first step not yet simulated.
+        timestep_sec (float): Step length of the saved run.
+        satellites (ndarray): Satellite names, matching the fleet arrays.
+        fleet (dict): FLEET_STATE arrays (energy_wh, stored_mb, att_vec).
+        target_names (ndarray): Target names, matching last_imaged.
+        last_imaged (ndarray): Last image time per target (POSIX seconds).
+        summary (dict): Run summary counters so far.
+        output_path (str): Log path of the saved run.
+        outputs (dict): {format: offset} of every log file (see
+            OutputSinks.checkpoint()).
+        sunlit (ndarray): Sunlit flags of the last simulated step, so
+            adaptive stepping sees an eclipse edge at the resume step.
+    """
+
+    def __init__(self, time, timestep_sec, satellites, fleet, target_names, last_imaged, summary,
+                 output_path=None, outputs=None, sunlit=None):
+        self.time = time
+        self.timestep_sec = float(timestep_sec)
+        self.satellites = np.asarray(satellites, dtype=str)
+        self.fleet = {name: np.asarray(fleet[name], dtype=float) for name in FLEET_STATE}
+        self.target_names = np.asarray(target_names, dtype=str)
+        self.last_imaged = np.asarray(last_imaged, dtype=float)
+        self.summary = dict(summary)
+        self.output_path = output_path
+        self.outputs = dict(outputs or {})
+        self.sunlit = None if sunlit is None else np.asarray(sunlit, dtype=bool)
+
+    @classmethod
+    def capture(cls, time, timestep_sec, satellites, fleet, catalog, summary, output_path=None, outputs=None,
+                sunlit=None):
+        """Copy the live state of a run (FleetState, TargetCatalog)."""
+        return cls(time, timestep_sec, satellites, {name: getattr(fleet, name).copy() for name in FLEET_STATE},
+                   catalog.name, catalog.last_imaged.copy(), summary, output_path, outputs, sunlit)
+
+    def save(self, path):
+        """Write a compressed .npz, atomically (a crash leaves the previous checkpoint)."""
+        meta = {
+            "version": CHECKPOINT_VERSION,
+            "time": self.time.isoformat(),
+            "timestep_sec": self.timestep_sec,
+            "summary": self.summary,
+            "output_path": self.output_path,
+            "outputs": self.outputs,
+        }
+        arrays = {f"fleet_{name}": arr for name, arr in self.fleet.items()}
+        if self.sunlit is not None:
+            arrays["sunlit"] = self.sunlit
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta)), satellites=self.satellites,
+                                target_names=self.target_names, last_imaged=self.last_imaged, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["meta"]))
+            if meta.get("version") != CHECKPOINT_VERSION:
+                raise ValueError(f"Checkpoint {path} has version {meta.get('version')}, "
+                                 f"expected {CHECKPOINT_VERSION}")
+            return cls(parse_start_time(meta["time"]), meta["timestep_sec"], npz["satellites"],
+                       {name: npz[f"fleet_{name}"] for name in FLEET_STATE}, npz["target_names"],
+                       npz["last_imaged"], meta["summary"], meta["output_path"], meta["outputs"],
+                       npz["sunlit"] if "sunlit" in npz.files else None)
+
+    def start_step(self, start_time, timestep_sec, steps):
+        """
+        Grid step of a scenario (start_time, timestep_sec, steps) at which
+        this checkpoint resumes.
+
+        Raises:
+            ValueError: Different step length, or a time off the grid or
+                outside the horizon.
+        """
+        if abs(float(timestep_sec) - self.timestep_sec) > 1e-9:
+            raise ValueError(f"Checkpoint step is {self.timestep_sec}s, scenario step is {timestep_sec}s")
+        offset = (self.time - start_time).total_seconds() / float(timestep_sec)
+        step = int(round(offset))
+        if abs(offset - step) > 1e-6 or not 0 <= step <= steps:
+            raise ValueError(f"Checkpoint time {self.time.isoformat()} is not a step of the scenario "
+                             f"({start_time.isoformat()}, {steps} x {timestep_sec}s)")
+        return step
+
+    def satellite_rows(self, satellites):
+        """(indices into `satellites`, matching checkpoint rows) of satellites saved by name."""
+        row = {name: k for k, name in enumerate(self.satellites)}
+        pairs = [(i, row[name]) for i, name in enumerate(satellites) if name in row]
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return tuple(map(np.array, zip(*pairs)))
+
+    def restore(self, fleet, satellites, catalog):
+        """
+        Load the saved state into a fresh FleetState and TargetCatalog.
+
+        Satellites and targets are matched by name, so a resumed scenario
+        may add new ones (they keep their initial state) or drop old ones.
+
+        Returns:
+            tuple: (satellites restored, targets restored)
+        """
+        dst, src = self.satellite_rows(satellites)
+        for name, arr in self.fleet.items():
+            getattr(fleet, name)[dst] = arr[src]
+        row = {name: k for k, name in enumerate(self.target_names)}
+        pairs = [(j, row[name]) for j, name in enumerate(catalog.name) if name in row]
+        if pairs:
+            tgt, src = map(np.array, zip(*pairs))
+            catalog.last_imaged[tgt] = self.last_imaged[src]
+        return len(dst), len(pairs)
+
+
+def load_checkpoint(value):
+    """A Checkpoint, loading it first if `value` is a path."""
+    return value if isinstance(value, Checkpoint) or value is None else Checkpoint.load(value)
+
+
+def resumed_scenario(scenario, checkpoint):
+    """
+    The part of `scenario` still to run after `checkpoint`: the same
+    settings with the start moved to the checkpoint time.
+
+    Returns:
+        tuple: (scenario dict, steps already done)
+    """
+    timestep_sec = scenario['timestep_sec']
+    steps = int(scenario['duration_minutes'] * 60 / timestep_sec)
+    done = checkpoint.start_step(parse_start_time(scenario['start_time']), timestep_sec, steps)
+    return dict(scenario, start_time=checkpoint.time,
+                duration_minutes=duration_for_steps(steps - done, timestep_sec)), done
+
+
+def duration_for_steps(steps, timestep_sec):
+    """duration_minutes that run_simulation() turns back into exactly `steps` steps."""
+    minutes = steps * timestep_sec / 60.0
+    while int(minutes * 60 / timestep_sec) < steps:
+        minutes = float(np.nextafter(minutes, np.inf))
+    return minutes
+
@@ -0,0 +1,175 @@
+import heapq
+import math
+import numpy as np
+
+DEFAULT_ANTENNAS = 1
+
+# One satellite-station visibility window, or one allocated contact, as a
+# half-open step interval [start, end)
+CONTACT_DTYPE = np.dtype([
+    ("sat", np.int32),
+    ("station", np.int32),
+    ("start", np.int64),
+    ("end", np.int64),
+    ("rate_mbps", np.float64),
+])
+
+
+def contact_windows(geometry, n_sats, min_elev_deg):
+    """
+    Every satellite x station visibility window over the time grid.
+
+    Returns:
+        ndarray: CONTACT_DTYPE records ordered by (start, sat, station);
+        rate_mbps is 0.
+    """
+    parts = []
+    for i in range(n_sats):
+        station, start, end = geometry.station_contacts(i, min_elev_deg)
+        w = np.zeros(len(station), dtype=CONTACT_DTYPE)
+        w["sat"], w["station"], w["start"], w["end"] = i, station, start, end
+        parts.append(w)
+    windows = np.concatenate(parts) if parts else np.zeros(0, dtype=CONTACT_DTYPE)
+    return windows[np.lexsort((windows["station"], windows["sat"], windows["start"]))]
+
+
+def allocate_contacts(windows, antennas, bandwidth_mbps, sat_rate_mbps):
+    """
+    Share ground-station antennas between competing satellites.
+
+    Sweeps the window start / end boundaries in time order; between two
+    boundaries the set of visible pairs is fixed, so each segment is
+    allocated once rather than step by step. A satellite keeps its
+    antenna for as long as its window lasts (no handovers mid-pass).
+    Free antennas go to unserved satellites whose window ends first,
+    each satellite using at most one station at a time. A station's
+    `bandwidth_mbps` is split evenly between its antennas in use, and no
+    satellite gets more than its own downlink rate.
+
+    Args:
+        windows (ndarray): From contact_windows().
+        antennas (array): Antenna count per station.
+        bandwidth_mbps (array): Total bandwidth per station (inf for no limit).
+        sat_rate_mbps (array): Downlink rate per satellite.
+
+    Returns:
+        ndarray: Allocated contacts, CONTACT_DTYPE, in time order.
+    """
+    if not len(windows):
+        return np.zeros(0, dtype=CONTACT_DTYPE)
+    sat = windows["sat"].tolist()
+    station = windows["station"].tolist()
+    start = windows["start"].tolist()
+    end = windows["end"].tolist()
+    boundaries = sorted(set(start) | set(end))
+
+    pending = 0        # next window (by start) not yet visible
+    active = []        # heap of (end, sat, station, window)
+    held = {}          # sat -> window it holds an antenna through
+    open_runs = {}     # sat -> [station, start, rate] of the contact being extended
+    out = []
+
+    def close(s, at):
+        st, t0, rate = open_runs.pop(s)
+        out.append((s, st, t0, at, rate))
+
+    for t, t_next in zip(boundaries, boundaries[1:]):
+        while pending < len(start) and start[pending] <= t:
+            heapq.heappush(active, (end[pending], sat[pending], station[pending], pending))
+            pending += 1
+        while active and active[0][0] <= t:
+            heapq.heappop(active)
+        live = {w for *_, w in active}
+
+        used = {}
+        for s, w in list(held.items()):
+            if w in live:
+                used[station[w]] = used.get(station[w], 0) + 1
+            else:
+                del held[s]
+        for e, s, st, w in sorted(active):
+            if s not in held and used.get(st, 0) < antennas[st]:
+                held[s] = w
+                used[st] = used.get(st, 0) + 1
+
+        for s in list(open_runs):
+            if s not in held:
+                close(s, t)
+        for s, w in held.items():
+            st = station[w]
+            rate = min(float(sat_rate_mbps[s]), bandwidth_mbps[st] / used[st])
+            run = open_runs.get(s)
+            if run is not None and (run[0] != st or run[2] != rate):
+                close(s, t)
+                run = None
+            if run is None:
+                open_runs[s] = [st, t, rate]
+    for s in list(open_runs):
+        close(s, boundaries[-1])
+
+    contacts = np.array(out, dtype=CONTACT_DTYPE)
+    return contacts[np.lexsort((contacts["sat"], contacts["start"]))]
+
+
+class ContactPlan:
+    """
+    Antenna allocation over the whole horizon.
+
+    Attributes:
+        windows (ndarray): Every visibility window (CONTACT_DTYPE).
+        contacts (ndarray): Allocated contacts (CONTACT_DTYPE).
+        rate_mbps (ndarray): Allocated downlink rate [sats x steps], 0
+            where the satellite has no antenna.
+    """
+
+    def __init__(self, windows, contacts, n_sats, steps):
+        self.windows = windows
+        self.contacts = contacts
+        self.rate_mbps = np.zeros((n_sats, steps))
+        for c in contacts:
+            self.rate_mbps[c["sat"], c["start"]:c["end"]] = c["rate_mbps"]
+
+    def rate(self, sat_idx, step):
+        return float(self.rate_mbps[sat_idx, step])
+
+    def ground_steps(self, sat_idx):
+        """Boolean [steps] mask of steps with an antenna allocated."""
+        return self.rate_mbps[sat_idx] > 0
+
+    @property
+    def stats(self):
+        visible = np.zeros_like(self.rate_mbps, dtype=bool)
+        for w in self.windows:
+            visible[w["sat"], w["start"]:w["end"]] = True
+        allocated = self.rate_mbps > 0
+        return {"windows": len(self.windows), "contacts": len(self.contacts),
+                "visible_steps": int(visible.sum()), "allocated_steps": int(allocated.sum())}
+
+
+def station_limits(ground_stations):
+    """(antennas, bandwidth_mbps) arrays from station configs; no bandwidth means no limit."""
+    antennas = [int(gs.get("antennas", DEFAULT_ANTENNAS)) for gs in ground_stations]
+    bandwidth = [float(gs["bandwidth_mbps"]) if gs.get("bandwidth_mbps") is not None else math.inf
+                 for gs in ground_stations]
+    return antennas, bandwidth
+
+
+def build_contact_plan(geometry, ground_stations, sat_rate_mbps, min_elev_deg):
+    """
+    Precompute contact windows and allocate antennas (see allocate_contacts()).
+
+    Args:
+        geometry (Geometry): Precomputed geometry.
+        ground_stations (list): Station configs, optionally with 'antennas'
+            (default 1) and 'bandwidth_mbps' (shared by its antennas).
+        sat_rate_mbps (array): Downlink rate per satellite.
+        min_elev_deg (float): Elevation mask.
+
+    Returns:
+        ContactPlan
+    """
+    n_sats = len(sat_rate_mbps)
+    windows = contact_windows(geometry, n_sats, min_elev_deg)
+    antennas, bandwidth = station_limits(ground_stations)
+    contacts = allocate_contacts(windows, antennas, bandwidth, sat_rate_mbps)
+    return ContactPlan(windows, contacts, n_sats, geometry.steps)
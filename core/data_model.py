@@ -3,6 +3,8 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from core.fleet import FleetState
+
 class DataModel:
     def __init__(self, capacity_mb: float = 500.0, downlink_rate_mbps: float = 10.0, initial_mb: float = 0.0):
         """
@@ -12,11 +14,49 @@ class DataModel:
             capacity_mb (float): Max onboard storage in MB.
             downlink_rate_mbps (float): Downlink bandwidth in Mbps.
             initial_mb (float): Initial onboard data in MB.
+
+        State lives in a FleetState row; a standalone model owns a
+        one-satellite fleet. Use DataModel.view() to wrap an existing row.
         """
+        self._fleet = FleetState(1)
+        self._i = 0
         self.capacity = capacity_mb
         self.downlink_rate_mbps = downlink_rate_mbps
         self.stored_data = min(initial_mb, capacity_mb)  # Avoid overflow at start
 
+    @classmethod
+    def view(cls, fleet, i):
+        """Per-satellite view onto row i of a FleetState."""
+        model = cls.__new__(cls)
+        model._fleet = fleet
+        model._i = i
+        return model
+
+    def _field(name):
+        def get(self):
+            return float(getattr(self._fleet, name)[self._i])
+
+        def set(self, value):
+            getattr(self._fleet, name)[self._i] = value
+        return property(get, set)
+
+    capacity = _field("storage_capacity_mb")
+    stored_data = _field("stored_mb")
+    downlink_rate_mbps = _field("downlink_rate_mbps")
+    del _field
+
+    def can_store(self, size_mb: float = 50.0) -> bool:
+        """
+        Check whether an image fits, without storing it.
+
+        Args:
+            size_mb (float): Size of the image.
+
+        Returns:
+            bool: True if there is enough free space.
+        """
+        return self.stored_data + size_mb <= self.capacity
+
     def store_image(self, size_mb: float = 50.0) -> bool:
         """
         Attempt to store image data onboard.
@@ -27,22 +67,25 @@ class DataModel:
         Returns:
             bool: True if stored successfully, False if not enough space.
         """
-        if self.stored_data + size_mb <= self.capacity:
+        if self.can_store(size_mb):
             self.stored_data += size_mb
             return True
         return False
 
-    def downlink(self, dt_minutes: float) -> float:
+    def downlink(self, dt_minutes: float, rate_mbps: float = None) -> float:
         """
         Simulate data downlink over a given time window.
 
         Args:
             dt_minutes (float): Duration of downlink session in minutes.
+            rate_mbps (float): Rate allocated by a ground station; defaults
+                to the satellite's own downlink bandwidth.
 
         Returns:
             float: Amount of data downlinked in MB.
         """
-        downlink_capacity = (self.downlink_rate_mbps / 8.0) * 60.0 * dt_minutes  # Mbps to MB
+        rate = self.downlink_rate_mbps if rate_mbps is None else rate_mbps
+        downlink_capacity = (rate / 8.0) * 60.0 * dt_minutes  # Mbps to MB
         downlinked = min(self.stored_data, downlink_capacity)
         self.stored_data -= downlinked
         return downlinked
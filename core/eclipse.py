@@ -0,0 +1,171 @@
+import numpy as np
+from skyfield.constants import DAY_S, ERAD
+from skyfield.searchlib import find_discrete
+
+SUN_RADIUS_KM = 696000.0
+EARTH_RADIUS_KM = ERAD / 1000.0
+
+# Shadow states
+SUNLIT = 0
+PENUMBRA = 1
+UMBRA = 2
+
+# Penumbra segments are sampled at this many interior points to get their
+# mean illumination.
+PENUMBRA_SAMPLES = 8
+
+
+def _disk_angles(sat_km, sun_km):
+    """Apparent Sun radius a, Earth radius b and their separation c (radians)."""
+    sat_km = np.asarray(sat_km, dtype=float)
+    to_sun = np.asarray(sun_km, dtype=float) - sat_km
+    d_sun = np.linalg.norm(to_sun, axis=0)
+    d_earth = np.linalg.norm(sat_km, axis=0)
+    a = np.arcsin(np.minimum(1.0, SUN_RADIUS_KM / d_sun))
+    b = np.arcsin(np.minimum(1.0, EARTH_RADIUS_KM / d_earth))
+    cos_c = np.sum(-sat_km * to_sun, axis=0) / (d_earth * d_sun)
+    c = np.arccos(np.clip(cos_c, -1.0, 1.0))
+    return a, b, c
+
+
+def illumination(sat_km, sun_km):
+    """
+    Fraction of the solar disk visible from the satellite (conical shadow
+    model with a spherical Earth).
+
+    Args:
+        sat_km (ndarray): Satellite positions [3 x N] relative to Earth's centre.
+        sun_km (ndarray): Sun positions [3 x N] relative to Earth's centre.
+
+    Returns:
+        ndarray: Illumination in [0, 1] [N]; 1 is full sun, 0 is umbra.
+    """
+    a, b, c = _disk_angles(sat_km, sun_km)
+    frac = np.ones_like(c)
+    total = c <= b - a
+    frac[total] = 0.0
+    annular = c <= a - b
+    frac[annular] = 1.0 - (b[annular] / a[annular]) ** 2
+
+    partial = (c < a + b) & ~total & ~annular
+    if partial.any():
+        ap, bp, cp = a[partial], b[partial], c[partial]
+        # Overlap area of two circular disks of radii a, b at distance c
+        x = (cp ** 2 + ap ** 2 - bp ** 2) / (2.0 * cp)
+        y = np.sqrt(np.maximum(ap ** 2 - x ** 2, 0.0))
+        area = (ap ** 2 * np.arccos(np.clip(x / ap, -1.0, 1.0))
+                + bp ** 2 * np.arccos(np.clip((cp - x) / bp, -1.0, 1.0))
+                - cp * y)
+        frac[partial] = np.clip(1.0 - area / (np.pi * ap ** 2), 0.0, 1.0)
+    return frac
+
+
+def shadow_state(sat_km, sun_km):
+    """SUNLIT / PENUMBRA / UMBRA for each position [N]."""
+    a, b, c = _disk_angles(sat_km, sun_km)
+    state = np.full(c.shape, PENUMBRA, dtype=np.int8)
+    state[c >= a + b] = SUNLIT
+    state[c <= b - a] = UMBRA
+    return state
+
+
+class EclipseIntervals:
+    """
+    Piecewise-constant illumination of one satellite over a horizon.
+
+    `edges_sec` holds segment boundaries in seconds since the horizon start
+    (the first is 0, the last is the horizon length); segment k runs from
+    edges_sec[k] to edges_sec[k + 1] with shadow state `state[k]` and mean
+    illumination `illumination[k]` (1 in sun, 0 in umbra).
+    """
+
+    def __init__(self, edges_sec, state, illumination):
+        self.edges_sec = np.asarray(edges_sec, dtype=float)
+        self.state = np.asarray(state, dtype=np.int8)
+        self.illumination = np.asarray(illumination, dtype=float)
+
+    def __len__(self):
+        return len(self.state)
+
+    @property
+    def duration_sec(self):
+        return float(self.edges_sec[-1])
+
+    def state_at(self, seconds):
+        k = np.searchsorted(self.edges_sec, seconds, side="right") - 1
+        return self.state[np.clip(k, 0, len(self.state) - 1)]
+
+    def segments(self, t0_sec, t1_sec):
+        """
+        Durations and illumination of the pieces of [t0_sec, t1_sec].
+
+        Returns:
+            tuple: (durations_sec [k], illumination [k])
+        """
+        if t1_sec <= t0_sec:
+            return np.zeros(0), np.zeros(0)
+        last = len(self.state) - 1
+        lo = min(max(int(np.searchsorted(self.edges_sec, t0_sec, side="right")) - 1, 0), last)
+        hi = min(max(int(np.searchsorted(self.edges_sec, t1_sec, side="left")) - 1, 0), last)
+        bounds = self.edges_sec[lo:hi + 2].copy()
+        bounds[0], bounds[-1] = t0_sec, t1_sec
+        return np.diff(bounds), self.illumination[lo:hi + 1]
+
+    def sunlit_seconds(self, t0_sec, t1_sec):
+        """Illumination-weighted time in sunlight within [t0_sec, t1_sec]."""
+        durations, illum = self.segments(t0_sec, t1_sec)
+        return float(np.dot(durations, illum))
+
+    def cumulative_sunlit(self, seconds):
+        """Illumination-weighted sunlit seconds from the start up to each of `seconds`."""
+        cum = np.concatenate(([0.0], np.cumsum(np.diff(self.edges_sec) * self.illumination)))
+        return np.interp(seconds, self.edges_sec, cum)
+
+    def eclipses(self, kind=UMBRA):
+        """(start_sec, end_sec) of every segment in shadow state `kind`."""
+        sel = np.flatnonzero(self.state == kind)
+        return list(zip(self.edges_sec[sel].tolist(), self.edges_sec[sel + 1].tolist()))
+
+
+def _eclipse_intervals(sat, sun, t0, t1, step_sec):
+    def state_at(t):
+        return shadow_state(sat.at(t).position.km, sun.at(t).position.km)
+    state_at.step_days = step_sec / DAY_S
+
+    times, states = find_discrete(t0, t1, state_at)
+    span_sec = (t1 - t0) * DAY_S
+    edges = np.concatenate(([0.0], (times.tt - t0.tt) * DAY_S, [span_sec]))
+    state = np.concatenate((np.atleast_1d(state_at(t0)), states)).astype(np.int8)
+
+    illum = (state == SUNLIT).astype(float)
+    pen = np.flatnonzero(state == PENUMBRA)
+    if len(pen):
+        # Mean illumination of each penumbra segment from interior samples
+        offsets = (np.arange(PENUMBRA_SAMPLES) + 0.5) / PENUMBRA_SAMPLES
+        sample_sec = edges[pen, None] + (edges[pen + 1] - edges[pen])[:, None] * offsets[None, :]
+        t = t0.ts.tt_jd(t0.tt + sample_sec.ravel() / DAY_S)
+        frac = illumination(sat.at(t).position.km, sun.at(t).position.km)
+        illum[pen] = frac.reshape(len(pen), PENUMBRA_SAMPLES).mean(axis=1)
+    return EclipseIntervals(edges, state, illum)
+
+
+def compute_eclipses(satellites, t0, t1, eph, step_sec=10.0):
+    """
+    Penumbra / umbra entry and exit times for every satellite over [t0, t1].
+
+    Shadow states are sampled every `step_sec` and transitions refined with
+    Skyfield's discrete root-finder. A LEO penumbra lasts roughly 10-20 s;
+    one shorter than `step_sec` may be found as a single sun/umbra switch
+    inside it rather than as its own segment.
+
+    Args:
+        satellites (list): Skyfield EarthSatellite objects.
+        t0, t1 (Time): Horizon.
+        eph: Loaded JPL ephemeris.
+        step_sec (float): Coarse sampling interval.
+
+    Returns:
+        list: One EclipseIntervals per satellite, times in seconds since t0.
+    """
+    sun = eph['sun'] - eph['earth']
+    return [_eclipse_intervals(sat, sun, t0, t1, step_sec) for sat in satellites]
@@ -3,6 +3,8 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from core.fleet import FleetState
+
 class EnergyModel:
     def __init__(self,
                  capacity_wh: float,
@@ -13,7 +15,12 @@ class EnergyModel:
                  idle_power_w: float):
         """
         Energy model with more realistic power draw and charging logic.
+
+        State lives in a FleetState row; a standalone model owns a
+        one-satellite fleet. Use EnergyModel.view() to wrap an existing row.
         """
+        self._fleet = FleetState(1)
+        self._i = 0
         self.capacity = capacity_wh
         self.energy = min(initial_wh, capacity_wh)  # Clamp if initial > capacity
         self.charge_rate_w = charge_rate_w
@@ -21,6 +28,30 @@ class EnergyModel:
         self.downlink_power_w = downlink_power_w
         self.idle_power_w = idle_power_w
 
+    @classmethod
+    def view(cls, fleet, i):
+        """Per-satellite view onto row i of a FleetState."""
+        model = cls.__new__(cls)
+        model._fleet = fleet
+        model._i = i
+        return model
+
+    def _field(name):
+        def get(self):
+            return float(getattr(self._fleet, name)[self._i])
+
+        def set(self, value):
+            getattr(self._fleet, name)[self._i] = value
+        return property(get, set)
+
+    capacity = _field("capacity_wh")
+    energy = _field("energy_wh")
+    charge_rate_w = _field("charge_rate_w")
+    imaging_power_w = _field("imaging_power_w")
+    downlink_power_w = _field("downlink_power_w")
+    idle_power_w = _field("idle_power_w")
+    del _field
+
     def step(self, in_sunlight: bool, action: str, dt_minutes: float) -> float:
         dt_hours = dt_minutes / 60.0
 
@@ -38,6 +69,59 @@ class EnergyModel:
 
         return self.energy
 
+    def step_n(self, in_sunlight: bool, action: str, dt_minutes: float, n: int) -> float:
+        """
+        Closed-form equivalent of calling step() n times with the same
+        sunlight state and action.
+        """
+        if n <= 0:
+            return self.energy
+        self.step(in_sunlight, action, dt_minutes)
+        if n == 1:
+            return self.energy
+
+        dt_hours = dt_minutes / 60.0
+        gain = self.charge_rate_w * dt_hours if in_sunlight else 0.0
+        draw = self.action_power_w(action) * dt_hours
+        net = gain - draw
+
+        # After one step the battery sits at or below capacity - draw, so the
+        # capacity clamp can only bind (at that same level) when net >= 0.
+        if in_sunlight and net >= 0:
+            self.energy = min(self.energy + (n - 1) * net, max(0.0, self.capacity - draw))
+        else:
+            self.energy = max(0.0, self.energy + (n - 1) * net)
+        return self.energy
+
+    def integrate(self, eclipse, t0_sec: float, t1_sec: float, action: str) -> float:
+        """
+        Advance the battery from t0_sec to t1_sec under a constant action,
+        charging in proportion to illumination from an EclipseIntervals.
+
+        Unlike step(), charge and draw are applied together as one net
+        power, so the result is exact for any interval length and for
+        eclipse boundaries falling anywhere inside it. Cost is
+        O(number of eclipse transitions in the interval).
+        """
+        durations, illum = eclipse.segments(t0_sec, t1_sec)
+        draw = self.action_power_w(action)
+        energy, capacity = self.energy, self.capacity
+        for dt_sec, frac in zip(durations.tolist(), illum.tolist()):
+            # Constant net power per segment: the battery fills or drains
+            # linearly and then stays at the bound it hits.
+            net = self.charge_rate_w * frac - draw
+            energy = min(capacity, max(0.0, energy + net * dt_sec / 3600.0))
+        self.energy = energy
+        return self.energy
+
+    def action_power_w(self, action: str) -> float:
+        """Power draw in W of 'image', 'downlink' or 'idle' (0 otherwise)."""
+        return {
+            "image": self.imaging_power_w,
+            "downlink": self.downlink_power_w,
+            "idle": self.idle_power_w,
+        }.get(action, 0.0)
+
     def can_perform(self, required_energy: float) -> bool:
         return self.energy >= required_energy
 
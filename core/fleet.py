@@ -0,0 +1,129 @@
+import numpy as np
+
+# Energy action codes for FleetState.step
+ACTION_NONE = -1
+ACTION_IDLE = 0
+ACTION_IMAGE = 1
+ACTION_DOWNLINK = 2
+
+ACTION_CODES = {"idle": ACTION_IDLE, "image": ACTION_IMAGE, "downlink": ACTION_DOWNLINK}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+
+
+class FleetState:
+    """
+    Struct-of-arrays energy / storage / attitude state for a whole fleet,
+    indexed by integer satellite ID.
+
+    EnergyModel and DataModel objects obtained from energy_model(i) and
+    data_model(i) are thin views onto row i of these arrays.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.capacity_wh = np.zeros(n)
+        self.energy_wh = np.zeros(n)
+        self.charge_rate_w = np.zeros(n)
+        self.imaging_power_w = np.zeros(n)
+        self.downlink_power_w = np.zeros(n)
+        self.idle_power_w = np.zeros(n)
+        self.storage_capacity_mb = np.zeros(n)
+        self.stored_mb = np.zeros(n)
+        self.downlink_rate_mbps = np.zeros(n)
+        # Last attitude (unit pointing vector); NaN rows mean "not pointed yet"
+        self.att_vec = np.full((n, 3), np.nan)
+
+    def __len__(self):
+        return self.n
+
+    @classmethod
+    def from_configs(cls, sat_configs):
+        """Build fleet state from scenario satellite dicts."""
+        fleet = cls(len(sat_configs))
+        for i, cfg in enumerate(sat_configs):
+            fleet.capacity_wh[i] = cfg["battery_wh"]
+            fleet.energy_wh[i] = min(cfg.get("initial_battery_wh", cfg["battery_wh"]), cfg["battery_wh"])
+            fleet.charge_rate_w[i] = cfg["charge_rate_w"]
+            fleet.imaging_power_w[i] = cfg["imaging_power_w"]
+            fleet.downlink_power_w[i] = cfg["downlink_power_w"]
+            fleet.idle_power_w[i] = cfg["idle_power_w"]
+            fleet.storage_capacity_mb[i] = cfg["storage_capacity_mb"]
+            fleet.stored_mb[i] = min(cfg.get("initial_storage_mb", 0), cfg["storage_capacity_mb"])
+            fleet.downlink_rate_mbps[i] = cfg["downlink_bandwidth_mbps"]
+        return fleet
+
+    def subset(self, ids):
+        """Independent FleetState holding copies of rows `ids`."""
+        ids = np.atleast_1d(ids)
+        sub = FleetState(len(ids))
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                setattr(sub, name, value[ids].copy())
+        return sub
+
+    def energy_model(self, i):
+        from core.energy_model import EnergyModel
+        return EnergyModel.view(self, i)
+
+    def data_model(self, i):
+        from core.data_model import DataModel
+        return DataModel.view(self, i)
+
+    def _mask(self, mask):
+        return np.ones(self.n, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    def step(self, in_sunlight, actions, dt_minutes, mask=None):
+        """
+        Vectorized EnergyModel.step for every satellite.
+
+        Args:
+            in_sunlight (ndarray): Sunlit flags [n].
+            actions (ndarray): ACTION_* codes [n]; ACTION_NONE only charges.
+            dt_minutes (float): Step length in minutes.
+            mask (ndarray): Optional [n] mask of satellites to advance.
+
+        Returns:
+            ndarray: Energy after the step [n].
+        """
+        mask = self._mask(mask)
+        actions = np.asarray(actions)
+        dt_hours = dt_minutes / 60.0
+        e = self.energy_wh
+        sun = mask & np.asarray(in_sunlight, dtype=bool)
+        e[sun] = np.minimum(self.capacity_wh[sun], e[sun] + self.charge_rate_w[sun] * dt_hours)
+
+        for code, power in ((ACTION_IMAGE, self.imaging_power_w),
+                            (ACTION_DOWNLINK, self.downlink_power_w),
+                            (ACTION_IDLE, self.idle_power_w)):
+            sel = mask & (actions == code)
+            e[sel] = np.maximum(0.0, e[sel] - power[sel] * dt_hours)
+        return e
+
+    def can_perform(self, required_wh):
+        return self.energy_wh >= required_wh
+
+    def store(self, sizes_mb, mask=None):
+        """
+        Vectorized DataModel.store_image: store where it fits.
+
+        Returns:
+            ndarray: [n] bool, True where the image was stored.
+        """
+        mask = self._mask(mask)
+        sizes_mb = np.broadcast_to(sizes_mb, (self.n,))
+        ok = mask & (self.stored_mb + sizes_mb <= self.storage_capacity_mb)
+        self.stored_mb[ok] += sizes_mb[ok]
+        return ok
+
+    def downlink(self, dt_minutes, mask=None):
+        """
+        Vectorized DataModel.downlink.
+
+        Returns:
+            ndarray: [n] MB downlinked (0 outside the mask).
+        """
+        mask = self._mask(mask)
+        capacity = (self.downlink_rate_mbps / 8.0) * 60.0 * dt_minutes
+        out = np.where(mask, np.minimum(self.stored_mb, capacity), 0.0)
+        self.stored_mb -= out
+        return out
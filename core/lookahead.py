@@ -0,0 +1,178 @@
+import numpy as np
+
+DEFAULT_HORIZON_MINUTES = 100.0  # about one LEO orbit
+DEFAULT_RESERVE_WH = 10.0
+
+
+class _RangeTree:
+    """
+    Segment tree over a prefix-sum series P answering, for an index range
+    [lo, hi], min(P) and the largest drawdown max(P[u] - P[t]) with
+    u <= t, in O(log n).
+    """
+
+    def __init__(self, prefix):
+        n = len(prefix)
+        size = 1
+        while size < n:
+            size *= 2
+        self.n = n
+        self.size = size
+        self.min = np.full(2 * size, np.inf)
+        self.max = np.full(2 * size, -np.inf)
+        self.dd = np.full(2 * size, -np.inf)
+        self.min[size:size + n] = prefix
+        self.max[size:size + n] = prefix
+        self.dd[size:size + n] = 0.0
+
+        # Build one tree level at a time
+        level = size // 2
+        while level >= 1:
+            node = np.arange(level, 2 * level)
+            left, right = 2 * node, 2 * node + 1
+            self.min[node] = np.minimum(self.min[left], self.min[right])
+            self.max[node] = np.maximum(self.max[left], self.max[right])
+            self.dd[node] = np.maximum(np.maximum(self.dd[left], self.dd[right]),
+                                       self.max[left] - self.min[right])
+            level //= 2
+
+    @staticmethod
+    def _merge(a, b):
+        """Combine (min, max, drawdown) of two adjacent ranges, a before b."""
+        return (min(a[0], b[0]), max(a[1], b[1]), max(a[2], b[2], a[1] - b[0]))
+
+    def query(self, lo, hi):
+        """(min, max, drawdown) of prefix[lo:hi + 1]."""
+        empty = (np.inf, -np.inf, -np.inf)
+        left, right = empty, empty
+        lo += self.size
+        hi += self.size + 1
+        while lo < hi:
+            if lo & 1:
+                left = self._merge(left, (self.min[lo], self.max[lo], self.dd[lo]))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right = self._merge((self.min[hi], self.max[hi], self.dd[hi]), right)
+            lo //= 2
+            hi //= 2
+        return self._merge(left, right)
+
+
+class EnergyOracle:
+    """
+    Battery lookahead over the predicted future timeline of each satellite.
+
+    The timeline is the net energy per step when the satellite only idles
+    and downlinks on every ground-station pass: charge scaled by the step's
+    sunlit fraction minus idle or downlink draw. Prefix sums of that series
+    sit in a range tree, so "does the battery stay above reserve until the
+    next sunrise if I spend X Wh now?" costs O(log n), including the
+    clipping of charge at full capacity.
+
+    A query never looks more than `horizon_steps` ahead, so each satellite
+    keeps one tree over a block of two horizons of the series, built when
+    a decision first falls in the block. Tree memory is therefore
+    O(satellites x horizon) instead of O(satellites x steps).
+    """
+
+    def __init__(self, gain_wh, draw_wh, capacity_wh, horizon_steps):
+        self.gain_wh = np.asarray(gain_wh, dtype=float)
+        self.draw_wh = np.asarray(draw_wh, dtype=float)
+        self.capacity_wh = np.asarray(capacity_wh, dtype=float)
+        self.horizon_steps = max(1, int(horizon_steps))
+
+        net = self.gain_wh - self.draw_wh
+        n_sats, steps = net.shape
+        self.prefix = np.zeros((n_sats, steps + 1))
+        np.cumsum(net, axis=1, out=self.prefix[:, 1:])
+        # satellite -> (first prefix index of its block, _RangeTree)
+        self._blocks = {}
+
+        # Sunrise steps: charging resumes after a step with no sunlight
+        dark = self.gain_wh <= 0.0
+        self._sunrise = [np.flatnonzero(~dark[i, 1:] & dark[i, :-1]) + 1 for i in range(n_sats)]
+
+    @classmethod
+    def from_geometry(cls, geometry, fleet, timestep_sec, min_elev_deg, eclipses=None,
+                      horizon_minutes=DEFAULT_HORIZON_MINUTES, contacts=None):
+        """
+        Build the oracle for a fleet over a precomputed Geometry.
+
+        Args:
+            geometry (Geometry): Precomputed geometry (sunlight, ground passes).
+            fleet (FleetState): Power parameters per satellite.
+            timestep_sec (float): Step length.
+            min_elev_deg (float): Ground-station elevation mask.
+            eclipses (list): Optional EclipseIntervals per satellite; gives
+                fractional sunlight for steps that straddle an eclipse edge.
+            horizon_minutes (float): Longest lookahead.
+            contacts (ContactPlan): Optional antenna allocation; downlinks
+                are then expected only where an antenna is allocated.
+        """
+        steps = geometry.steps
+        dt_hours = timestep_sec / 3600.0
+        if eclipses is None:
+            sun_frac = geometry.sunlit.astype(float)
+        else:
+            edges = np.arange(steps + 1) * float(timestep_sec)
+            sun_frac = np.array([np.diff(e.cumulative_sunlit(edges)) / timestep_sec for e in eclipses])
+            sun_frac = sun_frac.reshape(len(fleet), steps)
+
+        gain = sun_frac * fleet.charge_rate_w[:, None] * dt_hours
+        draw = np.empty_like(gain)
+        for i in range(len(fleet)):
+            ground = contacts.ground_steps(i) if contacts is not None else geometry.ground_steps(i, min_elev_deg)
+            draw[i] = np.where(ground, fleet.downlink_power_w[i], fleet.idle_power_w[i]) * dt_hours
+        return cls(gain, draw, fleet.capacity_wh, horizon_minutes * 60.0 / timestep_sec)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the timeline arrays and the range trees built so far."""
+        trees = sum(t.min.nbytes + t.max.nbytes + t.dd.nbytes for _, t in self._blocks.values())
+        return self.gain_wh.nbytes + self.draw_wh.nbytes + self.prefix.nbytes + trees
+
+    def _query(self, i, lo, hi):
+        """_RangeTree.query over prefix[i, lo:hi + 1], with hi - lo <= horizon_steps."""
+        first, tree = self._blocks.get(i, (-1, None))
+        if tree is None or not first <= lo < first + self.horizon_steps:
+            first = lo - lo % self.horizon_steps
+            tree = _RangeTree(self.prefix[i, first:first + 2 * self.horizon_steps + 1])
+            self._blocks[i] = (first, tree)
+        return tree.query(lo - first, hi - first)
+
+    def window_end(self, i, step):
+        """Last step checked for a decision at `step`: the next sunrise, capped by the horizon."""
+        steps = self.gain_wh.shape[1]
+        end = min(step + self.horizon_steps, steps - 1)
+        sunrise = self._sunrise[i]
+        k = np.searchsorted(sunrise, step, side="right")
+        if k < len(sunrise):
+            end = min(end, int(sunrise[k]))
+        return end
+
+    def energy_after(self, i, step, energy_wh, spend_wh):
+        """Battery level after `step` if `spend_wh` replaces the planned draw."""
+        return min(float(self.capacity_wh[i]), max(0.0, energy_wh + self.gain_wh[i, step] - spend_wh))
+
+    def min_energy(self, i, step, energy_wh, spend_wh):
+        """
+        Lowest predicted battery level from the end of `step` through
+        window_end(i, step), after spending `spend_wh` during `step`.
+        """
+        start = self.energy_after(i, step, energy_wh, spend_wh)
+        end = self.window_end(i, step)
+        if end <= step:
+            return start
+        # Prefix indices step+1 .. end+1 cover the levels after steps step .. end
+        lo, hi = step + 1, end + 1
+        low, _, drawdown = self._query(i, lo, hi)
+        unclipped = start + low - self.prefix[i, lo]
+        # Charge clipped at capacity can only lower later levels: the level
+        # at t is at most capacity minus the drawdown since any earlier u.
+        clipped = float(self.capacity_wh[i]) - drawdown
+        return min(unclipped, clipped, start)
+
+    def energy_ok(self, i, step, energy_wh, spend_wh, reserve_wh=DEFAULT_RESERVE_WH):
+        """True if spending `spend_wh` now keeps the battery above `reserve_wh`."""
+        return self.min_energy(i, step, energy_wh, spend_wh) >= reserve_wh
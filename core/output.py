@@ -0,0 +1,396 @@
+import csv
+import json
+import os
+import threading
+import zipfile
+import numpy as np
+
+FIELDNAMES = [
+    "timestamp", "satellite", "action", "in_sunlight", "over_target", "over_ground",
+    "energy_wh", "battery_pct", "data_mb", "storage_pct"
+]
+
+# Formats written when the scenario does not set 'output_format'
+DEFAULT_FORMATS = ("csv", "json")
+
+DEFAULT_CHUNK_ROWS = 10000
+
+
+def _reopen(path, offset, newline=None):
+    """Open `path` for writing from byte `offset`, dropping anything after it."""
+    f = open(path, "r+", newline=newline)
+    f.seek(offset)
+    f.truncate()
+    return f
+
+
+class CsvSink:
+    """
+    Rows streamed to a CSV file as they arrive.
+
+    checkpoint() returns the byte offset of the rows written so far; a sink
+    created with resume=<offset> truncates the file there and appends.
+    """
+
+    extension = ".csv"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, resume=None):
+        self.path = path
+        if resume is None:
+            self._file = open(path, "w", newline='')
+        else:
+            self._file = _reopen(path, resume, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        if resume is None:
+            self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def checkpoint(self):
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class JsonSink:
+    """
+    Rows streamed as one JSON array, byte-for-byte what
+    json.dump(rows, f, indent=2) would write, without holding the rows.
+    """
+
+    extension = ".json"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, resume=None):
+        self.path = path
+        if resume is None:
+            self._file = open(path, "w")
+            self._count = 0
+        else:
+            # (byte offset before the closing bracket, rows written)
+            offset, self._count = resume
+            self._file = _reopen(path, offset)
+
+    def write(self, row):
+        body = json.dumps(row, indent=2).replace("\n", "\n  ")
+        self._file.write(("[\n  " if self._count == 0 else ",\n  ") + body)
+        self._count += 1
+
+    def checkpoint(self):
+        self._file.flush()
+        return [self._file.tell(), self._count]
+
+    def close(self):
+        self._file.write("\n]" if self._count else "[]")
+        self._file.close()
+
+
+class NdjsonSink:
+    """Newline-delimited JSON: one compact object per row."""
+
+    extension = ".ndjson"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, resume=None):
+        self.path = path
+        self._file = open(path, "w") if resume is None else _reopen(path, resume)
+
+    def write(self, row):
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    def checkpoint(self):
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class _ColumnBuffer:
+    """Per-column row buffer flushed every `chunk_rows` rows."""
+
+    def __init__(self, fieldnames, chunk_rows):
+        self.fieldnames = list(fieldnames)
+        self.chunk_rows = chunk_rows
+        self._columns = {name: [] for name in self.fieldnames}
+        self._rows = 0
+
+    def write(self, row):
+        for name in self.fieldnames:
+            self._columns[name].append(row[name])
+        self._rows += 1
+        if self._rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self.write_chunk({name: np.asarray(values) for name, values in self._columns.items()})
+            for values in self._columns.values():
+                values.clear()
+            self._rows = 0
+
+
+def _chunk_index(member):
+    """Chunk number of a '<column>.<chunk>.npy' archive member, None for other members."""
+    chunk = member.split(".")[-2] if member.count(".") >= 2 else ""
+    return int(chunk) if chunk.isdigit() else None
+
+
+class NpzSink(_ColumnBuffer):
+    """
+    Columnar .npz archive written in chunks. Each flushed chunk adds one
+    '<column>.<chunk>' array per column; load_npz_columns() joins them.
+
+    checkpoint() flushes and returns the chunk count. Resuming copies that
+    many chunks into a fresh archive, so it needs a complete (closed) file:
+    a zip archive cut off mid-write has no central directory.
+    """
+
+    extension = ".npz"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, chunk_rows=DEFAULT_CHUNK_ROWS, resume=None):
+        super().__init__(fieldnames, chunk_rows)
+        self.path = path
+        self._chunk = 0
+        if resume:
+            try:
+                with zipfile.ZipFile(path) as old:
+                    kept = {name: old.read(name) for name in old.namelist()
+                            if _chunk_index(name) is not None and _chunk_index(name) < resume}
+            except (OSError, zipfile.BadZipFile) as e:
+                raise ValueError(f"Cannot resume {path}: not a complete .npz archive") from e
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        if resume:
+            for name, data in kept.items():
+                self._zip.writestr(name, data)
+            self._chunk = resume
+
+    def write_chunk(self, columns):
+        for name, arr in columns.items():
+            with self._zip.open(f"{name}.{self._chunk:05d}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array(f, arr, allow_pickle=False)
+        self._chunk += 1
+
+    def checkpoint(self):
+        self.flush()
+        return self._chunk
+
+    def close(self):
+        self.flush()
+        self._zip.close()
+
+
+class ParquetSink(_ColumnBuffer):
+    """Parquet file with one row group per chunk (requires pyarrow). Not resumable."""
+
+    extension = ".parquet"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, chunk_rows=DEFAULT_CHUNK_ROWS, resume=None):
+        if resume is not None:
+            raise ValueError("Parquet output cannot be resumed from a checkpoint; use csv, ndjson, json or npz")
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("output_format 'parquet' requires pyarrow (pip install pyarrow)") from e
+        super().__init__(fieldnames, chunk_rows)
+        self.path = path
+        self._pa = pyarrow
+        self._writer = None
+        self._parquet = pyarrow.parquet
+
+    def write_chunk(self, columns):
+        table = self._pa.table(columns)
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class MemorySink:
+    """
+    Rows kept in memory, readable while they are still being written:
+    follow() yields rows as they arrive until the sink is closed.
+    """
+
+    path = None
+
+    def __init__(self, fieldnames=FIELDNAMES):
+        self.rows = []
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write(self, row):
+        with self._cond:
+            self.rows.append(row)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def follow(self, start=0):
+        """Yield rows from index `start`, waiting for new ones until close()."""
+        pos = start
+        while True:
+            with self._cond:
+                while pos >= len(self.rows) and not self.closed:
+                    self._cond.wait()
+                batch = self.rows[pos:]
+                done = self.closed
+            yield from batch
+            pos += len(batch)
+            if done and pos >= len(self.rows):
+                return
+
+
+class SpoolSink:
+    """
+    Rows appended to an NDJSON file that can be read while it is still
+    being written: follow() yields rows from the file as they arrive until
+    the sink is closed. Nothing is kept in memory, so a long run or many
+    finished ones cost disk space only.
+
+    Rows are flushed every `flush_rows` rows and on close; followers see
+    rows once they are flushed.
+    """
+
+    extension = ".ndjson"
+
+    def __init__(self, path, fieldnames=FIELDNAMES, flush_rows=256):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.flush_rows = flush_rows
+        self._file = open(path, "w")
+        self.count = 0
+        self._flushed = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write(self, row):
+        self._file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self.count += 1
+        if self.count - self._flushed >= self.flush_rows:
+            self._flush()
+
+    def _flush(self):
+        self._file.flush()
+        with self._cond:
+            self._flushed = self.count
+            self._cond.notify_all()
+
+    def close(self):
+        if self.closed:
+            return
+        self._file.close()
+        with self._cond:
+            self._flushed = self.count
+            self.closed = True
+            self._cond.notify_all()
+
+    def follow(self, start=0):
+        """Yield rows from index `start`, waiting for new ones until close()."""
+        pos = 0
+        with open(self.path) as f:
+            while True:
+                with self._cond:
+                    while pos >= self._flushed and not self.closed:
+                        self._cond.wait()
+                    available, done = self._flushed, self.closed
+                while pos < available:
+                    line = f.readline()
+                    if pos >= start:
+                        yield json.loads(line)
+                    pos += 1
+                if done and pos >= self._flushed:
+                    return
+
+
+SINKS = {
+    "csv": CsvSink,
+    "json": JsonSink,
+    "ndjson": NdjsonSink,
+    "npz": NpzSink,
+    "parquet": ParquetSink,
+}
+
+
+def parse_formats(value):
+    """Output formats from a list or a comma-separated string; None gives the defaults."""
+    if value is None:
+        return list(DEFAULT_FORMATS)
+    formats = [f.strip().lower() for f in (value.split(",") if isinstance(value, str) else value)]
+    formats = [f for f in formats if f]
+    unknown = [f for f in formats if f not in SINKS]
+    if unknown:
+        raise ValueError(f"Unknown output format(s) {unknown}; choose from {sorted(SINKS)}")
+    return formats
+
+
+class OutputSinks:
+    """
+    Fan rows out to one sink per output format. Paths share the stem of
+    `output_path` with each format's extension; `extra` sinks (e.g. a
+    MemorySink) receive every row too. Use as a context manager.
+
+    `resume` maps formats to offsets from an earlier checkpoint(); those
+    files are continued from the offset instead of being rewritten.
+    """
+
+    def __init__(self, output_path, formats=None, fieldnames=FIELDNAMES, extra=(), resume=None):
+        stem = os.path.splitext(output_path)[0]
+        self.sinks = list(extra)
+        self.formats = {}
+        resume = resume or {}
+        try:
+            for fmt in parse_formats(formats):
+                path = stem + SINKS[fmt].extension
+                offset = resume.get(fmt) if os.path.exists(path) else None
+                sink = SINKS[fmt](path, fieldnames, resume=offset)
+                self.formats[fmt] = sink
+                self.sinks.append(sink)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def paths(self):
+        return [s.path for s in self.sinks if s.path is not None]
+
+    def write(self, row):
+        for sink in self.sinks:
+            sink.write(row)
+
+    @property
+    def resumable(self):
+        return all(hasattr(sink, "checkpoint") for sink in self.formats.values())
+
+    def checkpoint(self):
+        """{format: offset} for resuming every format file at the current row."""
+        return {fmt: sink.checkpoint() for fmt, sink in self.formats.items()}
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_npz_columns(path):
+    """Read an NpzSink archive back as {column: array}."""
+    columns = {}
+    with np.load(path, allow_pickle=False) as npz:
+        for key in sorted(npz.files):
+            name = key.rsplit(".", 1)[0]
+            columns.setdefault(name, []).append(npz[key])
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
@@ -0,0 +1,156 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from sgp4.api import Satrec
+from core import resources
+from core.propagation import propagate_fleet, propagation_key
+
+DEFAULT_WORKERS = 1
+
+_FIELDS = ("gcrs_km", "gcrs_vel_km_s", "itrs_km", "sunlit")
+
+def resolve_workers(workers):
+    """Worker count from a setting: None / 1 for serial, 0 or less for every core."""
+    if workers is None:
+        return DEFAULT_WORKERS
+    workers = int(workers)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+class SharedArrays:
+    """
+    NumPy arrays backed by named shared-memory blocks, so worker processes
+    can fill slices in place instead of pickling results back.
+
+    `spec` is what a worker needs to attach (see attach_shared()). The
+    owner calls release() once the workers are done: it copies the arrays
+    into ordinary memory and unlinks the blocks.
+    """
+
+    def __init__(self, layout):
+        self._blocks = {}
+        self.arrays = {}
+        for name, (shape, dtype) in layout.items():
+            nbytes = max(1, math.prod(shape) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=nbytes)
+            self._blocks[name] = block
+            self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def spec(self):
+        return {name: (self._blocks[name].name, a.shape, a.dtype.str) for name, a in self.arrays.items()}
+
+    def release(self):
+        """Copy every array out of shared memory and free the blocks."""
+        out = {name: np.array(a) for name, a in self.arrays.items()}
+        self.arrays.clear()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        return out
+
+
+def attach_shared(spec):
+    """
+    Attach to a SharedArrays spec from another process.
+
+    Returns:
+        tuple: (blocks to close when done, {name: ndarray})
+    """
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _geometry_shard(spec, lo, hi, tles, propagate, times, eph_path, elevation_fn, sites):
+    """
+    Worker: propagate satellites [lo, hi) that are not cached and write
+    their states and elevation matrices into the shared arrays.
+    """
+    blocks, arrays = attach_shared(spec)
+    try:
+        todo = [i for i in range(lo, hi) if propagate[i]]
+        if todo:
+            # Same SGP4 model EarthSatellite builds from the TLE
+            satrecs = [Satrec.twoline2rv(*tles[i]) for i in todo]
+            states = propagate_fleet(satrecs, times, resources.ephemeris(eph_path) if eph_path else None)
+            for name, value in zip(_FIELDS, states):
+                if value is not None:
+                    arrays[name][todo] = value
+        for name, (pos, up) in sites.items():
+            for i in range(lo, hi):
+                arrays[name][i] = elevation_fn(arrays["itrs_km"][i], pos, up)
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+
+
+def parallel_fleet_geometry(tles, times, eph, sites, elevation_fn, workers, cache=None):
+    """
+    Fleet propagation and elevation matrices fanned out over a process
+    pool, one contiguous satellite shard per worker.
+
+    Every satellite's numbers are computed exactly as in the serial path,
+    so the result does not depend on the worker count.
+
+    Args:
+        tles (list): TLE line pairs, one per satellite.
+        times (Time): Array Time.
+        eph: Loaded JPL ephemeris, reopened by each worker from its path;
+            None leaves `sunlit` all False.
+        sites (dict): {'target_elev' / 'gs_elev': (positions, up)} to
+            evaluate elevations for.
+        elevation_fn (callable): elevation_matrix(sat_itrs_km, pos, up).
+        workers (int): Process count.
+        cache (PropagationCache): Optional cache, read and written here.
+
+    Returns:
+        dict: gcrs_km, gcrs_vel_km_s, itrs_km, sunlit and one array per
+        `sites` entry, all with satellites on the first axis.
+    """
+    n_sats, n_steps = len(tles), len(times)
+    layout = {
+        "gcrs_km": ((n_sats, n_steps, 3), np.float64),
+        "gcrs_vel_km_s": ((n_sats, n_steps, 3), np.float64),
+        "itrs_km": ((n_sats, n_steps, 3), np.float64),
+        "sunlit": ((n_sats, n_steps), np.bool_),  # shared blocks start zeroed
+    }
+    for name, (pos, _) in sites.items():
+        layout[name] = ((n_sats, n_steps, len(pos)), np.float64)
+    shared = SharedArrays(layout)
+
+    try:
+        keys = [None] * n_sats
+        propagate = np.ones(n_sats, dtype=bool)
+        if cache is not None:
+            for i in range(n_sats):
+                keys[i] = propagation_key(tles[i], times, eph)
+                hit = cache.get(keys[i])
+                if hit is not None:
+                    for name, value in zip(_FIELDS, hit):
+                        shared.arrays[name][i] = value
+                    propagate[i] = False
+
+        shard = max(1, -(-n_sats // workers))
+        eph_path = os.path.abspath(eph.path) if eph is not None else None
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_geometry_shard, shared.spec, lo, min(lo + shard, n_sats), tles,
+                                propagate, times, eph_path, elevation_fn, sites)
+                    for lo in range(0, n_sats, shard)]
+            for job in jobs:
+                job.result()
+
+        if cache is not None:
+            for i in np.flatnonzero(propagate):
+                cache.put(keys[i], tuple(shared.arrays[name][i].copy() for name in _FIELDS))
+    except BaseException:
+        shared.release()
+        raise
+    return shared.release()
@@ -0,0 +1,662 @@
+import bisect
+import math
+import numpy as np
+from core.data_model import DataModel
+from core.energy_model import EnergyModel
+
+# Highest-priority targets per satellite step scored by the chronological
+# pass, among those the revisit interval still allows
+DEFAULT_CANDIDATES_PER_STEP = 32
+
+# Lookahead of the chronological pass, in steps
+DEFAULT_WINDOW_STEPS = 10
+
+# Fill + resource repair rounds: one chronological pass, then insertion passes
+DEFAULT_PASSES = 2
+
+OPPORTUNITY_DTYPE = np.dtype([
+    ("sat", np.int32),
+    ("step", np.int32),
+    ("target", np.int32),
+    ("priority", np.float64),
+])
+
+_LOS_CHUNK = 65536
+
+# Cosine margin below the slew limit for a bulk check to rule a slew out
+_SLEW_MARGIN = 1e-6
+
+
+def build_opportunities(geometry, catalog, min_elev_deg, per_step=None,
+                        weather=None, start_epoch=0.0, timestep_sec=60.0):
+    """
+    Imaging opportunities over the whole horizon: (satellite, step, target)
+    for every target in view, ordered by satellite, step and descending
+    priority. With `weather` (CloudCover) cloudy opportunities are
+    dropped, or down-ranked, first.
+
+    Args:
+        geometry (Geometry): Precomputed geometry (any variant).
+        catalog (TargetCatalog): Targets.
+        min_elev_deg (float): Elevation mask.
+        per_step (int): Keep only this many highest-priority targets per
+            satellite step (None for all).
+        weather (CloudCover): Optional cloud screening.
+        start_epoch (float): POSIX seconds of step 0 (for `weather`).
+        timestep_sec (float): Step length (for `weather`).
+
+    Returns:
+        tuple: (opportunities [K] of OPPORTUNITY_DTYPE,
+        los [K x 3] GCRS unit line-of-sight vectors)
+    """
+    opps = []
+    for i in range(geometry.sat_itrs_km.shape[0]):
+        steps, tgt = geometry.visibility_pairs(i, min_elev_deg)
+        steps = np.asarray(steps, dtype=np.int64)
+        tgt = np.asarray(tgt, dtype=np.int64)
+        if len(steps) == 0:
+            continue
+        prio = catalog.priority[tgt]
+        if weather is not None:
+            clear, weight = weather.screen(start_epoch + steps * timestep_sec, tgt)
+            if weight is not None:
+                prio = prio * weight
+            steps, tgt, prio = steps[clear], tgt[clear], prio[clear]
+            if len(steps) == 0:
+                continue
+        order = np.lexsort((tgt, -prio, steps))
+        steps, tgt, prio = steps[order], tgt[order], prio[order]
+        if per_step is not None:
+            rank = np.arange(len(steps)) - np.searchsorted(steps, steps, side="left")
+            keep = rank < per_step
+            steps, tgt, prio = steps[keep], tgt[keep], prio[keep]
+
+        rec = np.empty(len(steps), dtype=OPPORTUNITY_DTYPE)
+        rec["sat"], rec["step"], rec["target"], rec["priority"] = i, steps, tgt, prio
+        opps.append(rec)
+
+    # Joined piece by piece, each freed once copied: np.empty pages are only
+    # committed as they are written, so the pieces and the result are never
+    # all held at once
+    all_opps = np.empty(sum(len(rec) for rec in opps), dtype=OPPORTUNITY_DTYPE)
+    hi = len(all_opps)
+    while opps:
+        rec = opps.pop()
+        all_opps[hi - len(rec):hi] = rec
+        hi -= len(rec)
+
+    # Same line of sight as the scheduler: Earth-fixed, rotated to GCRS.
+    # Filled in fixed-size chunks so no temporary spans every opportunity.
+    los = np.empty((len(all_opps), 3))
+    for lo in range(0, len(all_opps), _LOS_CHUNK):
+        o = all_opps[lo:lo + _LOS_CHUNK]
+        vec = catalog.ecef_km[o["target"]] - geometry.sat_itrs_km[o["sat"], o["step"]]
+        vec /= np.linalg.norm(vec, axis=1)[:, None]
+        los[lo:lo + _LOS_CHUNK] = np.einsum('nj,nji->ni', vec, geometry.itrs_rotation(o["step"]))
+    return all_opps, los
+
+
+class Plan:
+    """
+    Imaging plan: `target[sat, step]` is the target ID to image, or -1.
+    `stats` summarizes how it was built.
+    """
+
+    def __init__(self, target, stats):
+        self.target = target
+        self.stats = stats
+
+    def __len__(self):
+        return int((self.target >= 0).sum())
+
+    def target_at(self, sat_idx, step):
+        return int(self.target[sat_idx, step])
+
+    def images(self):
+        """(sat, step, target) rows of every planned image, in time order."""
+        sat, step = np.nonzero(self.target >= 0)
+        order = np.lexsort((sat, step))
+        return np.column_stack((sat[order], step[order], self.target[sat[order], step[order]]))
+
+
+class Planner:
+    """
+    Pass-based imaging planner over the whole horizon.
+
+    The first pass walks the horizon in time order. At every satellite
+    step with opportunities it scores, by dynamic programming over the
+    next `window_steps` steps of that satellite's opportunities, the best
+    chain of slew-compatible images starting with each target in view now
+    against skipping the step, and commits only the current decision. A
+    low-priority target now is therefore passed over when it would slew
+    the satellite away from a higher-priority one a few steps later.
+    Energy and storage are advanced alongside with the scheduler's own
+    gates, so a choice the battery or storage cannot carry falls back to
+    the next best one. Chains count on targets another satellite may
+    image first, so the pass is also run one step ahead (the scheduler's
+    greedy choice) and the better of the two plans is kept.
+
+    Later passes insert the remaining opportunities in priority order
+    wherever the slot, revisit interval and slew to both neighbouring
+    images allow. Each satellite's timeline is then replayed and images
+    the scheduler would reject are dropped and banned; a satellite whose
+    planned priority went down is restored to its previous plan.
+    """
+
+    def __init__(self, geometry, fleet, catalog, timestep_sec, start_epoch, min_elev_deg,
+                 max_slew_deg, slew_models=None, energy_gate=None, eclipses=None,
+                 per_step=DEFAULT_CANDIDATES_PER_STEP, window_steps=DEFAULT_WINDOW_STEPS, contacts=None,
+                 weather=None):
+        self.geometry = geometry
+        self.contacts = contacts
+        self.fleet = fleet
+        self.catalog = catalog
+        self.timestep_sec = timestep_sec
+        self.start_epoch = start_epoch
+        self.max_slew_deg = max_slew_deg
+        self.eclipses = eclipses
+        self.energy_gate = energy_gate or (lambda energy, i, step, action: True)
+
+        n_sats, steps = geometry.sunlit.shape
+        self.slew_models = slew_models or [None] * n_sats
+        # Every opportunity is kept: which ones are worth scoring depends on
+        # the revisit intervals left open by images planned before them
+        self.opps, self.los = build_opportunities(geometry, catalog, min_elev_deg, None,
+                                                  weather, start_epoch, timestep_sec)
+        self.per_step = max(1, int(per_step))
+
+        self.window_steps = max(1, int(window_steps))
+        # Opportunities are grouped by satellite, each group ordered by step
+        self.sat_lo = np.searchsorted(self.opps["sat"], np.arange(n_sats), side="left")
+        self.sat_hi = np.searchsorted(self.opps["sat"], np.arange(n_sats), side="right")
+        # Slew limit as a cosine for the lookahead scoring
+        self.cos_slew = np.array([
+            math.cos(math.radians(min(max_slew_deg, m.max_angle(timestep_sec) if m else max_slew_deg)))
+            for m in self.slew_models])
+
+        # Attitude each satellite starts from (None if not pointed yet), and
+        # the catalog's last image times: a resumed run plans around both
+        self.initial_att = [None if np.isnan(v).any() else v for v in fleet.att_vec]
+
+        self.slot = np.full((n_sats, steps), -1, dtype=np.int64)  # opportunity per slot
+        self.banned = np.zeros(len(self.opps), dtype=bool)
+        self.sat_steps = [[] for _ in range(n_sats)]
+        self.target_times = {}
+
+        # Steps where a satellite may downlink, and where the replay must
+        # stop to pick up a change of sunlight
+        if contacts is not None:
+            self.ground = [contacts.ground_steps(i) for i in range(n_sats)]
+        else:
+            self.ground = [geometry.ground_steps(i, min_elev_deg) for i in range(n_sats)]
+        self.events = []
+        for i in range(n_sats):
+            change = np.zeros(steps, dtype=bool)
+            change[1:] = geometry.sunlit[i, 1:] != geometry.sunlit[i, :-1]
+            self.events.append(np.flatnonzero(self.ground[i] | change))
+
+    def _time(self, step):
+        return self.start_epoch + step * self.timestep_sec
+
+    def _revisit_ok(self, j, t):
+        revisit = self.catalog.revisit_seconds[j]
+        if t - self.catalog.last_imaged[j] < revisit:
+            return False
+        times = self.target_times.get(j)
+        if not times:
+            return True
+        pos = bisect.bisect_left(times, t)
+        if pos > 0 and t - times[pos - 1] < revisit:
+            return False
+        return pos == len(times) or times[pos] - t >= revisit
+
+    def _slew_ok(self, i, a, b):
+        """Can satellite i slew from opportunity a's attitude to opportunity b's?"""
+        return self._slew_from(i, self.los[a], b)
+
+    def _slew_from(self, i, att_vec, b):
+        """Can satellite i slew from attitude `att_vec` to opportunity b's?"""
+        dot = float(att_vec @ self.los[b])
+        angle = math.degrees(math.acos(min(1.0, max(-1.0, dot))))
+        if angle > self.max_slew_deg:
+            return False
+        model = self.slew_models[i]
+        return model is None or bool(model.reachable(angle, self.timestep_sec))
+
+    def _opp(self, k):
+        """(sat, step, target) of opportunity k."""
+        o = self.opps[k]
+        return int(o["sat"]), int(o["step"]), int(o["target"])
+
+    def _add(self, k):
+        i, s, j = self._opp(k)
+        self.slot[i, s] = k
+        bisect.insort(self.sat_steps[i], s)
+        bisect.insort(self.target_times.setdefault(j, []), self._time(s))
+
+    def _remove(self, k):
+        i, s, j = self._opp(k)
+        self.slot[i, s] = -1
+        steps = self.sat_steps[i]
+        del steps[bisect.bisect_left(steps, s)]
+        times = self.target_times[j]
+        del times[bisect.bisect_left(times, self._time(s))]
+
+    def _decisions(self, window_steps):
+        """(step, sat, lo, now_hi, window_hi) for every satellite step with opportunities, in time order."""
+        rows = []
+        for i in range(len(self.sat_lo)):
+            lo, hi = int(self.sat_lo[i]), int(self.sat_hi[i])
+            steps = self.opps["step"][lo:hi]
+            first = np.flatnonzero(np.r_[True, steps[1:] != steps[:-1]]) if hi > lo else np.zeros(0, np.int64)
+            if not len(first):
+                continue
+            now_hi = np.r_[first[1:], hi - lo]
+            window_hi = np.searchsorted(steps, steps[first] + window_steps, side="left")
+            rows.append(np.column_stack((steps[first], np.full(len(first), i),
+                                         lo + first, lo + now_hi, lo + window_hi)))
+        if not rows:
+            return []
+        rows = np.concatenate(rows)
+        return rows[np.lexsort((rows[:, 1], rows[:, 0]))].tolist()
+
+    def _fill_chronological(self, window_steps):
+        """
+        First pass: receding-horizon choice per satellite step (see class
+        docstring) over `window_steps` steps, with each satellite's energy
+        and storage advanced in step so only images the scheduler would
+        accept are planned. Assumes an empty plan.
+        """
+        timelines = [_Timeline(self, i) for i in range(len(self.sat_lo))]
+        last_time = self.catalog.last_imaged.copy()
+        priority = self.opps["priority"]
+        target = self.opps["target"]
+        banned = self.banned if self.banned.any() else None
+        # Scratch for the first position of each target in a window
+        first = np.full(len(self.catalog.priority), np.iinfo(np.int64).max)
+        smallest_mb = float(self.catalog.image_size_mb.min(initial=np.inf))
+        cheapest_wh = float(self.catalog.image_energy_wh.min(initial=np.inf))
+        changed = set()
+
+        for step, i, lo, now_hi, window_hi in self._decisions(window_steps):
+            timeline = timelines[i]
+            timeline.catch_up(step)
+            # Full storage or a flat battery: no image can be accepted now
+            if not (timeline.data.can_store(smallest_mb) and timeline.energy.can_perform(cheapest_wh)):
+                continue
+            # Revisit intervals against images already committed
+            tgt = target[lo:window_hi]
+            opp_time = self.start_epoch + self.opps["step"][lo:window_hi] * float(self.timestep_sec)
+            open_ = opp_time - last_time[tgt] >= self.catalog.revisit_seconds[tgt]
+            if banned is not None:
+                open_ &= ~banned[lo:window_hi]
+            if not open_[:now_hi - lo].any():
+                continue
+            idx = np.flatnonzero(open_) + lo
+            # With nothing scored past the current step every target in view
+            # competes: the scheduler's greedy choice
+            if window_steps > 1:
+                # Score each target once, at its earliest opportunity, so no
+                # chain counts the same target twice
+                tgt = target[idx]
+                pos = np.arange(len(idx))
+                np.minimum.at(first, tgt, pos)
+                keep = first[tgt] == pos
+                first[tgt] = np.iinfo(np.int64).max
+                idx = idx[keep]
+                # Then the per_step best of each step (already in priority order)
+                steps = self.opps["step"][idx]
+                idx = idx[np.arange(len(idx)) - np.searchsorted(steps, steps, side="left") < self.per_step]
+
+            cos_slew = self.cos_slew[i]
+            los = self.los[idx]
+            steps = self.opps["step"][idx]
+            tgt = target[idx]
+            value = priority[idx].copy()
+            # Best chain value from each node, filled from the last step back
+            bounds = np.flatnonzero(np.r_[True, steps[1:] != steps[:-1], True])
+            for g in range(len(bounds) - 2, -1, -1):
+                a, b = bounds[g], bounds[g + 1]
+                if b == len(idx):
+                    continue
+                ok = (los[a:b] @ los[b:].T >= cos_slew) & (tgt[a:b, None] != tgt[None, b:])
+                value[a:b] += np.where(ok, value[None, b:], 0.0).max(axis=1)
+
+            now = bounds[1]
+            reach = np.ones(len(idx), dtype=bool)
+            if timeline.attitude is not None:
+                reach = los @ self.los[timeline.attitude] >= cos_slew
+            elif self.initial_att[i] is not None:
+                reach = los @ self.initial_att[i] >= cos_slew
+            take = np.where(reach[:now], value[:now], -np.inf)
+            skip = np.where(reach[now:], value[now:], 0.0).max(initial=0.0)
+            for c in np.argsort(-take, kind="stable").tolist():
+                if take[c] < skip or take[c] == -np.inf:
+                    break
+                k = int(idx[c])
+                if timeline.accepts(step, k):
+                    self._add(k)
+                    timeline.execute(step, k)
+                    last_time[target[k]] = opp_time[k - lo]
+                    changed.add(i)
+                    break
+        return changed
+
+    def _planned_keys(self):
+        """target * n_steps + step of every planned image, sorted."""
+        planned = self.slot[self.slot >= 0]
+        return np.sort(self.opps["target"][planned].astype(np.int64) * self.slot.shape[1] + self.opps["step"][planned])
+
+    def _open(self, i, keys):
+        """
+        Satellite i's opportunities, in build order, that an insertion pass
+        could still take: not banned, in an empty slot and outside the
+        revisit interval of every planned image (`keys`, from
+        _planned_keys()). Insertions only add images, so whatever is ruled
+        out here stays ruled out for the whole pass.
+        """
+        lo, hi = int(self.sat_lo[i]), int(self.sat_hi[i])
+        order = lo + np.flatnonzero(~self.banned[lo:hi] & (self.slot[i, self.opps["step"][lo:hi]] < 0))
+        step = self.opps["step"][order]
+        target = self.opps["target"][order].astype(np.int64)
+        t = self.start_epoch + step * self.timestep_sec
+        revisit = self.catalog.revisit_seconds[target]
+        ok = t - self.catalog.last_imaged[target] >= revisit
+
+        # Nearest planned image of the same target before and after, by step
+        n_steps = self.slot.shape[1]
+        if len(keys):
+            pos = np.searchsorted(keys, target * n_steps + step, side="left")
+            prev = keys[np.maximum(pos - 1, 0)]
+            same = (pos > 0) & (prev // n_steps == target)
+            ok &= ~same | (t - (self.start_epoch + prev % n_steps * self.timestep_sec) >= revisit)
+            after = keys[np.minimum(pos, len(keys) - 1)]
+            same = (pos < len(keys)) & (after // n_steps == target)
+            ok &= ~same | ((self.start_epoch + after % n_steps * self.timestep_sec) - t >= revisit)
+        return order[ok]
+
+    def _per_step(self, order):
+        """The per_step best of each satellite step among `order` (in build order)."""
+        group = self.opps["sat"][order].astype(np.int64) * self.slot.shape[1] + self.opps["step"][order]
+        return order[np.arange(len(order)) - np.searchsorted(group, group, side="left") < self.per_step]
+
+    def _slew_misses(self, i, order):
+        """
+        For satellite i's opportunities `order` (all in empty slots):
+        whether the slew from the previous planned image (or the initial
+        attitude) or the slew to the next one clearly exceeds the limit.
+        "Clearly" leaves a margin, so borderline cases go to the exact check.
+        """
+        planned = np.flatnonzero(self.slot[i] >= 0)
+        step = self.opps["step"][order]
+        pos = np.searchsorted(planned, step)
+        has_prev = pos > 0
+        has_next = pos < len(planned)
+
+        los = self.los[order]
+        limit = self.cos_slew[i] - _SLEW_MARGIN
+        initial = np.full(3, np.nan) if self.initial_att[i] is None else self.initial_att[i]
+        if len(planned):
+            prev = self.slot[i, planned[np.maximum(pos - 1, 0)]]
+            after = self.slot[i, planned[np.minimum(pos, len(planned) - 1)]]
+            att = np.where(has_prev[:, None], self.los[prev], initial)
+        else:
+            att = np.broadcast_to(initial, los.shape)
+        # NaN (no attitude yet) compares False: not a miss
+        miss_prev = np.einsum('ij,ij->i', los, att) < limit
+        if not len(planned):
+            return miss_prev
+        miss_next = has_next & (np.einsum('ij,ij->i', los, self.los[after]) < limit)
+        return miss_prev | miss_next
+
+    def _fill(self):
+        """Insertion pass over all opportunities; returns satellites that gained images."""
+        changed = set()
+        keys = self._planned_keys()
+        # Per satellite, so no array spans every opportunity: out of slew
+        # reach of the plan as it stands, then the per_step best of each
+        # satellite step among the rest, inserted in priority order
+        parts = []
+        for i in range(len(self.sat_lo)):
+            order = self._open(i, keys)
+            parts.append(self._per_step(order[~self._slew_misses(i, order)]))
+        order = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+        o = self.opps[order]
+        rank = np.lexsort((o["target"], o["sat"], o["step"], -o["priority"]))
+        order, o = order[rank], o[rank]
+        for k, i, s, j in zip(order.tolist(), o["sat"].tolist(), o["step"].tolist(), o["target"].tolist()):
+            if self.slot[i, s] >= 0 or not self._revisit_ok(j, self._time(s)):
+                continue
+            steps = self.sat_steps[i]
+            pos = bisect.bisect_left(steps, s)
+            if pos > 0 and not self._slew_ok(i, self.slot[i, steps[pos - 1]], k):
+                continue
+            if pos == 0 and self.initial_att[i] is not None and not self._slew_from(i, self.initial_att[i], k):
+                continue
+            if pos < len(steps) and not self._slew_ok(i, k, self.slot[i, steps[pos]]):
+                continue
+            self._add(k)
+            changed.add(i)
+        return changed
+
+    def _advance(self, i, energy, t0_step, t1_step, action):
+        """Advance energy over steps [t0_step, t1_step) under one action."""
+        n = t1_step - t0_step
+        if n <= 0:
+            return
+        if self.eclipses is not None:
+            energy.integrate(self.eclipses[i], t0_step * self.timestep_sec, t1_step * self.timestep_sec, action)
+        elif n == 1:
+            energy.step(bool(self.geometry.sunlit[i, t0_step]), action, self.timestep_sec / 60)
+        else:
+            energy.step_n(bool(self.geometry.sunlit[i, t0_step]), action, self.timestep_sec / 60, n)
+
+    def _replay(self, i):
+        """
+        Run satellite i's planned timeline through the scheduler's slew,
+        energy and storage checks.
+
+        Returns:
+            list: Opportunities that would be rejected.
+        """
+        timeline = _Timeline(self, i)
+        dropped = []
+        for step in list(self.sat_steps[i]):
+            timeline.catch_up(step)
+            k = int(self.slot[i, step])
+            if not timeline.execute(step, k):
+                dropped.append(k)
+        return dropped
+
+    def _repair(self, dirty):
+        """Drop rejected images until every timeline in `dirty` replays cleanly."""
+        n_dropped = 0
+        while dirty:
+            again = set()
+            for i in sorted(dirty):
+                for k in self._replay(i):
+                    self._remove(k)
+                    self.banned[k] = True
+                    n_dropped += 1
+                    again.add(i)
+            dirty = again
+        return n_dropped
+
+    def _clear(self):
+        """Remove every planned image."""
+        self.slot[:] = -1
+        self.sat_steps = [[] for _ in self.sat_steps]
+        self.target_times = {}
+
+    def _sat_value(self, i):
+        planned = self.slot[i][self.slot[i] >= 0]
+        return float(self.opps["priority"][planned].sum())
+
+    def plan(self, passes=DEFAULT_PASSES):
+        """
+        Build the plan.
+
+        Returns:
+            Plan
+        """
+        self._fill_chronological(self.window_steps)
+        if self.window_steps > 1:
+            # The greedy plan (the same pass one step ahead) wins if better
+            lookahead = self.slot[self.slot >= 0].tolist()
+            value = float(self.opps["priority"][lookahead].sum())
+            self._clear()
+            self._fill_chronological(1)
+            if float(self.opps["priority"][self.slot[self.slot >= 0]].sum()) < value:
+                self._clear()
+                for k in lookahead:
+                    self._add(k)
+        n_dropped = self._repair(set(range(len(self.sat_lo))))
+        for _ in range(passes - 1):
+            before = {i: (self._sat_value(i), self.slot[i][self.slot[i] >= 0].tolist())
+                      for i in range(len(self.sat_lo))}
+            changed = self._fill()
+            if not changed:
+                break
+            n_dropped += self._repair(set(changed))
+            # Insertions whose knock-on drops cost more than they gained are undone
+            reverted = set()
+            for i in sorted(changed):
+                value, kept = before[i]
+                if self._sat_value(i) >= value:
+                    continue
+                for k in self.slot[i][self.slot[i] >= 0].tolist():
+                    self._remove(k)
+                for k in kept:
+                    _, s, j = self._opp(k)
+                    if self._revisit_ok(j, self._time(s)):
+                        self.banned[k] = False
+                        self._add(k)
+                reverted.add(i)
+            n_dropped += self._repair(reverted)
+
+        target = np.where(self.slot >= 0, self.opps["target"][np.maximum(self.slot, 0)], -1)
+        planned = self.slot[self.slot >= 0]
+        return Plan(target, {
+            "opportunities": len(self.opps),
+            "planned": len(planned),
+            "dropped": n_dropped,
+            "priority_total": float(self.opps["priority"][planned].sum()),
+        })
+
+
+class _Timeline:
+    """
+    One satellite's energy, storage and attitude advanced step by step
+    under the scheduler's rules for a given plan.
+    """
+
+    def __init__(self, planner, i):
+        self.planner = planner
+        self.i = i
+        sub = planner.fleet.subset([i])
+        self.energy = EnergyModel.view(sub, 0)
+        self.data = DataModel.view(sub, 0)
+        self.attitude = None  # opportunity of the last image taken
+        self.pos = 0  # first step not yet integrated
+        self._events = planner.events[i].tolist()
+        self._next = 0
+
+    def catch_up(self, step):
+        """Run the unplanned event steps (ground passes, sunlight changes) before `step`."""
+        while self._next < len(self._events) and self._events[self._next] < step:
+            self.execute(self._events[self._next], -1)
+
+    def accepts(self, step, k):
+        """Would the scheduler take opportunity k at `step` in the current state?"""
+        p = self.planner
+        j = int(p.opps["target"][k])
+        return (
+            self.reachable(k)
+            and self.energy.can_perform(float(p.catalog.image_energy_wh[j]))
+            and self.data.stored_data + float(p.catalog.image_size_mb[j]) <= self.data.capacity
+            and p.energy_gate(self.energy, self.i, step, 'image')
+        )
+
+    def reachable(self, k):
+        """Can the satellite slew from its current attitude to opportunity k?"""
+        p = self.planner
+        if self.attitude is not None:
+            return p._slew_ok(self.i, self.attitude, k)
+        initial = p.initial_att[self.i]
+        return initial is None or p._slew_from(self.i, initial, k)
+
+    def execute(self, step, k):
+        """
+        Apply `step` with planned opportunity k (-1 for none), as the
+        scheduler would.
+
+        Returns:
+            bool: False if the planned image would be rejected.
+        """
+        p, i = self.planner, self.i
+        p._advance(i, self.energy, self.pos, step, 'idle')
+        while self._next < len(self._events) and self._events[self._next] <= step:
+            self._next += 1
+
+        ok = True
+        action = 'idle'
+        if k >= 0 and not self.reachable(k):
+            # Not eligible at all: the step falls through to a downlink
+            ok, k = False, -1
+        if k >= 0:
+            j = int(p.opps["target"][k])
+            if (
+                self.energy.can_perform(float(p.catalog.image_energy_wh[j]))
+                and self.data.can_store(float(p.catalog.image_size_mb[j]))
+                and p.energy_gate(self.energy, i, step, 'image')
+            ):
+                self.data.store_image(float(p.catalog.image_size_mb[j]))
+                action = 'image'
+                self.attitude = k
+            else:
+                ok = False
+        elif p.ground[i][step]:
+            downlink_wh = self.energy.downlink_power_w * p.timestep_sec / 3600
+            if self.energy.can_perform(downlink_wh) and p.energy_gate(self.energy, i, step, 'downlink'):
+                rate = p.contacts.rate(i, step) if p.contacts is not None else None
+                self.data.downlink(p.timestep_sec / 60, rate)
+                action = 'downlink'
+        p._advance(i, self.energy, step, step + 1, action)
+        self.pos = step + 1
+        return ok
+
+
+def plan_schedule(geometry, fleet, catalog, timestep_sec, start_epoch, min_elev_deg, max_slew_deg,
+                  slew_models=None, energy_gate=None, eclipses=None,
+                  per_step=DEFAULT_CANDIDATES_PER_STEP, passes=DEFAULT_PASSES,
+                  window_steps=DEFAULT_WINDOW_STEPS, contacts=None, weather=None):
+    """
+    Plan imaging for the whole horizon (see Planner).
+
+    Args:
+        geometry (Geometry): Precomputed geometry.
+        fleet (FleetState): Initial energy / storage state (not modified).
+        catalog (TargetCatalog): Targets; last_imaged is not modified.
+        timestep_sec (float): Step length.
+        start_epoch (float): POSIX seconds of step 0.
+        min_elev_deg (float): Elevation mask.
+        max_slew_deg (float): Largest slew between consecutive images.
+        slew_models (list): Optional SlewModel (or None) per satellite.
+        energy_gate (callable): energy_gate(energy_model, sat_idx, step, action)
+            -> bool, the scheduler's battery lookahead.
+        eclipses (list): EclipseIntervals per satellite when energy is
+            integrated exactly.
+        per_step (int): Targets scored per satellite step (among those the
+            revisit interval allows).
+        passes (int): Fill / repair rounds.
+        window_steps (int): Lookahead of the chronological pass.
+        contacts (ContactPlan): Optional antenna allocation; downlinks
+            happen only where an antenna is allocated, at its rate.
+        weather (CloudCover): Optional cloud screening of targets.
+
+    Returns:
+        Plan
+    """
+    planner = Planner(geometry, fleet, catalog, timestep_sec, start_epoch, min_elev_deg, max_slew_deg,
+                      slew_models, energy_gate, eclipses, per_step, window_steps, contacts, weather)
+    return planner.plan(passes)
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def line_of_sight(sat_pos_km, target_pos_km):
+    """
+    Unit line-of-sight vectors from one satellite to many targets.
+
+    Args:
+        sat_pos_km (ndarray): Satellite position [3].
+        target_pos_km (ndarray): Target positions [N x 3], same frame.
+
+    Returns:
+        ndarray: Unit vectors [N x 3].
+    """
+    vec = np.asarray(target_pos_km) - np.asarray(sat_pos_km)[None, :]
+    return vec / np.linalg.norm(vec, axis=1)[:, None]
+
+
+def slew_angles(los, att_vec):
+    """
+    Angles in degrees between each line of sight and the current attitude.
+
+    Args:
+        los (ndarray): Unit vectors [N x 3].
+        att_vec (ndarray): Current pointing unit vector [3], or None / NaN
+            when the satellite has not pointed anywhere yet (zero slew).
+
+    Returns:
+        ndarray: Slew angles [N].
+    """
+    if att_vec is None or np.isnan(att_vec[0]):
+        return np.zeros(len(los))
+    return np.degrees(np.arccos(np.clip(los @ att_vec, -1.0, 1.0)))
+
+
+def slew_angle_matrix(los, att_vecs):
+    """
+    Slew angles from every satellite attitude to every line of sight.
+
+    Args:
+        los (ndarray): Unit vectors [N x 3].
+        att_vecs (ndarray): Attitudes [S x 3]; NaN rows give zero slew.
+
+    Returns:
+        ndarray: Slew angles in degrees [S x N].
+    """
+    dots = np.clip(np.nan_to_num(att_vecs, nan=0.0) @ np.asarray(los).T, -1.0, 1.0)
+    angles = np.degrees(np.arccos(dots))
+    angles[np.isnan(att_vecs[:, 0])] = 0.0
+    return angles
+
+
+class SlewModel:
+    """
+    Rest-to-rest slew timing with a rate limit and an acceleration limit.
+
+    Short slews follow a triangular rate profile (accelerate, decelerate);
+    longer ones a trapezoidal profile capped at `max_rate_deg_s`. An
+    optional settle time is added to every non-zero slew.
+    """
+
+    def __init__(self, max_rate_deg_s, max_accel_deg_s2=None, settle_sec=0.0):
+        self.max_rate = float(max_rate_deg_s)
+        self.max_accel = float(max_accel_deg_s2) if max_accel_deg_s2 else None
+        self.settle_sec = float(settle_sec)
+
+    @classmethod
+    def from_config(cls, cfg):
+        """SlewModel from 'slew_rate_deg_s' / 'slew_accel_deg_s2' / 'slew_settle_sec', or None."""
+        if not cfg.get("slew_rate_deg_s"):
+            return None
+        return cls(cfg["slew_rate_deg_s"], cfg.get("slew_accel_deg_s2"), cfg.get("slew_settle_sec", 0.0))
+
+    def slew_time(self, angles_deg):
+        """Seconds needed for each slew [N]."""
+        angles = np.abs(np.asarray(angles_deg, dtype=float))
+        if self.max_accel is None:
+            t = angles / self.max_rate
+        else:
+            # Angle covered while reaching full rate and braking again
+            ramp_angle = self.max_rate ** 2 / self.max_accel
+            t = np.where(angles <= ramp_angle,
+                         2.0 * np.sqrt(angles / self.max_accel),
+                         angles / self.max_rate + self.max_rate / self.max_accel)
+        return np.where(angles > 0, t + self.settle_sec, 0.0)
+
+    def reachable(self, angles_deg, available_sec):
+        return self.slew_time(angles_deg) <= available_sec
+
+    def max_angle(self, available_sec):
+        """Largest slew in degrees that completes within `available_sec` (inverse of slew_time)."""
+        t = available_sec - self.settle_sec
+        if t <= 0:
+            return 0.0
+        if self.max_accel is None:
+            return self.max_rate * t
+        if t <= 2.0 * self.max_rate / self.max_accel:
+            return self.max_accel * (t / 2.0) ** 2
+        return self.max_rate * (t - self.max_rate / self.max_accel)
+
+
+def pointing_feasible(angles_deg, max_slew_deg, slew_model=None, available_sec=None):
+    """Mask of slews within the angle limit and, if modelled, the time budget."""
+    ok = np.asarray(angles_deg) <= max_slew_deg
+    if slew_model is not None and available_sec is not None:
+        ok &= slew_model.reachable(angles_deg, available_sec)
+    return ok
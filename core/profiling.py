@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Process-wide totals over every profiled run, for the /metrics endpoint
+_lock = threading.Lock()
+_totals = {}
+_runs = {"profiled_runs": 0}
+
+
+class Profiler:
+    """
+    Per-phase counters for one simulation run: calls, cumulative seconds
+    and items processed (satellite steps, rows, ...).
+
+    Code paths take `prof=None` and only touch the clock when a Profiler
+    is passed, so a run without profiling does no timing work at all.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.started = time.perf_counter()
+
+    def add(self, name, seconds, items=1):
+        p = self.phases.get(name)
+        if p is None:
+            p = self.phases[name] = {"calls": 0, "seconds": 0.0, "items": 0}
+        p["calls"] += 1
+        p["seconds"] += seconds
+        p["items"] += items
+
+    @contextmanager
+    def phase(self, name, items=1):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0, items)
+
+    def summary(self):
+        """{'wall_seconds': ..., 'phases': {name: counters}} for the run so far."""
+        return {"wall_seconds": time.perf_counter() - self.started,
+                "phases": {name: dict(p) for name, p in self.phases.items()}}
+
+    def report(self):
+        """Phase table, slowest first, as printable lines."""
+        wall = time.perf_counter() - self.started
+        lines = [f"⏱️ Profile ({wall:.3f}s wall)"]
+        for name, p in sorted(self.phases.items(), key=lambda kv: -kv[1]["seconds"]):
+            share = 100.0 * p["seconds"] / wall if wall > 0 else 0.0
+            lines.append(f"   {name:<18} {p['seconds']:9.4f}s {share:5.1f}%  "
+                         f"{p['calls']:>8} calls {p['items']:>10} items")
+        return lines
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def timed(prof, name, items=1):
+    """prof.phase(name, items), or a no-op context when prof is None."""
+    return prof.phase(name, items) if prof is not None else nullcontext()
+
+
+def record(profiler):
+    """Add a finished run's counters to the process-wide totals."""
+    with _lock:
+        _runs["profiled_runs"] += 1
+        for name, p in profiler.phases.items():
+            total = _totals.setdefault(name, {"calls": 0, "seconds": 0.0, "items": 0})
+            for key in total:
+                total[key] += p[key]
+
+
+def totals():
+    with _lock:
+        return dict(_runs), {name: dict(p) for name, p in _totals.items()}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def prometheus_text(extra=None):
+    """
+    Process-wide phase totals in the Prometheus text exposition format.
+
+    Args:
+        extra (dict): More {metric name: (type, help, value)} to append,
+            e.g. job queue gauges.
+    """
+    runs, phases = totals()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+    metric("constellation_profiled_runs_total", "counter", "Simulation runs with profiling enabled.",
+           [({}, runs["profiled_runs"])])
+    for key, help_text in (("seconds", "Cumulative time spent per simulation phase."),
+                           ("calls", "Times each simulation phase was entered."),
+                           ("items", "Items processed per simulation phase.")):
+        metric(f"constellation_phase_{key}_total", "counter", help_text,
+               [({"phase": name}, p[key]) for name, p in sorted(phases.items())])
+    for name, (kind, help_text, value) in (extra or {}).items():
+        metric(name, kind, help_text, [({}, value)])
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _totals.clear()
+        _runs["profiled_runs"] = 0
@@ -0,0 +1,259 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from sgp4.api import SatrecArray, jday
+from skyfield.constants import DAY_S, ERAD
+from skyfield.framelib import itrs
+from skyfield.geometry import intersect_line_and_sphere
+from skyfield.sgp4lib import TEME
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "propagation")
+DEFAULT_CACHE_MB = 512
+
+_FIELDS = ("gcrs_km", "gcrs_vel_km_s", "itrs_km", "sunlit")
+
+
+def propagation_key(tle, times, eph=None):
+    """Cache key for one satellite over one time grid (and ephemeris)."""
+    h = hashlib.sha256()
+    h.update(tle[0].strip().encode())
+    h.update(tle[1].strip().encode())
+    h.update(np.ascontiguousarray(times.whole).tobytes())
+    h.update(np.ascontiguousarray(times.tt_fraction).tobytes())
+    h.update(str(getattr(eph, "filename", "")).encode())
+    return h.hexdigest()
+
+
+class PropagationCache:
+    """
+    Persistent cache of propagated satellite states.
+
+    Each entry is a directory of .npy arrays (GCRS position / velocity,
+    ITRS position, sunlit flags) that are opened memory-mapped on reads.
+    Entries are evicted least-recently-used once the directory grows past
+    `max_bytes`. A per-process memo avoids touching the disk twice for the
+    same key within a run.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._memo = {}
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        path = self._entry_dir(key)
+        try:
+            arrays = tuple(np.load(os.path.join(path, f + ".npy"), mmap_mode="r") for f in _FIELDS)
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used for LRU eviction
+        self._memo[key] = arrays
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        self._memo[key] = arrays
+        path = self._entry_dir(key)
+        if os.path.isdir(path):
+            return
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            for name, arr in zip(_FIELDS, arrays):
+                np.save(os.path.join(tmp, name + ".npy"), np.asarray(arr))
+            os.rename(tmp, path)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def size_bytes(self):
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, path, size))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            self._memo.pop(os.path.basename(path), None)
+            total -= size
+
+    def clear(self):
+        self._memo.clear()
+        for _, path, _ in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def leap_seconds(times):
+    """TAI - UTC in whole seconds at each of `times`."""
+    jd, fraction = jday(*times.utc)
+    return np.round(((times.whole - jd) + (times.tai_fraction - fraction)) * DAY_S)
+
+
+def propagate_fleet(satrecs, times, eph):
+    """
+    Propagate a whole fleet over an array Time in one vectorized SGP4 call.
+
+    TEME -> GCRS -> ITRS rotations and the Sun's position are computed once
+    for the time grid and shared by every satellite.
+
+    Args:
+        satrecs (list): sgp4 Satrec objects (e.g. EarthSatellite.model).
+        times (Time): Array Time.
+        eph: Loaded JPL ephemeris (for sunlight), or None to skip sunlight.
+
+    Returns:
+        tuple: (gcrs_km [sats x steps x 3], gcrs_vel_km_s [sats x steps x 3],
+        itrs_km [sats x steps x 3], sunlit [sats x steps] or None).
+        From the first step where SGP4 fails for a satellite (e.g. a
+        decayed orbit) on, its positions and velocities are NaN and it is
+        not sunlit; see check_propagation().
+    """
+    n_sats, n_steps = len(satrecs), len(times)
+    if n_sats == 0 or n_steps == 0:
+        empty = np.zeros((n_sats, n_steps, 3))
+        return empty, empty.copy(), empty.copy(), np.zeros((n_sats, n_steps), dtype=bool)
+
+    # SGP4 takes UTC Julian dates; same epoch convention as EarthSatellite
+    fraction = times.tai_fraction - leap_seconds(times) / DAY_S
+    errors, r_teme, v_teme = SatrecArray(satrecs).sgp4(times.whole, fraction)
+    # A decayed orbit can later come back with no error code and
+    # meaningless elements, so everything from the first failure is dropped
+    failed = np.logical_or.accumulate(errors != 0, axis=1)
+    r_teme[failed] = np.nan
+    v_teme[failed] = np.nan
+
+    # rotation_at() gives GCRS -> TEME matrices [3 x 3 x steps]; apply their transposes
+    gcrs_to_teme = TEME.rotation_at(times)
+    gcrs = np.einsum('jin,snj->sni', gcrs_to_teme, r_teme)
+    vel = np.einsum('jin,snj->sni', gcrs_to_teme, v_teme)
+    itrs_km = np.einsum('ijn,snj->sni', itrs.rotation_at(times), gcrs)
+
+    if eph is None:
+        return gcrs, vel, itrs_km, None
+
+    # Same test as ICRF.is_sunlit: does the Sun line cross the Earth sphere?
+    sun_m = (eph['sun'] - eph['earth']).at(times).xyz.m
+    earth_m = -np.moveaxis(gcrs, 2, 0) * 1000.0  # [3 x sats x steps]
+    _, far = intersect_line_and_sphere(sun_m[:, None, :] + earth_m, earth_m, ERAD)
+    sunlit = (np.nan_to_num(far) <= 0) & ~failed
+    return gcrs, vel, itrs_km, sunlit
+
+
+def check_propagation(satellites, gcrs_km):
+    """
+    Report satellites SGP4 could not propagate over the whole grid (NaN
+    positions from propagate_fleet()); from their first failed step on
+    they are out of view of every target and station. Prints one warning
+    naming them.
+
+    Args:
+        satellites (list): Skyfield EarthSatellite objects.
+        gcrs_km (ndarray): Positions [sats x steps x 3].
+
+    Returns:
+        ndarray: [sats x steps] bool, True where propagation failed.
+
+    Raises:
+        ValueError: If every satellite fails.
+    """
+    failed = np.isnan(gcrs_km).any(axis=2)
+    bad = np.flatnonzero(failed.any(axis=1))
+    if len(bad) and len(bad) == len(satellites):
+        raise ValueError(f"SGP4 failed for every satellite ({len(bad)}); check the TLE epochs")
+    if len(bad):
+        names = ", ".join(f"{satellites[i].model.satnum} from step {int(np.argmax(failed[i]))}" for i in bad)
+        print(f"⚠️ SGP4 failed for {len(bad)} of {len(satellites)} satellites ({names}); "
+              f"they are treated as out of view from then on")
+    return failed
+
+
+def propagate_many(satellites, times, eph, cache=None, tles=None):
+    """
+    Fleet propagation with optional caching: satellites found in `cache`
+    are loaded, the rest are propagated together with propagate_fleet().
+
+    Args:
+        satellites (list): Skyfield EarthSatellite objects.
+        times (Time): Array Time.
+        eph: Loaded JPL ephemeris (for sunlight).
+        cache (PropagationCache): Optional cache to read from / write to.
+        tles (list): TLE line pairs matching `satellites`; required for caching.
+
+    Returns:
+        tuple: Same layout as propagate_fleet().
+    """
+    n_sats, n_steps = len(satellites), len(times)
+    gcrs = np.empty((n_sats, n_steps, 3))
+    vel = np.empty((n_sats, n_steps, 3))
+    itrs_km = np.empty((n_sats, n_steps, 3))
+    sunlit = np.empty((n_sats, n_steps), dtype=bool)
+
+    keys = [None] * n_sats
+    missing = []
+    for i in range(n_sats):
+        if cache is not None and tles is not None:
+            keys[i] = propagation_key(tles[i], times, eph)
+            hit = cache.get(keys[i])
+            if hit is not None:
+                gcrs[i], vel[i], itrs_km[i], sunlit[i] = hit
+                continue
+        missing.append(i)
+
+    if missing:
+        fleet = propagate_fleet([satellites[i].model for i in missing], times, eph)
+        for k, i in enumerate(missing):
+            gcrs[i], vel[i], itrs_km[i], sunlit[i] = (a[k] for a in fleet)
+            if keys[i] is not None:
+                cache.put(keys[i], tuple(a[k] for a in fleet))
+    return gcrs, vel, itrs_km, sunlit
+
+
+def propagate(sat, times, eph, cache=None, tle=None):
+    """
+    Propagate one satellite over an array Time.
+
+    Returns:
+        tuple: (gcrs_km [steps x 3], gcrs_vel_km_s [steps x 3],
+        itrs_km [steps x 3], sunlit [steps])
+    """
+    arrays = propagate_many([sat], times, eph, cache, [tle] if tle is not None else None)
+    return tuple(a[0] for a in arrays)
+
+
+def open_cache(setting, max_mb=None):
+    """
+    Build a PropagationCache from a scenario setting: a directory path, True
+    for the default directory, or a falsy value for no cache.
+    """
+    if not setting:
+        return None
+    cache_dir = DEFAULT_CACHE_DIR if setting is True else setting
+    return PropagationCache(cache_dir, int((max_mb or DEFAULT_CACHE_MB) * 1024 * 1024))
@@ -0,0 +1,93 @@
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_EPHEMERIS = "de421.bsp"
+
+# EarthSatellite objects kept per process, least recently used dropped first
+MAX_SATELLITES = 4096
+
+_lock = threading.RLock()
+_timescale = None
+_ephemerides = {}
+_satellites = OrderedDict()
+stats = {"satellite_hits": 0, "satellite_misses": 0}
+
+
+def timescale():
+    """The process-wide Skyfield Timescale, loaded on first use."""
+    global _timescale
+    with _lock:
+        if _timescale is None:
+            from skyfield.api import load
+            _timescale = load.timescale()
+        return _timescale
+
+
+def ephemeris(path=DEFAULT_EPHEMERIS):
+    """
+    A JPL ephemeris, opened once per process and path. Skyfield reads BSP
+    segments through memory maps, so a kept kernel costs no re-reading.
+
+    Args:
+        path (str): File name resolved by Skyfield's loader (downloaded if
+            missing), or an absolute path opened as is.
+    """
+    with _lock:
+        eph = _ephemerides.get(path)
+        if eph is None:
+            from skyfield.api import load, load_file
+            eph = load_file(path) if os.path.isabs(path) else load(path)
+            _ephemerides[path] = eph
+        return eph
+
+
+def satellite(tle, name, ts=None):
+    """
+    EarthSatellite for a TLE, memoized by (TLE lines, name) when built on
+    the process-wide timescale.
+
+    Args:
+        tle (list): The two TLE lines.
+        name (str): Satellite name.
+        ts: Timescale; one other than timescale() bypasses the memo.
+    """
+    from skyfield.api import EarthSatellite
+    shared = timescale()
+    if ts is not None and ts is not shared:
+        return EarthSatellite(tle[0], tle[1], name, ts)
+    key = (tle[0], tle[1], name)
+    with _lock:
+        sat = _satellites.get(key)
+        if sat is not None:
+            _satellites.move_to_end(key)
+            stats["satellite_hits"] += 1
+            return sat
+        stats["satellite_misses"] += 1
+        sat = EarthSatellite(tle[0], tle[1], name, shared)
+        _satellites[key] = sat
+        while len(_satellites) > MAX_SATELLITES:
+            _satellites.popitem(last=False)
+        return sat
+
+
+def warm(ephemeris_path=DEFAULT_EPHEMERIS, satellites=()):
+    """
+    Load the timescale and ephemeris now (e.g. at service startup) instead
+    of on the first request, optionally building satellites from
+    scenario configs as well.
+    """
+    timescale()
+    ephemeris(ephemeris_path)
+    for cfg in satellites:
+        satellite(cfg["tle"], cfg["name"])
+
+
+def clear():
+    """Forget every loaded resource."""
+    global _timescale
+    with _lock:
+        _timescale = None
+        _ephemerides.clear()
+        _satellites.clear()
+        stats.update(satellite_hits=0, satellite_misses=0)
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+import numpy as np
+from core.output import FIELDNAMES, NpzSink, load_npz_columns
+from core.propagation import PropagationCache
+from core.resources import DEFAULT_EPHEMERIS
+from core.targets import TargetCatalog
+from core.weather import raster_fingerprint
+from utils.config_loader import parse_start_time
+
+# Bump when a change to the scheduler alters the rows it produces, so old
+# entries stop matching.
+RESULT_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "results")
+DEFAULT_CACHE_MB = 1024
+# Recently used results also kept in memory, up to this size
+DEFAULT_MEMORY_MB = 64
+
+# Scenario settings that do not change the simulated rows
+IGNORED_KEYS = {
+    "name", "workers", "output_format", "propagation_cache", "propagation_cache_mb",
+    "result_cache", "result_cache_mb", "profile",
+}
+
+# One cache object per directory and process, so counters accumulate
+_open = {}
+_open_lock = threading.Lock()
+
+
+def _canonical(value):
+    """JSON-ready form where equal settings always encode identically."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat() if value.tzinfo else value.isoformat()
+    return str(value)
+
+
+def result_key(scenario, targets):
+    """
+    Content hash of a simulation request: the scenario without
+    output-only settings, plus the target columns the scheduler actually
+    reads (after defaults are filled in). A cloud raster is identified by
+    its size and modification time, so an edited raster is not matched.
+    """
+    settings = {k: v for k, v in scenario.items() if k not in IGNORED_KEYS}
+    settings["start_time"] = parse_start_time(scenario["start_time"])
+    catalog = targets if isinstance(targets, TargetCatalog) else TargetCatalog.from_dicts(targets)
+    columns = {name: getattr(catalog, name).tolist() for name in (
+        "name", "lat", "lon", "alt_m", "priority", "revisit_seconds", "image_size_mb", "image_energy_wh")}
+    payload = {
+        "version": RESULT_CACHE_VERSION,
+        "ephemeris": DEFAULT_EPHEMERIS,
+        "scenario": _canonical(settings),
+        "targets": _canonical(columns),
+    }
+    weather = raster_fingerprint(scenario)
+    if weather is not None:
+        payload["weather"] = weather
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class _PendingEntry:
+    """A result being written: rows stream into `sink`, then commit()."""
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.tmp = tempfile.mkdtemp(dir=cache.cache_dir, prefix=".tmp-")
+        self.sink = NpzSink(os.path.join(self.tmp, "rows.npz"))
+
+    def commit(self, summary):
+        self.sink.close()
+        with open(os.path.join(self.tmp, "summary.json"), "w") as f:
+            json.dump(summary, f)
+        try:
+            os.rename(self.tmp, self.cache._entry_dir(self.key))
+        except OSError:
+            # Another run stored the same result first
+            shutil.rmtree(self.tmp, ignore_errors=True)
+        self.cache.evict()
+
+    def abort(self):
+        self.sink.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+class ResultCache(PropagationCache):
+    """
+    Content-addressed store of finished simulations: each entry holds the
+    log rows as a columnar .npz plus the run summary, keyed by
+    result_key(). Entries share PropagationCache's on-disk LRU eviction;
+    recently used results are also kept in memory up to `memory_bytes`.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024,
+                 memory_bytes=DEFAULT_MEMORY_MB * 1024 * 1024):
+        super().__init__(cache_dir, max_bytes)
+        self.memory_bytes = memory_bytes
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """(columns, summary) for `key`, or None."""
+        with self._lock:
+            hit = self._memo.pop(key, None)
+            if hit is not None:
+                self._memo[key] = hit  # most recently used last
+                self.hits += 1
+                return hit
+        path = self._entry_dir(key)
+        try:
+            columns = load_npz_columns(os.path.join(path, "rows.npz"))
+            with open(os.path.join(path, "summary.json")) as f:
+                summary = json.load(f)
+            os.utime(path)  # mark as recently used for LRU eviction
+        except (FileNotFoundError, ValueError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self._remember(key, (columns, summary))
+        return columns, summary
+
+    def _remember(self, key, value):
+        self._memo[key] = value
+        used = sum(sum(a.nbytes for a in cols.values()) for cols, _ in self._memo.values())
+        while used > self.memory_bytes and self._memo:
+            old, (cols, _) = next(iter(self._memo.items()))
+            del self._memo[old]
+            used -= sum(a.nbytes for a in cols.values())
+
+    def writer(self, key):
+        """Start storing the result for `key` (see _PendingEntry)."""
+        return _PendingEntry(self, key)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._entries()), "size_bytes": self.size_bytes()}
+
+
+def replay_rows(columns, sinks):
+    """Write cached log columns back out as rows, in their original order."""
+    values = {name: columns[name].tolist() for name in FIELDNAMES if name in columns}
+    n = len(next(iter(values.values()))) if values else 0
+    for k in range(n):
+        sinks.write({name: values[name][k] for name in FIELDNAMES})
+
+
+def open_result_cache(setting, max_mb=None):
+    """
+    The ResultCache for a scenario setting: a directory path, True for the
+    default directory, or a falsy value for no cache. The same object is
+    returned for a directory for the life of the process.
+    """
+    if not setting:
+        return None
+    cache_dir = DEFAULT_CACHE_DIR if setting is True else setting
+    with _open_lock:
+        cache = _open.get(cache_dir)
+        if cache is None:
+            cache = _open[cache_dir] = ResultCache(cache_dir, int((max_mb or DEFAULT_CACHE_MB) * 1024 * 1024))
+        return cache
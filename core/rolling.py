@@ -0,0 +1,102 @@
+import math
+import os
+from datetime import timedelta
+from core import resources
+from core.checkpoint import load_checkpoint, duration_for_steps
+from core.lookahead import DEFAULT_HORIZON_MINUTES
+from core.scheduler import run_simulation, build_geometry
+from core.targets import TargetCatalog
+from utils.config_loader import parse_start_time
+
+
+def window_geometry(scenario, catalog, lo, hi, previous=None, previous_lo=0, ts=None, eph=None):
+    """
+    Geometry for grid steps [lo, hi) of a scenario. Steps already covered
+    by `previous` (geometry of the steps from `previous_lo`) are sliced out
+    of it; only the steps after it are propagated.
+
+    Returns:
+        tuple: (Geometry, steps propagated)
+    """
+    timestep_sec = scenario['timestep_sec']
+    start_time = parse_start_time(scenario['start_time'])
+
+    def build(a, b):
+        part = dict(scenario, start_time=start_time + timedelta(seconds=a * timestep_sec),
+                    duration_minutes=duration_for_steps(b - a, timestep_sec))
+        return build_geometry(part, catalog, ts, eph)
+
+    if previous is None:
+        return build(lo, hi), hi - lo
+    covered = previous_lo + previous.steps
+    if not previous_lo <= lo < covered:
+        return build(lo, hi), hi - lo
+    kept = previous.window(lo - previous_lo, min(hi, covered) - previous_lo)
+    if covered >= hi:
+        return kept, 0
+    return kept.extend(build(covered, hi)), hi - covered
+
+
+def run_rolling_horizon(scenario, targets, output_path, window_minutes, overlap_minutes=None,
+                        checkpoint_path=None, resume=None, progress=None):
+    """
+    Run a scenario as consecutive windows of `window_minutes`, each one
+    resumed from the checkpoint the previous one saved at its end.
+
+    Each window is planned (lookahead oracle, contact plan, 'planner'
+    mode) over its own steps plus `overlap_minutes` past its end, so
+    decisions near its end still see what follows. Consecutive windows
+    share that overlap: its geometry is sliced out of the previous
+    window's and only the new segment is propagated.
+
+    Args:
+        scenario (dict): Scenario settings and satellites.
+        targets: List of target dicts or a TargetCatalog.
+        output_path (str): Log path, continued by every window.
+        window_minutes (float): Simulated time per window.
+        overlap_minutes (float): Lookahead past each window (default the
+            oracle's 'lookahead_horizon_minutes').
+        checkpoint_path (str): Where each window saves its final state
+            (default '<log stem>_checkpoint.npz'); the last one can extend
+            the run later.
+        resume: Checkpoint or path to continue from instead of the start.
+        progress (callable): progress(step, steps) over the whole horizon.
+
+    Returns:
+        dict: Summary counters of the whole run (see run_simulation()).
+    """
+    timestep_sec = scenario['timestep_sec']
+    total = int(scenario['duration_minutes'] * 60 / timestep_sec)
+    window = max(1, int(round(window_minutes * 60 / timestep_sec)))
+    if overlap_minutes is None:
+        overlap_minutes = scenario.get('lookahead_horizon_minutes', DEFAULT_HORIZON_MINUTES)
+    overlap = max(0, int(math.ceil(overlap_minutes * 60 / timestep_sec)))
+    checkpoint_path = checkpoint_path or os.path.splitext(output_path)[0] + "_checkpoint.npz"
+    catalog = targets if isinstance(targets, TargetCatalog) else TargetCatalog.from_dicts(targets)
+    ts = resources.timescale()
+    eph = resources.ephemeris()
+
+    resume = load_checkpoint(resume if resume is not None else scenario.get('resume_from'))
+    first = 0
+    if resume is not None:
+        first = resume.start_step(parse_start_time(scenario['start_time']), timestep_sec, total)
+    base = {k: v for k, v in scenario.items() if k not in ('resume_from', 'checkpoint_every_minutes')}
+    base['checkpoint_path'] = checkpoint_path
+
+    summary = dict(resume.summary) if resume is not None else {}
+    geometry, geometry_lo = None, 0
+    for lo in range(first, total, window):
+        hi = min(lo + window, total)
+        geometry, propagated = window_geometry(base, catalog, lo, min(hi + overlap, total),
+                                               geometry, geometry_lo, ts, eph)
+        geometry_lo = lo
+        print(f"🔁 Window {lo}-{hi} of {total} steps ({propagated} new steps propagated)")
+        part = dict(base, duration_minutes=duration_for_steps(hi, timestep_sec))
+        window_progress = None
+        if progress is not None:
+            def window_progress(step, steps, lo=lo):
+                progress(lo + step, total)
+        summary = run_simulation(part, catalog, output_path, geometry=geometry, progress=window_progress,
+                                 resume=resume)
+        resume = checkpoint_path
+    return summary
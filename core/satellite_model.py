@@ -1,27 +1,21 @@
 from skyfield.api import EarthSatellite, wgs84, load
-from core.energy_model import EnergyModel
-from core.data_model import DataModel
+from core.fleet import FleetState
 
 class SatelliteModel:
-    def __init__(self, sat_config, ts):
+    def __init__(self, sat_config, ts, fleet=None, index=0):
         self.id = sat_config['name']
         self.tle = sat_config['tle']
         self.sat = EarthSatellite(self.tle[0], self.tle[1], self.id, ts)
 
-        # Initialize energy model with realistic config
-        self.energy = EnergyModel(
-            capacity_wh=sat_config["battery_wh"],
-            initial_wh=sat_config["initial_battery_wh"],
-            charge_rate_w=sat_config["charge_rate_w"],
-            imaging_power_w=sat_config["imaging_power_w"],
-            downlink_power_w=sat_config["downlink_power_w"],
-            idle_power_w=sat_config["idle_power_w"]
-        )
-
-        # Initialize data model
-        self.data = DataModel(
-            capacity_mb=sat_config["storage_capacity_mb"]
-        )
+        # Energy and data models are views onto a FleetState row; a lone
+        # satellite gets a fleet of one.
+        if fleet is None:
+            fleet = FleetState.from_configs([sat_config])
+            index = 0
+        self.fleet = fleet
+        self.index = index
+        self.energy = fleet.energy_model(index)
+        self.data = fleet.data_model(index)
 
         self.downlink_mbps = sat_config["downlink_bandwidth_mbps"]
 
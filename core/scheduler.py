@@ -1,13 +1,31 @@
 import math
-from skyfield.api import load, EarthSatellite, wgs84
+from skyfield.api import wgs84
 from datetime import datetime, timedelta
 import numpy as np
-import csv
 import os
-import json
-from core.energy_model import EnergyModel
-from core.data_model import DataModel
-from typing import Dict, Optional
+from contextlib import nullcontext
+from time import perf_counter
+from core import resources
+from core.fleet import FleetState, ACTION_CODES, ACTION_NAMES, ACTION_NONE
+from core.targets import TargetCatalog, NEVER, epoch_seconds
+from core.pointing import line_of_sight, slew_angles, pointing_feasible, SlewModel
+from core.visibility import build_time_grid, precompute_geometry
+from core.access import compute_access, AccessGeometry
+from core.eclipse import compute_eclipses
+from core.contacts import build_contact_plan
+from core.lookahead import EnergyOracle, DEFAULT_HORIZON_MINUTES, DEFAULT_RESERVE_WH
+from core.parallel import resolve_workers
+from core.planner import plan_schedule, DEFAULT_CANDIDATES_PER_STEP, DEFAULT_PASSES, DEFAULT_WINDOW_STEPS
+from core.output import OutputSinks
+from core.trace import TraceLog, trace_level, trace_path, LEVELS, IMAGE, DOWNLINK, CANDIDATE, \
+    OK, ENERGY, STORAGE, LOOKAHEAD, SLEW, REVISIT, PLAN, CLOUD
+from core.weather import open_weather
+from core.checkpoint import Checkpoint, load_checkpoint, resumed_scenario
+from core.profiling import Profiler, timed, record as record_profile
+from core.propagation import open_cache
+from core.result_cache import open_result_cache, result_key, replay_rows
+from core.spatial_index import precompute_indexed_geometry, AUTO_INDEX_MIN_TARGETS
+from utils.config_loader import parse_start_time
 
 def is_visible(sat, location, time, min_elev_deg):
     difference = sat - location
@@ -15,8 +33,9 @@ def is_visible(sat, location, time, min_elev_deg):
     alt, _, _ = topocentric.altaz()
     return alt.degrees > min_elev_deg
 
-def vector_to_target(sat, lat, lon, t):
-    sat_pos = np.array(sat.at(t).position.km)
+def vector_to_target(sat, lat, lon, t, sat_pos=None):
+    if sat_pos is None:
+        sat_pos = np.array(sat.at(t).position.km)
     tgt_pos = np.array(wgs84.latlon(lat, lon).at(t).position.km)
     vec = tgt_pos - sat_pos
     return vec / np.linalg.norm(vec)
@@ -53,159 +72,604 @@ def lookahead_energy_ok(energy_model, current_energy, sunlit, action, action_min
 
     return temp_energy >= min_reserve_wh
 
-def run_simulation(scenario, targets, output_path):
-    ts = load.timescale()
-    eph = load('de421.bsp')
-
-    start_time = scenario['start_time']
-    if isinstance(start_time, str):
-        # Accept both with and without timezone
-        try:
-            start_time = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-        except Exception:
-            # fallback: try parsing without timezone
-            start_time = datetime.fromisoformat(start_time)    
+def _lookahead_ok(oracle, energy, i, step, sunlit, action, timestep_sec, reserve_wh):
+    """
+    Battery lookahead gate: the EnergyOracle, or, when oracle is None, the
+    fixed-window heuristic (which only ever gated imaging).
+    """
+    if oracle is None:
+        if action != 'image':
+            return True
+        return lookahead_energy_ok(energy, energy.energy, sunlit, action, timestep_sec / 60, reserve_wh)
+    return oracle.energy_ok(i, step, energy.energy, energy.action_power_w(action) * timestep_sec / 3600, reserve_wh)
+
+def _step_satellite(s, i, step, now_sec, geometry, fleet, catalog,
+                    min_elev, max_slew_deg, timestep_sec, oracle=None, reserve_wh=DEFAULT_RESERVE_WH,
+                    planned=None, contacts=None, prof=None, trace=None, weather=None):
+    """
+    Choose one satellite's action for one step and apply its storage and
+    attitude effects. The energy step itself is applied for the whole fleet
+    by the caller. Imaging and downlinks are gated by `oracle`
+    (EnergyOracle), or by lookahead_energy_ok() when it is None.
+
+    With `planned` (a target ID, or -1 for none) only that target may be
+    imaged, so a precomputed plan is executed under the same checks.
+    With `contacts` (ContactPlan) a downlink needs an allocated antenna and
+    drains at the allocated rate. With `prof` (Profiler) the visibility,
+    pointing, selection and resource-check stages are timed. With `trace`
+    (TraceLog, None unless this satellite step is sampled) the decision and
+    every rejection reason are recorded at the trace's level. With
+    `weather` (CloudCover) cloudy targets are skipped or down-ranked.
+
+    Returns:
+        tuple: (best target ID or None, over_ground, action, energy_action)
+    """
+    energy = s["energy"]
+    data = s["data"]
+    sunlit = geometry.sunlit[i, step]
+    if prof is not None:
+        t0 = perf_counter()
+
+    # Visible targets past their revisit interval, then allowed slew. Lines
+    # of sight use the Earth-fixed target columns and are rotated to GCRS,
+    # the frame the attitude vector is kept in.
+    visible = geometry.visible_targets(i, step, min_elev)
+    revisit_ok = catalog.revisit_ok(visible, now_sec)
+    candidates = visible[revisit_ok]
+    if prof is not None:
+        t1 = perf_counter()
+        prof.add("visibility", t1 - t0, len(visible))
+    los = line_of_sight(geometry.sat_itrs_km[i, step], catalog.ecef_km[candidates]) @ geometry.itrs_rotation(step)
+    angles = slew_angles(los, fleet.att_vec[i])
+    feasible = pointing_feasible(angles, max_slew_deg, s["slew_model"], timestep_sec)
+    eligible = candidates[feasible]
+    weight = None
+    if weather is not None:
+        clear, weight = weather.screen(now_sec, eligible)
+        if trace is not None and trace.level >= LEVELS["candidates"]:
+            trace.record_many(now_sec, i, eligible[~clear], CANDIDATE, CLOUD)
+        eligible = eligible[clear]
+        if weight is not None:
+            weight = weight[clear]
+    if trace is not None and trace.level >= LEVELS["candidates"]:
+        trace.record_many(now_sec, i, visible[~revisit_ok], CANDIDATE, REVISIT)
+        trace.record_many(now_sec, i, candidates[~feasible], CANDIDATE, SLEW)
+        if planned is not None:
+            trace.record_many(now_sec, i, eligible[eligible != planned], CANDIDATE, PLAN)
+    if planned is not None:
+        if weight is not None:
+            weight = weight[eligible == planned]
+        eligible = eligible[eligible == planned]
+    if prof is not None:
+        t2 = perf_counter()
+        prof.add("pointing", t2 - t1, len(candidates))
+
+    best_target = catalog.select_best(eligible, weight)
+
+    over_ground = geometry.over_ground(i, step, min_elev)
+    downlink_rate = contacts.rate(i, step) if contacts is not None else None
+    if prof is not None:
+        t3 = perf_counter()
+        prof.add("target_selection", t3 - t2, len(eligible))
+
+    action = "idle"
+    energy_action = "idle"
+
+    if best_target is not None:
+        tgt_name = catalog.name[best_target]
+        mb = float(catalog.image_size_mb[best_target])
+        wh = float(catalog.image_energy_wh[best_target])
+
+        # Storage is only taken once the image is accepted
+        if (
+            energy.can_perform(wh)
+            and data.can_store(mb)
+            and _lookahead_ok(oracle, energy, i, step, sunlit, 'image', timestep_sec, reserve_wh)
+        ):
+            data.store_image(mb)
+            energy_action = "image"
+            fleet.att_vec[i] = los[np.searchsorted(candidates, best_target)]
+            catalog.mark_imaged(best_target, now_sec)
+            action = f"image:{tgt_name}"
+            if trace is not None and trace.level >= LEVELS["decisions"]:
+                trace.record(now_sec, i, best_target, IMAGE, OK, len(eligible))
+        elif trace is not None:
+            # Detailed rejection reason
+            if not energy.can_perform(wh):
+                reason = ENERGY
+            elif not data.can_store(mb):
+                reason = STORAGE
+            else:
+                reason = LOOKAHEAD
+            trace.record(now_sec, i, best_target, IMAGE, reason, len(eligible))
+
+    elif over_ground and (downlink_rate is None or downlink_rate > 0):
+        downlink_wh = energy.downlink_power_w * timestep_sec / 3600  # W * sec / 3600 = Wh
+        if (
+            energy.can_perform(downlink_wh)
+            and _lookahead_ok(oracle, energy, i, step, sunlit, 'downlink', timestep_sec, reserve_wh)
+        ):
+            downlinked = data.downlink(timestep_sec / 60, downlink_rate)
+            energy_action = "downlink"
+            action = 'downlink' if downlinked > 0 else 'idle'
+            if trace is not None and trace.level >= LEVELS["decisions"]:
+                trace.record(now_sec, i, -1, DOWNLINK, OK)
+        elif trace is not None:
+            trace.record(now_sec, i, -1, DOWNLINK, ENERGY if not energy.can_perform(downlink_wh) else LOOKAHEAD)
+
+    if prof is not None:
+        prof.add("resource_checks", perf_counter() - t3)
+    return best_target, over_ground, action, energy_action
+
+def _integrate_idle(s, i, upto, geometry, eclipses, timestep_sec):
+    """
+    Adaptive stepping: integrate a satellite's idle gap since its last
+    processed step up to `upto` in closed form. Without eclipse intervals,
+    eclipse transitions are events, so sunlight is constant over the gap.
+    """
+    gap = upto - s["next_step"]
+    if gap > 0 and eclipses is not None:
+        s["energy"].integrate(eclipses[i], s["next_step"] * timestep_sec, upto * timestep_sec, 'idle')
+    elif gap > 0:
+        s["energy"].step_n(geometry.sunlit[i, s["next_step"]], 'idle', timestep_sec / 60, gap)
+    s["next_step"] = max(s["next_step"], upto)
+
+def _scenario_satellites(scenario, ts):
+    return [resources.satellite(cfg['tle'], cfg['name'], ts) for cfg in scenario['satellites']]
+
+
+def build_geometry(scenario, targets, ts=None, eph=None, min_elev=None):
+    """
+    Precompute a scenario's orbital geometry: propagation, sunlight and
+    target / ground-station visibility over the whole time grid. Depends
+    only on orbits, sites and the time grid, so it can be shared by runs
+    that vary resources, priorities or scheduling settings.
+
+    Args:
+        scenario (dict): Scenario settings and satellites.
+        targets: List of target dicts or a TargetCatalog.
+        ts, eph: Skyfield timescale and ephemeris (loaded if None).
+        min_elev (float): Elevation mask; defaults to the scenario's. Grid
+            geometry keeps raw elevations and serves any mask, indexed
+            geometry masks at or above this one; access geometry serves
+            only this mask and raises ValueError for any other.
+
+    Returns:
+        Geometry
+    """
+    ts = ts or resources.timescale()
+    eph = eph or resources.ephemeris()
+    if min_elev is None:
+        min_elev = scenario.get('min_elevation_deg', 10)
+    timestep_sec = scenario['timestep_sec']
+    steps = int(scenario['duration_minutes'] * 60 / timestep_sec)
+    ground_stations = scenario.get('ground_stations', [])
+    adaptive = scenario.get('stepping', 'fixed') == 'adaptive'
+
+    times = build_time_grid(ts, parse_start_time(scenario['start_time']), timestep_sec, steps)
+    sat_objs = _scenario_satellites(scenario, ts)
+    tles = [sat_cfg['tle'] for sat_cfg in scenario['satellites']]
+    cache = open_cache(scenario.get('propagation_cache'), scenario.get('propagation_cache_mb'))
+    # Geometry is independent per satellite and can use a process pool;
+    # the step loop stays a single deterministic coordinator.
+    workers = resolve_workers(scenario.get('workers'))
+    use_index = scenario.get('spatial_index', 'auto')
+    if use_index == 'auto':
+        use_index = len(targets) >= AUTO_INDEX_MIN_TARGETS
+    if use_index:
+        # Exact elevation checks only for targets inside each footprint
+        return precompute_indexed_geometry(
+            precompute_geometry(sat_objs, [], ground_stations, times, eph,
+                                cache=cache, tles=tles, workers=workers),
+            targets, min_elev, workers=workers)
+    if adaptive or scenario.get('visibility', 'grid') == 'access':
+        # Visibility from rise/set root-finding instead of the sampled grid
+        t1 = ts.tt_jd(times.tt[0] + steps * timestep_sec / 86400.0)
+        access = compute_access(sat_objs, targets, ground_stations, times[0], t1, min_elev)
+        return AccessGeometry(
+            precompute_geometry(sat_objs, targets, ground_stations, times, eph, elevations=False,
+                                cache=cache, tles=tles, workers=workers),
+            access, timestep_sec)
+    return precompute_geometry(sat_objs, targets, ground_stations, times, eph,
+                               cache=cache, tles=tles, workers=workers)
+
+
+def build_eclipses(scenario, geometry, ts=None, eph=None):
+    """EclipseIntervals per satellite over the scenario horizon (see compute_eclipses)."""
+    ts = ts or resources.timescale()
+    eph = eph or resources.ephemeris()
+    if not geometry.steps:
+        return None
+    t0 = geometry.times[0]
+    return compute_eclipses(_scenario_satellites(scenario, ts), t0,
+                            ts.tt_jd(t0.tt + geometry.steps * scenario['timestep_sec'] / 86400.0), eph)
+
+
+def run_simulation(scenario, targets, output_path, geometry=None, eclipses=None, extra_sinks=None,
+                   progress=None, resume=None):
+    """
+    Run the scheduler over a scenario.
+
+    With 'result_cache' set in the scenario (a directory, or true for the
+    default one), a request whose scenario and targets hash to a stored
+    result is answered from the cache (see core/result_cache.py) instead
+    of being simulated again; the same files and rows are written.
+
+    With 'profile: true' each phase is timed (see core/profiling.py); the
+    table is printed, saved as '<log stem>_profile.json' and added to the
+    process-wide totals served at /metrics.
+
+    With 'checkpoint_path' set, the run state is saved there (see
+    core/checkpoint.py) every 'checkpoint_every_minutes' of simulated time
+    and at the end. A run resumed from a checkpoint simulates only the
+    steps after it and continues the checkpointed log files; the scenario
+    may extend the horizon or add satellites and targets. Checkpointed and
+    resumed runs bypass the result cache.
+
+    With 'trace' set to a level of core/trace.py (rejections, decisions or
+    candidates), scheduler decisions and rejection reasons are written to
+    '<log stem>_trace.npz' for a 'trace_sample' fraction of satellite
+    steps (default all). Traced runs bypass the result cache.
+
+    Args:
+        scenario (dict): Scenario settings and satellites.
+        targets: List of target dicts or a TargetCatalog.
+        output_path (str): Log path; one file per 'output_format' entry
+            (default CSV plus a JSON copy) is written with this stem.
+        geometry (Geometry): Optional precomputed geometry to reuse
+            (see build_geometry()).
+        eclipses (list): Optional precomputed EclipseIntervals, used with
+            'energy_integration: exact' (see build_eclipses()).
+        extra_sinks (list): More row sinks (write / close), e.g. a MemorySink.
+        progress (callable): progress(step, steps), called as each step
+            is finished.
+        resume: Checkpoint or checkpoint path to resume from (default the
+            scenario's 'resume_from'). A `geometry` passed with it must
+            start at the checkpoint time.
+
+    Returns:
+        dict: Summary counters: images, targets_imaged, priority_total,
+        downlinks, min_battery_pct and final_stored_mb.
+    """
+    prof = Profiler() if scenario.get('profile', False) else None
+    resume = load_checkpoint(resume if resume is not None else scenario.get('resume_from'))
+    cache = None
+    if resume is None and not scenario.get('checkpoint_path') and not trace_level(scenario.get('trace')):
+        cache = open_result_cache(scenario.get('result_cache'), scenario.get('result_cache_mb'))
+    if cache is None:
+        summary = _simulate(scenario, targets, output_path, geometry, eclipses, extra_sinks, progress, prof,
+                            resume)
+    else:
+        summary = _cached_simulation(cache, scenario, targets, output_path, geometry, eclipses,
+                                     extra_sinks, progress, prof)
+    if prof is not None:
+        for line in prof.report():
+            print(line)
+        prof.write(os.path.splitext(output_path)[0] + "_profile.json")
+        record_profile(prof)
+    return summary
+
+
+def _cached_simulation(cache, scenario, targets, output_path, geometry, eclipses, extra_sinks, progress, prof):
+    """Replay a stored result, or simulate and store it."""
+    t0 = perf_counter()
+    key = result_key(scenario, targets)
+    hit = cache.get(key)
+    if hit is not None:
+        columns, summary = hit
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with OutputSinks(output_path, scenario.get('output_format'), extra=extra_sinks or ()) as sinks:
+            replay_rows(columns, sinks)
+        if progress is not None:
+            steps = int(scenario['duration_minutes'] * 60 / scenario['timestep_sec'])
+            progress(steps, steps)
+        if prof is not None:
+            prof.add("result_cache_replay", perf_counter() - t0, len(next(iter(columns.values()), ())))
+        print(f"♻️ Result cache hit ({key[:12]}); log saved to {output_path}")
+        return dict(summary)
+    if prof is not None:
+        prof.add("result_cache_lookup", perf_counter() - t0, 0)
+
+    entry = cache.writer(key)
+    try:
+        summary = _simulate(scenario, targets, output_path, geometry, eclipses,
+                            list(extra_sinks or ()) + [entry.sink], progress, prof)
+    except BaseException:
+        entry.abort()
+        raise
+    entry.commit(summary)
+    return summary
+
+
+def _simulate(scenario, targets, output_path, geometry, eclipses, extra_sinks, progress, prof=None, resume=None):
+    """run_simulation() without the result cache."""
+    ts = resources.timescale()
+    done = 0
+    if resume is not None:
+        # Simulate only what is left after the checkpoint
+        scenario, done = resumed_scenario(scenario, resume)
+        if scenario['duration_minutes'] <= 0:
+            print(f"⏯️ Checkpoint {resume.time.isoformat()} is at the end of the horizon; nothing to simulate")
+            return dict(resume.summary)
+
+    start_time = parse_start_time(scenario['start_time'])
     duration_min = scenario['duration_minutes']
     timestep_sec = scenario['timestep_sec']
     steps = int(duration_min * 60 / timestep_sec)
 
     min_elev = scenario.get('min_elevation_deg', 10)
     max_slew_deg = scenario.get('max_slew_angle_deg', 20)
-    ground_stations = scenario.get('ground_stations', [])
 
+    # 'adaptive' jumps between state-change events and integrates idle gaps
+    # in closed form; per-step rows are still written if output_steps is set.
+    adaptive = scenario.get('stepping', 'fixed') == 'adaptive'
+    output_steps = scenario.get('output_steps', not adaptive)
+    # 'exact' integrates energy over precomputed eclipse intervals instead of
+    # charging for a whole step whenever the step starts in sunlight.
+    exact_energy = scenario.get('energy_integration', 'step') == 'exact'
+    # 'oracle' checks the battery against the predicted timeline up to the
+    # next sunrise; 'heuristic' is the old fixed 10-minute idle window.
+    lookahead = scenario.get('lookahead', 'oracle')
+    reserve_wh = scenario.get('lookahead_reserve_wh', DEFAULT_RESERVE_WH)
+    # 'planner' plans all imaging up front (core/planner.py) and the step
+    # loop then executes and verifies that plan; 'greedy' decides per step.
+    use_planner = scenario.get('scheduler_mode', 'greedy') == 'planner'
+    level = trace_level(scenario.get('trace'))
+
+    fleet = FleetState.from_configs(scenario['satellites'])
     sats = []
-    for sat_cfg in scenario['satellites']:
-        sat = EarthSatellite(sat_cfg['tle'][0], sat_cfg['tle'][1], sat_cfg['name'], ts)
+    for i, sat_cfg in enumerate(scenario['satellites']):
         sats.append({
             "name": sat_cfg["name"],
-            "sat": sat,
-            "energy": EnergyModel(
-                capacity_wh=sat_cfg["battery_wh"],
-                initial_wh=sat_cfg.get("initial_battery_wh", sat_cfg["battery_wh"]),
-                charge_rate_w=sat_cfg["charge_rate_w"],
-                imaging_power_w=sat_cfg["imaging_power_w"],
-                downlink_power_w=sat_cfg["downlink_power_w"],
-                idle_power_w=sat_cfg["idle_power_w"]
-            ),
-            "data": DataModel(
-                capacity_mb=sat_cfg["storage_capacity_mb"],
-                downlink_rate_mbps=sat_cfg["downlink_bandwidth_mbps"],
-                initial_mb=sat_cfg.get("initial_storage_mb", 0)
-            ),
-            "last_att_vec": None,
-            "last_imaged": {tgt["name"]: None for tgt in targets}
+            "sat": resources.satellite(sat_cfg['tle'], sat_cfg['name'], ts),
+            "energy": fleet.energy_model(i),
+            "data": fleet.data_model(i),
+            "slew_model": SlewModel.from_config(sat_cfg) or SlewModel.from_config(scenario),
         })
 
-    last_imaged_global: Dict[str, Optional[datetime]] = {tgt["name"]: None for tgt in targets}
+    # Integer-ID target columns; revisit state is the catalog's last_imaged
+    catalog = targets if isinstance(targets, TargetCatalog) else TargetCatalog.from_dicts(targets)
+    catalog.reset()
+    targets = catalog
+    start_epoch = epoch_seconds(start_time)
+    summary = {"images": 0, "targets_imaged": 0, "priority_total": 0.0, "downlinks": 0,
+               "min_battery_pct": 100.0, "final_stored_mb": 0.0}
+    sat_names = [s["name"] for s in sats]
+    resume_outputs = None
+    if resume is not None:
+        n_sats, n_targets = resume.restore(fleet, sat_names, catalog)
+        summary.update({k: v for k, v in resume.summary.items() if k in summary})
+        if resume.output_path and os.path.abspath(resume.output_path) == os.path.abspath(output_path):
+            resume_outputs = resume.outputs
+        print(f"⏯️ Resuming at {start_time.isoformat()} after {done} steps "
+              f"({n_sats}/{len(sats)} satellites, {n_targets}/{len(catalog)} targets restored)")
+    checkpoint_path = scenario.get('checkpoint_path')
+    checkpoint_every = scenario.get('checkpoint_every_minutes')
+    checkpoint_steps = None
+    if checkpoint_path and checkpoint_every:
+        checkpoint_steps = max(1, int(round(checkpoint_every * 60 / timestep_sec)))
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    results = []
-    with open(output_path, "w", newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "timestamp", "satellite", "action", "in_sunlight", "over_target", "over_ground",
-            "energy_wh", "battery_pct", "data_mb", "storage_pct"
-        ])
-        writer.writeheader()
+    # Propagate each satellite once over the whole grid; the step loop only
+    # does lookups into the precomputed sunlight / elevation matrices.
+    eph = None
+    if geometry is None or (exact_energy and eclipses is None):
+        with timed(prof, "ephemeris"):
+            eph = resources.ephemeris()
+    if geometry is None:
+        with timed(prof, "geometry", len(sats) * steps):
+            geometry = build_geometry(scenario, catalog, ts, eph)
+    elif geometry.steps < steps:
+        raise ValueError(f"Geometry covers {geometry.steps} steps, the scenario needs {steps}")
+    if not exact_energy:
+        eclipses = None
+    elif eclipses is None:
+        with timed(prof, "eclipses", len(sats)):
+            eclipses = build_eclipses(scenario, geometry, ts, eph)
 
-        for step in range(steps):
-            sim_time = start_time + timedelta(seconds=step * timestep_sec)
-            t = ts.utc(sim_time)
-
-            for s in sats:
-                sat = s["sat"]
-                energy = s["energy"]
-                data = s["data"]
-                name = s["name"]
-                sunlit = sat.at(t).is_sunlit(eph)
-
-                # Visible targets with allowed slew
-                eligible_targets = []
-                for tgt in targets:
-                    loc = wgs84.latlon(tgt['lat'], tgt['lon'])
-                    if not is_visible(sat, loc, t, min_elev):
-                        continue
+    # 'contact_plan' shares each station's antennas and bandwidth between
+    # satellites in view (core/contacts.py) instead of letting every
+    # satellite in view downlink at its full rate.
+    contacts = None
+    if scenario.get('contact_plan', False):
+        with timed(prof, "contact_plan", len(sats)):
+            contacts = build_contact_plan(geometry, scenario['ground_stations'], fleet.downlink_rate_mbps, min_elev)
+        st = contacts.stats
+        print(f"📡 Contact plan: {st['contacts']} contacts from {st['windows']} station passes, "
+              f"{st['allocated_steps']}/{st['visible_steps']} visible steps with an antenna")
 
-                    revisit_td = timedelta(hours=tgt['revisit_hours'])
-                    last = last_imaged_global[tgt['name']]
-                    if last is not None and (sim_time - last) < revisit_td:
-                        continue
+    # 'cloud_raster' screens candidate targets against a gridded cloud
+    # fraction series (core/weather.py); 'clear_only' images whatever is visible.
+    weather = open_weather(scenario, catalog)
+    if weather is not None:
+        r = weather.raster
+        print(f"☁️ Cloud raster {r.path}: {r.frames} frames of {r.rows}x{r.cols}, skipping targets above "
+              f"{weather.max_cloud:.0%} cloud{', down-ranking the rest' if weather.rank else ''}")
 
-                    vec = vector_to_target(sat, tgt['lat'], tgt['lon'], t)
-                    if s["last_att_vec"] is not None:
-                        slew_deg = angle_between(vec, s["last_att_vec"])
-                        if slew_deg > max_slew_deg:
-                            continue
-
-                    eligible_targets.append((tgt, vec))
-
-                best_target = None
-                best_vec = None
-                if eligible_targets:
-                    eligible_targets.sort(key=lambda x: (-x[0]["priority"], last_imaged_global[x[0]["name"]] or datetime.min))
-                    best_target, best_vec = eligible_targets[0]
-
-                over_ground = any(
-                    is_visible(sat, wgs84.latlon(gs['lat'], gs['lon']), t, min_elev)
-                    for gs in ground_stations
-                )
-
-                action = "idle"
-
-                if best_target:
-                    mb = best_target['image_size_mb']
-                    wh = best_target['image_energy_wh']
-
-                    if (
-                        energy.can_perform(wh)
-                        and data.store_image(mb)
-                        and lookahead_energy_ok(energy, energy.energy, sunlit, 'image', timestep_sec / 60)
-                    ):
-                        energy.step(sunlit, 'image', timestep_sec / 60)
-                        s["last_att_vec"] = best_vec
-                        s["last_imaged"][best_target["name"]] = sim_time
-                        last_imaged_global[best_target["name"]] = sim_time
-                        action = f"image:{best_target['name']}"
-                    else:
-                        # Detailed rejection reason
-                        if not energy.can_perform(wh):
-                            print(f"[{sat}] Skipped {best_target['name']} — insufficient energy "
-                                f"({energy.energy:.2f}Wh < required {wh}Wh)")
-                        elif not data.store_image(mb):
-                            print(f"[{sat}] Skipped {best_target['name']} — insufficient storage for {mb}MB")
-                        energy.step(sunlit, 'idle', timestep_sec / 60)
-
-                elif over_ground:
-                    downlink_wh = energy.downlink_power_w * timestep_sec / 3600  # W * sec / 3600 = Wh
-                    if energy.can_perform(downlink_wh):
-                        downlinked = data.downlink(timestep_sec / 60)
-                        energy.step(sunlit, 'downlink', timestep_sec / 60)
-                        action = 'downlink' if downlinked > 0 else 'idle'
-                    else:
-                        print(f"[{sat}] Skipped downlink — insufficient energy "
-                            f"({energy.energy:.2f}Wh < required {downlink_wh:.2f}Wh)")
-                        energy.step(sunlit, 'idle', timestep_sec / 60)
+    oracle = None
+    if lookahead == 'oracle':
+        with timed(prof, "lookahead_oracle", len(sats)):
+            oracle = EnergyOracle.from_geometry(
+                geometry, fleet, timestep_sec, min_elev, eclipses,
+                scenario.get('lookahead_horizon_minutes', DEFAULT_HORIZON_MINUTES), contacts)
 
+    plan = None
+    if use_planner:
+        def energy_gate(energy, i, step, action):
+            return _lookahead_ok(oracle, energy, i, step, geometry.sunlit[i, step], action,
+                                 timestep_sec, reserve_wh)
+        with timed(prof, "planner"):
+            plan = plan_schedule(
+                geometry, fleet, catalog, timestep_sec, start_epoch, min_elev, max_slew_deg,
+                slew_models=[s["slew_model"] for s in sats], energy_gate=energy_gate, eclipses=eclipses,
+                per_step=scenario.get('planner_candidates_per_step', DEFAULT_CANDIDATES_PER_STEP),
+                passes=scenario.get('planner_passes', DEFAULT_PASSES),
+                window_steps=scenario.get('planner_window_steps', DEFAULT_WINDOW_STEPS), contacts=contacts,
+                weather=weather)
+        print(f"🗺️ Planned {len(plan)} images from {plan.stats['opportunities']} opportunities "
+              f"({plan.stats['dropped']} dropped in repair)")
+    plan_executed = plan_missed = 0
+
+    if adaptive:
+        # Event steps per satellite: anything in view, eclipse entry/exit
+        # (unless gaps are integrated across eclipses exactly), and the first
+        # and last step so the final state is always logged. Geometry may
+        # run past the horizon (a rolling window): those steps are dropped
+        # and the last step is not the end of the log. A resumed run
+        # continues the log, so its first step is an event only if it
+        # would have been one in the uninterrupted run.
+        prev_sunlit = np.ones(len(sats), dtype=bool)
+        first_event = np.ones(len(sats), dtype=bool)
+        if resume is not None and resume.sunlit is not None:
+            dst, src = resume.satellite_rows(sat_names)
+            first_event[dst] = False
+            prev_sunlit[dst] = resume.sunlit[src]
+        for i, s in enumerate(sats):
+            events = geometry.active_steps(i, min_elev)[:steps].copy()
+            if eclipses is None:
+                events[1:] |= geometry.sunlit[i, 1:steps] != geometry.sunlit[i, :max(steps - 1, 0)]
+                if steps:
+                    events[0] |= geometry.sunlit[i, 0] != prev_sunlit[i]
+            if steps:
+                events[0] |= first_event[i]
+                events[-1] |= geometry.steps == steps
+            s["events"] = events
+        if output_steps:
+            step_indices = range(steps)
+        else:
+            step_indices = np.flatnonzero(np.any([s["events"] for s in sats], axis=0)).tolist() if sats else []
+    else:
+        step_indices = range(steps)
+    for s in sats:
+        s["next_step"] = 0
+
+    def capture(upto):
+        # State at the start of step `upto`. Idle adaptive satellites are
+        # brought up to it for the snapshot only, so saving checkpoints
+        # leaves the run itself unchanged.
+        live = fleet.energy_wh.copy(), [s["next_step"] for s in sats]
+        if adaptive:
+            for i, s in enumerate(sats):
+                _integrate_idle(s, i, upto, geometry, eclipses, timestep_sec)
+        outputs = sinks.checkpoint()
+        if trace is not None:
+            outputs["trace"] = trace.checkpoint()
+        state = Checkpoint.capture(start_time + timedelta(seconds=upto * timestep_sec), timestep_sec, sat_names,
+                                   fleet, catalog, summary, output_path, outputs,
+                                   geometry.sunlit[:, upto - 1] if upto else None)
+        fleet.energy_wh[:] = live[0]
+        for s, next_step in zip(sats, live[1]):
+            s["next_step"] = next_step
+        return state
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    trace = None
+    if level:
+        path = trace_path(output_path)
+        offset = (resume_outputs or {}).get("trace") if os.path.exists(path) else None
+        trace = TraceLog(path, level, scenario.get('trace_sample', 1.0), sat_names, catalog.name, resume=offset)
+    # Rows are streamed to every sink as they are produced; nothing is kept
+    # in memory across steps.
+    with OutputSinks(output_path, scenario.get('output_format'), extra=extra_sinks or (),
+                     resume=resume_outputs) as sinks, trace or nullcontext():
+        if checkpoint_path and not sinks.resumable:
+            raise ValueError("checkpoint_path needs resumable output formats (csv, ndjson, json or npz)")
+        last_checkpoint = 0
+        energy_actions = np.full(len(sats), ACTION_NONE)
+        for step in step_indices:
+            sim_time = start_time + timedelta(seconds=step * timestep_sec)
+            sunlit_now = geometry.sunlit[:, step]
+            energy_actions.fill(ACTION_NONE)
+            outcomes = []
+
+            for i, s in enumerate(sats):
+                if adaptive and not s["events"][step]:
+                    if not output_steps:
+                        continue
+                    # Nothing in view: plain idle step, no geometry lookups
+                    best_target, over_ground, action, energy_action = None, False, "idle", "idle"
                 else:
-                    energy.step(sunlit, 'idle', timestep_sec / 60)
+                    if adaptive:
+                        _integrate_idle(s, i, step, geometry, eclipses, timestep_sec)
+                    planned = plan.target_at(i, step) if plan is not None else None
+                    # Sampled by grid step of the whole run, so a resumed
+                    # run traces the same steps as an uninterrupted one
+                    traced = trace if trace is not None and trace.sampled(i, done + step) else None
+                    best_target, over_ground, action, energy_action = _step_satellite(
+                        s, i, step, start_epoch + step * timestep_sec, geometry, fleet, catalog,
+                        min_elev, max_slew_deg, timestep_sec, oracle, reserve_wh, planned, contacts, prof,
+                        traced, weather)
+                    if planned is not None and planned >= 0:
+                        if energy_action == "image":
+                            plan_executed += 1
+                        else:
+                            plan_missed += 1
+                s["next_step"] = step + 1
+                energy_actions[i] = ACTION_CODES[energy_action]
+                outcomes.append((i, best_target, over_ground, action))
+
+            # One vectorized energy update for every satellite processed this step
+            if prof is not None:
+                t0 = perf_counter()
+            if eclipses is None:
+                fleet.step(sunlit_now, energy_actions, timestep_sec / 60, mask=energy_actions != ACTION_NONE)
+            else:
+                for i in np.flatnonzero(energy_actions != ACTION_NONE):
+                    sats[i]["energy"].integrate(eclipses[i], step * timestep_sec, (step + 1) * timestep_sec,
+                                                ACTION_NAMES[energy_actions[i]])
+            if prof is not None:
+                t1 = perf_counter()
+                prof.add("energy_update", t1 - t0, len(outcomes))
 
+            for i, best_target, over_ground, action in outcomes:
+                energy = sats[i]["energy"]
+                data = sats[i]["data"]
                 row = {
                     "timestamp": sim_time.isoformat(),
-                    "satellite": name,
+                    "satellite": sats[i]["name"],
                     "action": action,
-                    "in_sunlight": bool(sunlit),
-                    "over_target": bool(best_target),
+                    "in_sunlight": bool(sunlit_now[i]),
+                    "over_target": best_target is not None,
                     "over_ground": bool(over_ground),
                     "energy_wh": float(round(energy.energy, 2)),
                     "battery_pct": float(round((energy.energy / energy.capacity) * 100, 1)),
                     "data_mb": float(round(data.stored_data, 2)),
                     "storage_pct": float(round((data.stored_data / data.capacity) * 100, 1)),
                 }
-                writer.writerow(row)
-                results.append(row)
+                sinks.write(row)
+                if action.startswith("image:"):
+                    summary["images"] += 1
+                    summary["priority_total"] += float(catalog.priority[best_target])
+                elif action == "downlink":
+                    summary["downlinks"] += 1
+                summary["min_battery_pct"] = min(summary["min_battery_pct"], row["battery_pct"])
+            if prof is not None:
+                prof.add("output", perf_counter() - t1, len(outcomes))
+            if progress is not None:
+                progress(step + 1, steps)
+            if checkpoint_steps and step + 1 < steps and step + 1 - last_checkpoint >= checkpoint_steps:
+                capture(step + 1).save(checkpoint_path)
+                last_checkpoint = step + 1
+        final_state = capture(steps) if checkpoint_path else None
+        if prof is not None:
+            t_close = perf_counter()
+    if prof is not None:
+        # Sinks that write on close (JSON) or flush buffered chunks
+        prof.add("output_close", perf_counter() - t_close, len(sinks.sinks))
 
-    json_path = output_path.replace('.csv', '.json')
-    with open(json_path, 'w') as jf:
-        json.dump(results, jf, indent=2)
-    print(f"✅ JSON output saved to {json_path}")
+    for path in sinks.paths:
+        if path != output_path:
+            print(f"✅ Output saved to {path}")
+    if trace is not None:
+        print(f"🔎 Trace: {trace.summary_line()}; saved to {trace.path}")
+    if plan is not None:
+        print(f"🗺️ Plan verified: {plan_executed}/{len(plan)} planned images executed, {plan_missed} rejected")
 
     print(f"✅ Simulation complete. Log saved to {output_path}")
+    summary["targets_imaged"] = int((catalog.last_imaged != NEVER).sum())
+    summary["final_stored_mb"] = float(fleet.stored_mb.sum())
+    if final_state is not None:
+        # Saved after the log files are closed, so every format is complete
+        final_state.summary.update(summary)
+        final_state.save(checkpoint_path)
+        print(f"💾 Checkpoint saved to {checkpoint_path}")
+    return summary
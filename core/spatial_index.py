@@ -0,0 +1,222 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.visibility import Geometry, site_latlon, site_positions, elevation_matrix
+
+EARTH_RADIUS_KM = 6371.0
+
+# Catalogs at least this large use the spatial index when the scenario
+# leaves 'spatial_index' at 'auto'.
+AUTO_INDEX_MIN_TARGETS = 500
+
+# Extra central angle added to every query so the spherical footprint never
+# under-covers the ellipsoid (geodetic vs geocentric latitude, site heights).
+FOOTPRINT_MARGIN_DEG = 1.0
+
+
+def footprint_radius_deg(alt_km, min_elev_deg):
+    """
+    Earth central angle from the sub-satellite point to the edge of the
+    footprint where the satellite sits at `min_elev_deg` elevation.
+    """
+    eps = np.radians(min_elev_deg)
+    ratio = EARTH_RADIUS_KM / (EARTH_RADIUS_KM + np.maximum(alt_km, 0.0))
+    return np.degrees(np.arccos(ratio * np.cos(eps)) - eps)
+
+
+class TargetIndex:
+    """
+    Lat/lon grid bucketing of a target catalog.
+
+    Targets are sorted by cell id (lat_bin * n_lon + lon_bin) with CSR-style
+    cell offsets, so a run of longitude cells within one latitude row is a
+    single contiguous slice. Queries return candidate target indices inside
+    a spherical cap, filtered exactly with unit-vector dot products.
+    """
+
+    def __init__(self, lats, lons, cell_deg=2.0):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        self.cell_deg = cell_deg
+        self.n_lat = int(np.ceil(180.0 / cell_deg))
+        self.n_lon = int(np.ceil(360.0 / cell_deg))
+
+        lat_bin = self._lat_bin(lats)
+        lon_bin = self._lon_bin(lons)
+        cell = lat_bin * self.n_lon + lon_bin
+        self.order = np.argsort(cell, kind="stable")
+        counts = np.bincount(cell, minlength=self.n_lat * self.n_lon)
+        self.cell_start = np.concatenate(([0], np.cumsum(counts)))
+
+        lat_r, lon_r = np.radians(lats[self.order]), np.radians(lons[self.order])
+        self.unit = np.column_stack((np.cos(lat_r) * np.cos(lon_r),
+                                     np.cos(lat_r) * np.sin(lon_r),
+                                     np.sin(lat_r)))
+
+    def __len__(self):
+        return len(self.order)
+
+    def _lat_bin(self, lat):
+        return np.clip(((np.asarray(lat) + 90.0) // self.cell_deg).astype(np.int64), 0, self.n_lat - 1)
+
+    def _lon_bin(self, lon):
+        return (((np.asarray(lon) + 180.0) % 360.0) // self.cell_deg).astype(np.int64) % self.n_lon
+
+    def query(self, lat, lon, radius_deg):
+        """
+        Indices (into the original catalog, ascending) of targets within
+        `radius_deg` of (lat, lon), plus FOOTPRINT_MARGIN_DEG.
+        """
+        radius = radius_deg + FOOTPRINT_MARGIN_DEG
+        lat_lo, lat_hi = lat - radius, lat + radius
+        row_lo, row_hi = int(self._lat_bin(lat_lo)), int(self._lat_bin(lat_hi))
+
+        # Longitude half-width is widest at the highest latitude in the band
+        max_abs_lat = max(abs(lat_lo), abs(lat_hi))
+        if max_abs_lat >= 90.0 - 1e-9:
+            half_width = 180.0
+        else:
+            half_width = min(180.0, radius / np.cos(np.radians(max_abs_lat)))
+
+        slices = []
+        if half_width >= 180.0:
+            slices.append((self.cell_start[row_lo * self.n_lon],
+                           self.cell_start[(row_hi + 1) * self.n_lon]))
+        else:
+            col_lo = int(self._lon_bin(lon - half_width))
+            col_hi = int(self._lon_bin(lon + half_width))
+            for row in range(row_lo, row_hi + 1):
+                base = row * self.n_lon
+                if col_lo <= col_hi:
+                    slices.append((self.cell_start[base + col_lo], self.cell_start[base + col_hi + 1]))
+                else:
+                    # Band wraps across the antimeridian
+                    slices.append((self.cell_start[base + col_lo], self.cell_start[base + self.n_lon]))
+                    slices.append((self.cell_start[base], self.cell_start[base + col_hi + 1]))
+
+        pos = np.concatenate([np.arange(a, b) for a, b in slices]) if slices else np.zeros(0, dtype=np.int64)
+        if len(pos) == 0:
+            return pos
+        lat_r, lon_r = np.radians(lat), np.radians(lon)
+        center = np.array([np.cos(lat_r) * np.cos(lon_r), np.cos(lat_r) * np.sin(lon_r), np.sin(lat_r)])
+        pos = pos[self.unit[pos] @ center >= np.cos(np.radians(min(radius, 180.0)))]
+        return np.sort(self.order[pos])
+
+
+def subsatellite_points(sat_itrs_km):
+    """Geocentric (lat_deg, lon_deg, alt_km) of ITRS positions [steps x 3]."""
+    x, y, z = sat_itrs_km[:, 0], sat_itrs_km[:, 1], sat_itrs_km[:, 2]
+    r = np.sqrt(x * x + y * y + z * z)
+    return (np.degrees(np.arctan2(z, np.hypot(x, y))),
+            np.degrees(np.arctan2(y, x)),
+            r - EARTH_RADIUS_KM)
+
+
+class IndexedGeometry(Geometry):
+    """
+    Geometry with target visibility stored sparsely: per satellite, a CSR
+    list of (target index, elevation) above the mask for every step.
+    Ground stations keep dense elevation matrices.
+    """
+
+    def __init__(self, times, sat_gcrs_km, sat_itrs_km, sunlit, target_vis, gs_elev, min_elev_deg):
+        super().__init__(times, sat_gcrs_km, sat_itrs_km, sunlit, None, gs_elev)
+        self.target_vis = target_vis
+        self.min_elev_deg = min_elev_deg
+
+    def visible_targets(self, sat_idx, step, min_elev_deg):
+        ptr, idx, elev = self.target_vis[sat_idx]
+        lo, hi = ptr[step], ptr[step + 1]
+        return idx[lo:hi][elev[lo:hi] > min_elev_deg]
+
+    def visibility_pairs(self, sat_idx, min_elev_deg):
+        ptr, idx, elev = self.target_vis[sat_idx]
+        steps = np.repeat(np.arange(self.steps), np.diff(ptr))
+        keep = elev > min_elev_deg
+        return steps[keep], idx[keep]
+
+    def active_steps(self, sat_idx, min_elev_deg):
+        ptr, _, elev = self.target_vis[sat_idx]
+        any_target = np.zeros(self.steps, dtype=bool)
+        above = np.flatnonzero(elev > min_elev_deg)
+        any_target[np.searchsorted(ptr, above, side="right") - 1] = True
+        return any_target | (self.gs_elev[sat_idx] > min_elev_deg).any(axis=1)
+
+    def window(self, lo, hi):
+        base = Geometry.window(self, lo, hi)
+        target_vis = [(ptr[lo:hi + 1] - ptr[lo], idx[ptr[lo]:ptr[hi]], elev[ptr[lo]:ptr[hi]])
+                      for ptr, idx, elev in self.target_vis]
+        return IndexedGeometry(base.times, base.sat_gcrs_km, base.sat_itrs_km, base.sunlit, target_vis,
+                               base.gs_elev, self.min_elev_deg)
+
+    def extend(self, other):
+        base = Geometry.extend(self, other)
+        target_vis = [(np.concatenate((p1, p2[1:] + p1[-1])), np.concatenate((i1, i2)), np.concatenate((e1, e2)))
+                      for (p1, i1, e1), (p2, i2, e2) in zip(self.target_vis, other.target_vis)]
+        return IndexedGeometry(base.times, base.sat_gcrs_km, base.sat_itrs_km, base.sunlit, target_vis,
+                               base.gs_elev, max(self.min_elev_deg, other.min_elev_deg))
+
+
+def _sat_visibility(sat_itrs, index, tgt_pos, tgt_up, min_elev_deg):
+    """CSR (ptr, target indices, elevations) of one satellite's visible targets per step."""
+    # Same memory layout whether run here or on a pickled copy in a worker,
+    # so BLAS takes the same path and results are bit-identical
+    sat_itrs = np.ascontiguousarray(sat_itrs)
+    lat, lon, alt = subsatellite_points(sat_itrs)
+    radius = footprint_radius_deg(alt, min_elev_deg)
+    ptr = [0]
+    idx_parts, elev_parts = [], []
+    for step in range(len(sat_itrs)):
+        # NaN position: propagation failed, nothing in view
+        cand = index.query(lat[step], lon[step], radius[step]) if np.isfinite(alt[step]) else ()
+        if len(cand):
+            elev = elevation_matrix(sat_itrs[step:step + 1], tgt_pos[cand], tgt_up[cand])[0]
+            keep = elev > min_elev_deg
+            idx_parts.append(cand[keep])
+            elev_parts.append(elev[keep])
+            ptr.append(ptr[-1] + int(keep.sum()))
+        else:
+            ptr.append(ptr[-1])
+    idx = np.concatenate(idx_parts) if idx_parts else np.zeros(0, dtype=np.int64)
+    elev = np.concatenate(elev_parts) if elev_parts else np.zeros(0)
+    return np.array(ptr, dtype=np.int64), idx, elev
+
+
+def _shard_visibility(sat_itrs, index, tgt_pos, tgt_up, min_elev_deg):
+    return [_sat_visibility(s, index, tgt_pos, tgt_up, min_elev_deg) for s in sat_itrs]
+
+
+def precompute_indexed_geometry(geometry, targets, min_elev_deg, index=None, workers=1):
+    """
+    Replace the dense target elevation matrices of `geometry` with exact
+    elevation checks on spatial-index candidates only.
+
+    Args:
+        geometry (Geometry): Output of precompute_geometry() called with an
+            empty target list (ground-station elevations only).
+        targets: Target dicts with 'lat', 'lon', or a TargetCatalog.
+        min_elev_deg (float): Elevation mask.
+        index (TargetIndex): Optional prebuilt index over `targets`.
+        workers (int): Process count for the per-satellite queries.
+
+    Returns:
+        IndexedGeometry
+    """
+    if index is None:
+        lat, lon, _ = site_latlon(targets)
+        index = TargetIndex(lat, lon)
+    tgt_pos, tgt_up = site_positions(targets)
+
+    n_sats = geometry.sat_itrs_km.shape[0]
+    if workers > 1 and n_sats > 1:
+        shard = -(-n_sats // workers)
+        with ProcessPoolExecutor(max_workers=min(workers, n_sats)) as pool:
+            jobs = [pool.submit(_shard_visibility, geometry.sat_itrs_km[lo:lo + shard],
+                                index, tgt_pos, tgt_up, min_elev_deg)
+                    for lo in range(0, n_sats, shard)]
+            target_vis = [vis for job in jobs for vis in job.result()]
+    else:
+        target_vis = [_sat_visibility(geometry.sat_itrs_km[i], index, tgt_pos, tgt_up, min_elev_deg)
+                      for i in range(n_sats)]
+
+    return IndexedGeometry(geometry.times, geometry.sat_gcrs_km, geometry.sat_itrs_km,
+                           geometry.sunlit, target_vis, geometry.gs_elev, min_elev_deg)
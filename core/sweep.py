@@ -0,0 +1,239 @@
+import contextlib
+import copy
+import csv
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.access import AccessGeometry
+from core.scheduler import run_simulation, build_geometry, build_eclipses
+from core.targets import TargetCatalog
+
+SUMMARY_FIELDS = ["images", "targets_imaged", "priority_total", "downlinks", "min_battery_pct", "final_stored_mb"]
+
+# Settings that change orbits, sites or the time grid; a sweep shares one
+# geometry, so these cannot vary between its variants.
+GEOMETRY_KEYS = {
+    "start_time", "duration_minutes", "timestep_sec", "stepping", "visibility", "spatial_index",
+    "ground_stations", "satellites", "tle", "lat", "lon", "alt_m", "name",
+}
+
+SCOPES = ("scenario", "satellites", "targets")
+
+# Scheduler settings an unprefixed key may name even when the base scenario
+# leaves them at their defaults
+SCENARIO_SETTINGS = {
+    "min_elevation_deg", "max_slew_angle_deg", "slew_rate_deg_s", "slew_accel_deg_s2", "slew_settle_sec",
+    "energy_integration", "lookahead", "lookahead_horizon_minutes", "lookahead_reserve_wh",
+    "scheduler_mode", "planner_candidates_per_step", "planner_passes", "planner_window_steps",
+    "contact_plan", "output_steps", "weather_model", "cloud_raster", "cloud_raster_start",
+    "cloud_frame_minutes", "cloud_interpolation", "max_cloud_fraction", "cloud_mode",
+}
+
+# Optional satellite fields, likewise
+SATELLITE_FIELDS = {"initial_battery_wh", "initial_storage_mb"}
+
+# Shared by every run in a worker process (see _init_worker)
+_WORKER = {}
+
+
+def _uniform(rng, args, size):
+    return rng.uniform(args[0], args[1], size)
+
+
+def _normal(rng, args, size):
+    return rng.normal(args[0], args[1], size)
+
+
+def _randint(rng, args, size):
+    return rng.integers(args[0], args[1] + 1, size)
+
+
+def _choice(rng, args, size):
+    return rng.choice(np.asarray(args), size)
+
+
+DISTRIBUTIONS = {
+    "uniform": _uniform,
+    "normal": _normal,
+    "randint": _randint,
+    "choice": _choice,
+}
+
+
+def split_key(key, scenario):
+    """
+    (scope, field) of a sweep parameter. Keys may be prefixed with
+    'scenario.', 'satellites.' or 'targets.'. An unprefixed key applies to
+    every satellite if the satellite configs have that field, else to the
+    scenario if it has that setting or the scheduler reads it.
+
+    Raises:
+        ValueError: Unknown scope, an unprefixed key matching neither
+            scope (a typo would otherwise run identical variants), or a
+            key that changes the shared geometry.
+    """
+    scope, _, name = key.rpartition(".")
+    if scope:
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown sweep parameter scope '{scope}' in '{key}'; use one of {SCOPES}")
+    elif any(name in cfg for cfg in scenario["satellites"]) or name in SATELLITE_FIELDS:
+        scope = "satellites"
+    elif name in scenario or name in SCENARIO_SETTINGS:
+        scope = "scenario"
+    elif name not in GEOMETRY_KEYS:
+        raise ValueError(f"Sweep parameter '{key}' is neither a satellite field nor a scenario setting; "
+                         f"prefix it with 'scenario.' or 'satellites.' to set it anyway")
+    if name in GEOMETRY_KEYS:
+        raise ValueError(f"Sweep parameter '{key}' changes the shared geometry and cannot vary")
+    return scope, name
+
+
+def _sample(rng, spec, size):
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValueError(f"Distribution must be one of {sorted(DISTRIBUTIONS)} with its arguments, got {spec}")
+    (kind, args), = spec.items()
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{kind}'; choose from {sorted(DISTRIBUTIONS)}")
+    value = DISTRIBUTIONS[kind](rng, args, size)
+    return np.asarray(value).tolist()
+
+
+def expand_variants(scenario, targets, grid=None, distributions=None, samples=1, seed=0):
+    """
+    Parameter sets for a sweep: the Cartesian product of `grid`, with
+    `samples` Monte Carlo draws from `distributions` at every grid point.
+
+    Args:
+        scenario (dict): Base scenario (to resolve parameter scopes).
+        targets (list): Base target dicts.
+        grid (dict): {parameter: [values]}.
+        distributions (dict): {parameter: {kind: args}}, kind one of
+            DISTRIBUTIONS. Target parameters are drawn per target.
+        samples (int): Draws per grid point (ignored without distributions).
+        seed (int): Random seed.
+
+    Returns:
+        list: One {parameter: value} dict per variant.
+    """
+    grid = grid or {}
+    distributions = distributions or {}
+    for key in itertools.chain(grid, distributions):
+        split_key(key, scenario)
+    rng = np.random.default_rng(seed)
+    variants = []
+    for values in itertools.product(*grid.values()):
+        for _ in range(samples if distributions else 1):
+            params = dict(zip(grid, values))
+            for key, spec in distributions.items():
+                size = len(targets) if split_key(key, scenario)[0] == "targets" else None
+                params[key] = _sample(rng, spec, size)
+            variants.append(params)
+    return variants
+
+
+def apply_variant(scenario, targets, params):
+    """
+    Copies of the scenario and targets with one variant's parameters set.
+    A list value for a target parameter gives one value per target.
+    """
+    scenario = copy.deepcopy(scenario)
+    targets = [dict(t) for t in targets]
+    for key, value in params.items():
+        scope, name = split_key(key, scenario)
+        if scope == "scenario":
+            scenario[name] = value
+        elif scope == "satellites":
+            for cfg in scenario["satellites"]:
+                cfg[name] = value
+        else:
+            values = value if isinstance(value, list) else [value] * len(targets)
+            for t, v in zip(targets, values):
+                t[name] = v
+    return scenario, targets
+
+
+def _init_worker(state):
+    _WORKER.update(state)
+
+
+def _run_variant(k, params, output_path):
+    """Run one variant against the shared geometry; returns its summary row."""
+    scenario, targets = apply_variant(_WORKER["scenario"], _WORKER["targets"], params)
+    mask = scenario.get("min_elevation_deg", 10) if _WORKER["per_mask"] else None
+    geometry = _WORKER["geometry"][mask]
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet):
+        summary = run_simulation(scenario, targets, output_path, geometry=geometry,
+                                 eclipses=_WORKER["eclipses"])
+    row = {"variant": k}
+    for key, value in params.items():
+        # Per-target draws are summarized by their mean
+        row[key] = float(np.mean(value)) if isinstance(value, list) else value
+    row.update(summary)
+    return row
+
+
+def run_sweep(scenario, targets, variants, output_dir, workers=1, keep_logs=False):
+    """
+    Run every variant of a scenario, computing the orbital geometry once.
+
+    Geometry (propagation, sunlight, visibility, eclipse intervals) is
+    built for the base scenario and shared; each variant only reruns the
+    resource and scheduling layer, in a process pool when `workers` > 1.
+    Geometry that is tied to an elevation mask (rise/set access windows)
+    is built once per distinct mask.
+
+    Args:
+        scenario (dict): Base scenario.
+        targets (list): Base target dicts.
+        variants (list): Parameter dicts from expand_variants().
+        output_dir (str): Directory for summary.csv (and runs/ logs).
+        workers (int): Process count for the variant runs.
+        keep_logs (bool): Keep each variant's CSV log under runs/.
+
+    Returns:
+        list: Summary rows, in variant order.
+    """
+    resolved = [apply_variant(scenario, targets, p)[0] for p in variants] or [scenario]
+    masks = sorted({sc.get("min_elevation_deg", 10) for sc in resolved})
+    catalog = TargetCatalog.from_dicts(targets)
+    first = build_geometry(scenario, catalog, min_elev=masks[0])
+    # Rise/set windows are found for one mask; other geometry filters any mask
+    per_mask = isinstance(first, AccessGeometry)
+    geometry = {None: first}
+    if per_mask:
+        geometry = {masks[0]: first}
+        for m in masks[1:]:
+            geometry[m] = build_geometry(scenario, catalog, min_elev=m)
+
+    eclipses = None
+    if any(sc.get("energy_integration", "step") == "exact" for sc in resolved):
+        eclipses = build_eclipses(scenario, next(iter(geometry.values())))
+
+    os.makedirs(output_dir, exist_ok=True)
+    log_dir = os.path.join(output_dir, "runs") if keep_logs else tempfile.mkdtemp(prefix="sweep-")
+    os.makedirs(log_dir, exist_ok=True)
+    base = dict(scenario, output_format="csv")
+    state = {"scenario": base, "targets": targets, "geometry": geometry,
+             "per_mask": per_mask, "eclipses": eclipses}
+    jobs = [(k, params, os.path.join(log_dir, f"variant_{k:04d}.csv")) for k, params in enumerate(variants)]
+    try:
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                                     initargs=(state,)) as pool:
+                rows = list(pool.map(_run_variant, *zip(*jobs)))
+        else:
+            _init_worker(state)
+            rows = [_run_variant(*job) for job in jobs]
+    finally:
+        if not keep_logs:
+            shutil.rmtree(log_dir, ignore_errors=True)
+
+    fieldnames = ["variant"] + list(dict.fromkeys(k for p in variants for k in p)) + SUMMARY_FIELDS
+    with open(os.path.join(output_dir, "summary.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
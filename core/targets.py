@@ -0,0 +1,131 @@
+import os
+from datetime import timezone
+import numpy as np
+from core.visibility import site_positions
+
+NEVER = -np.inf
+
+DEFAULTS = {
+    "priority": 1,
+    "revisit_hours": 12,
+    "image_size_mb": 50,
+    "image_energy_wh": 5,
+}
+
+
+def epoch_seconds(dt):
+    """POSIX seconds for a datetime; naive datetimes are taken as UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class TargetCatalog:
+    """
+    Column-oriented target catalog with integer target IDs.
+
+    Columns are NumPy arrays indexed by target ID: lat, lon, ecef_km
+    [N x 3] and up [N x 3] (Earth-fixed position and zenith), priority,
+    revisit_seconds, image_size_mb, image_energy_wh and last_imaged
+    (POSIX seconds, NEVER when not yet imaged).
+    """
+
+    def __init__(self, name, lat, lon, priority, revisit_seconds, image_size_mb, image_energy_wh,
+                 alt_m=None):
+        self.name = np.asarray(name, dtype=object)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.alt_m = np.zeros(len(self.lat)) if alt_m is None else np.asarray(alt_m, dtype=float)
+        self.priority = np.asarray(priority, dtype=float)
+        self.revisit_seconds = np.asarray(revisit_seconds, dtype=float)
+        self.image_size_mb = np.asarray(image_size_mb, dtype=float)
+        self.image_energy_wh = np.asarray(image_energy_wh, dtype=float)
+        self.last_imaged = np.full(len(self.lat), NEVER)
+        self.ecef_km, self.up = site_positions(self)
+
+    @classmethod
+    def from_dicts(cls, targets):
+        """Build a catalog from normalized target dicts (see load_configs)."""
+        def col(key):
+            return [t.get(key, DEFAULTS.get(key)) for t in targets]
+        return cls(
+            name=[t["name"] for t in targets],
+            lat=[t["lat"] for t in targets],
+            lon=[t["lon"] for t in targets],
+            alt_m=[t.get("alt_m", 0.0) for t in targets],
+            priority=col("priority"),
+            revisit_seconds=np.asarray(col("revisit_hours"), dtype=float) * 3600.0,
+            image_size_mb=col("image_size_mb"),
+            image_energy_wh=col("image_energy_wh"),
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build a catalog from normalized columns (see utils.catalog_loader)."""
+        return cls(
+            name=columns["name"],
+            lat=columns["lat"],
+            lon=columns["lon"],
+            alt_m=columns["alt_m"],
+            priority=columns["priority"],
+            revisit_seconds=np.asarray(columns["revisit_hours"], dtype=float) * 3600.0,
+            image_size_mb=columns["image_size_mb"],
+            image_energy_wh=columns["image_energy_wh"],
+        )
+
+    @classmethod
+    def from_file(cls, path, cache=True):
+        """Load a YAML, CSV, .npz or Parquet catalog without per-target dicts."""
+        from utils.catalog_loader import load_target_columns
+        return cls.from_columns(load_target_columns(path, cache))
+
+    @classmethod
+    def from_configs(cls, scenario_path="scenario.yaml", targets_path="targets.yaml"):
+        """Load the catalog of a scenario; a relative `targets_path` is taken from the scenario's directory."""
+        if not os.path.isabs(targets_path):
+            targets_path = os.path.join(os.path.dirname(scenario_path), targets_path)
+        return cls.from_file(targets_path)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def __getitem__(self, j):
+        """Target j as a dict, for code that still expects per-target dicts."""
+        return {
+            "name": self.name[j],
+            "lat": float(self.lat[j]),
+            "lon": float(self.lon[j]),
+            "alt_m": float(self.alt_m[j]),
+            "priority": self.priority[j].item(),
+            "revisit_hours": float(self.revisit_seconds[j]) / 3600.0,
+            "image_size_mb": float(self.image_size_mb[j]),
+            "image_energy_wh": float(self.image_energy_wh[j]),
+        }
+
+    def __iter__(self):
+        return (self[j] for j in range(len(self)))
+
+    def revisit_ok(self, ids, now_sec):
+        """Mask over `ids` of targets whose revisit interval has elapsed."""
+        return (now_sec - self.last_imaged[ids]) >= self.revisit_seconds[ids]
+
+    def select_best(self, ids, weight=None):
+        """
+        Highest-priority target among `ids` (ascending target IDs), breaking
+        ties by least recently imaged, then by lowest ID. `weight` (one per
+        ID) scales the priorities first.
+
+        Returns:
+            int or None
+        """
+        if len(ids) == 0:
+            return None
+        prio = self.priority[ids] if weight is None else self.priority[ids] * weight
+        top = ids[prio == prio.max()]
+        return int(top[np.argmin(self.last_imaged[top])])
+
+    def mark_imaged(self, j, now_sec):
+        self.last_imaged[j] = now_sec
+
+    def reset(self):
+        self.last_imaged.fill(NEVER)
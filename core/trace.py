@@ -0,0 +1,194 @@
+import os
+import numpy as np
+from core.output import NpzSink, DEFAULT_CHUNK_ROWS
+
+# Detail recorded at each level; every level includes the ones before it
+LEVELS = {
+    "off": 0,
+    "rejections": 1,   # images and downlinks refused by a resource check
+    "decisions": 2,    # plus every image and downlink taken
+    "candidates": 3,   # plus every visible target filtered out before selection
+}
+
+# Event kinds
+IMAGE, DOWNLINK, CANDIDATE = 0, 1, 2
+KINDS = ("image", "downlink", "candidate")
+
+# Reasons; OK marks an action that was taken
+OK, ENERGY, STORAGE, LOOKAHEAD, SLEW, REVISIT, PLAN, CLOUD = range(8)
+REASONS = ("ok", "energy", "storage", "lookahead", "slew", "revisit", "plan", "cloud")
+
+TRACE_DTYPE = np.dtype([
+    ("time", "f8"),         # POSIX seconds of the step
+    ("satellite", "i4"),
+    ("target", "i4"),       # -1 for downlinks
+    ("kind", "i1"),
+    ("reason", "i1"),
+    ("candidates", "i4"),   # eligible targets at an image decision
+])
+TRACE_FIELDS = list(TRACE_DTYPE.names)
+
+
+def trace_level(value):
+    """LEVELS value of a scenario's 'trace' setting (a level name, bool or None)."""
+    if value is None or value is False:
+        return 0
+    if value is True:
+        return LEVELS["decisions"]
+    if value not in LEVELS:
+        raise ValueError(f"Unknown trace level '{value}'; choose from {list(LEVELS)}")
+    return LEVELS[value]
+
+
+class TraceLog(NpzSink):
+    """
+    Scheduler decisions as a chunked columnar .npz (see TRACE_DTYPE).
+
+    Events are appended as tuples and written every `chunk_rows` events.
+    `sample` keeps that fraction of satellite steps, picked by a hash of
+    (satellite, step) so the same steps are traced on every run. Callers
+    hold None instead of a TraceLog when tracing is off, so an untraced
+    run only pays for `is not None` checks.
+    """
+
+    def __init__(self, path, level, sample=1.0, satellites=(), targets=(), chunk_rows=DEFAULT_CHUNK_ROWS,
+                 resume=None):
+        super().__init__(path, TRACE_FIELDS, chunk_rows, resume)
+        self.level = level
+        self.satellites = list(satellites)
+        self.targets = targets
+        self._threshold = int(min(max(sample, 0.0), 1.0) * 2 ** 32)
+        self._rows = []
+        self._blocks = []
+        self._pending = 0
+        self.counts = np.zeros((len(KINDS), len(REASONS)), dtype=np.int64)
+
+    def sampled(self, sat, step):
+        if self._threshold >= 2 ** 32:
+            return True
+        return ((step * 0x9E3779B1 + sat * 0x85EBCA77) & 0xFFFFFFFF) < self._threshold
+
+    def record(self, time, sat, target, kind, reason, candidates=0):
+        self._rows.append((time, sat, target, kind, reason, candidates))
+        self.counts[kind, reason] += 1
+        self._pending += 1
+        if self._pending >= self.chunk_rows:
+            self.flush()
+
+    def record_many(self, time, sat, targets, kind, reason):
+        """One event per target ID in `targets`."""
+        n = len(targets)
+        if not n:
+            return
+        self._stack_rows()
+        block = np.zeros(n, dtype=TRACE_DTYPE)
+        block["time"] = time
+        block["satellite"] = sat
+        block["target"] = targets
+        block["kind"] = kind
+        block["reason"] = reason
+        self._blocks.append(block)
+        self.counts[kind, reason] += n
+        self._pending += n
+        if self._pending >= self.chunk_rows:
+            self.flush()
+
+    def _stack_rows(self):
+        if self._rows:
+            self._blocks.append(np.array(self._rows, dtype=TRACE_DTYPE))
+            self._rows = []
+
+    def flush(self):
+        self._stack_rows()
+        if self._blocks:
+            events = np.concatenate(self._blocks)
+            self.write_chunk({name: events[name] for name in TRACE_FIELDS})
+            self._blocks = []
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+        # Names for the integer IDs, rewritten on every close (a resumed
+        # trace keeps only the event chunks of the earlier run)
+        for name, values in (("satellite_names", self.satellites), ("target_names", self.targets)):
+            with self._zip.open(f"{name}.npy", "w") as f:
+                np.lib.format.write_array(f, np.asarray(values, dtype=str), allow_pickle=False)
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary_line(self):
+        """One-line count of refused actions, e.g. for the end of a run."""
+        refused = self.counts[[IMAGE, DOWNLINK]].copy()
+        refused[:, OK] = 0
+        parts = [f"{REASONS[r]} {n}" for r, n in enumerate(refused[IMAGE]) if n]
+        line = f"{int(refused[IMAGE].sum())} images refused"
+        if parts:
+            line += f" ({', '.join(parts)})"
+        return line + f", {int(refused[DOWNLINK].sum())} downlinks refused"
+
+
+class Trace:
+    """
+    A decision trace read back from a TraceLog file.
+
+    Attributes:
+        events (ndarray): TRACE_DTYPE records in the order written.
+        satellites (ndarray): Satellite names by ID.
+        targets (ndarray): Target names by ID.
+    """
+
+    def __init__(self, path):
+        parts, names = {}, {}
+        with np.load(path, allow_pickle=False) as npz:
+            for key in sorted(npz.files):
+                column, _, chunk = key.rpartition(".")
+                if chunk.isdigit():
+                    parts.setdefault(column, []).append(npz[key])
+                else:
+                    names[key] = npz[key]
+        self.events = np.zeros(sum(len(p) for p in parts.get("time", [])), dtype=TRACE_DTYPE)
+        for column, chunks in parts.items():
+            self.events[column] = np.concatenate(chunks)
+        self.satellites = names.get("satellite_names", np.zeros(0, dtype=str))
+        self.targets = names.get("target_names", np.zeros(0, dtype=str))
+
+    def __len__(self):
+        return len(self.events)
+
+    def rejections(self, by="satellite", kind=None):
+        """
+        Count refused actions and filtered candidates per reason.
+
+        Args:
+            by (str): 'satellite' or 'target' (downlinks have no target
+                and are left out).
+            kind (str): Only count this event kind ('image', 'downlink'
+                or 'candidate').
+
+        Returns:
+            dict: {name: {reason: count}}, busiest first.
+        """
+        if by not in ("satellite", "target"):
+            raise ValueError(f"Group rejections by 'satellite' or 'target', not '{by}'")
+        ev = self.events[self.events["reason"] != OK]
+        if kind is not None:
+            ev = ev[ev["kind"] == KINDS.index(kind)]
+        if by == "target":
+            ev = ev[ev["target"] >= 0]
+        names = self.satellites if by == "satellite" else self.targets
+        keys, counts = np.unique(np.stack((ev[by].astype(np.int64), ev["reason"].astype(np.int64))),
+                                 axis=1, return_counts=True)
+        table = {}
+        for (idx, reason), n in zip(keys.T.tolist(), counts.tolist()):
+            name = str(names[idx]) if idx < len(names) else str(idx)
+            table.setdefault(name, {})[REASONS[reason]] = n
+        return dict(sorted(table.items(), key=lambda kv: -sum(kv[1].values())))
+
+
+def trace_path(output_path):
+    return os.path.splitext(output_path)[0] + "_trace.npz"
@@ -0,0 +1,233 @@
+from datetime import timezone
+import numpy as np
+from skyfield.api import wgs84
+from skyfield.framelib import itrs
+from core.propagation import propagate_many, check_propagation
+
+
+def build_time_grid(ts, start_time, timestep_sec, steps):
+    """
+    Build the whole simulation timescale as a single Skyfield array Time.
+
+    Args:
+        ts: Skyfield timescale.
+        start_time (datetime): Simulation start (UTC).
+        timestep_sec (float): Step length in seconds.
+        steps (int): Number of steps.
+
+    Returns:
+        Time: Array Time with one entry per step.
+    """
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    offsets = np.arange(steps) * float(timestep_sec)
+    return ts.utc(start_time.year, start_time.month, start_time.day,
+                  start_time.hour, start_time.minute,
+                  start_time.second + start_time.microsecond / 1e6 + offsets)
+
+
+def site_latlon(sites):
+    """
+    (lat, lon, alt_m) arrays for a list of site dicts or a column-oriented
+    catalog with lat / lon / alt_m arrays (e.g. TargetCatalog).
+    """
+    if hasattr(sites, 'lat'):
+        return sites.lat, sites.lon, sites.alt_m
+    lat = np.array([s['lat'] for s in sites], dtype=float)
+    lon = np.array([s['lon'] for s in sites], dtype=float)
+    alt = np.array([s.get('alt_m', 0.0) for s in sites], dtype=float)
+    return lat, lon, alt
+
+
+def site_positions(sites):
+    """
+    Earth-fixed (ITRS) positions and local zenith unit vectors of ground sites.
+
+    Args:
+        sites: List of dicts with 'lat', 'lon' and optional 'alt_m', or a
+            TargetCatalog (whose precomputed columns are reused).
+
+    Returns:
+        tuple: (positions_km [N x 3], up_vectors [N x 3])
+    """
+    if len(sites) == 0:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+    if hasattr(sites, 'ecef_km'):
+        return sites.ecef_km, sites.up
+    lat, lon, alt = site_latlon(sites)
+    pos = wgs84.latlon(lat, lon, elevation_m=alt).itrs_xyz.km.T
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    up = np.column_stack((np.cos(lat_r) * np.cos(lon_r),
+                          np.cos(lat_r) * np.sin(lon_r),
+                          np.sin(lat_r)))
+    return pos, up
+
+
+def elevation_matrix(sat_itrs_km, site_pos_km, site_up):
+    """
+    Elevation angle of a satellite above every site at every step.
+
+    Args:
+        sat_itrs_km (ndarray): Satellite ITRS positions [steps x 3].
+        site_pos_km (ndarray): Site ITRS positions [N x 3].
+        site_up (ndarray): Site zenith unit vectors [N x 3].
+
+    Returns:
+        ndarray: Elevations in degrees [steps x N].
+    """
+    if len(site_pos_km) == 0:
+        return np.zeros((len(sat_itrs_km), 0))
+    # Expanded form of (sat - site) . up / |sat - site| to avoid a
+    # [steps x N x 3] intermediate.
+    up_dot_sat = sat_itrs_km @ site_up.T
+    up_dot_site = np.einsum('ij,ij->i', site_pos_km, site_up)
+    sat_sq = np.einsum('ij,ij->i', sat_itrs_km, sat_itrs_km)
+    site_sq = np.einsum('ij,ij->i', site_pos_km, site_pos_km)
+    dist_sq = sat_sq[:, None] - 2.0 * (sat_itrs_km @ site_pos_km.T) + site_sq[None, :]
+    sin_elev = (up_dot_sat - up_dot_site[None, :]) / np.sqrt(dist_sq)
+    return np.degrees(np.arcsin(np.clip(sin_elev, -1.0, 1.0)))
+
+
+class Geometry:
+    """
+    Orbital geometry precomputed once over the whole time grid.
+
+    Attributes:
+        times (Time): Skyfield array Time, one entry per step.
+        sat_gcrs_km (ndarray): Satellite GCRS positions [sats x steps x 3].
+        sat_itrs_km (ndarray): Satellite ITRS positions [sats x steps x 3].
+        sunlit (ndarray): Sunlit flags [sats x steps].
+        target_elev (ndarray): Elevations in degrees [sats x steps x targets].
+        gs_elev (ndarray): Elevations in degrees [sats x steps x stations].
+    """
+
+    def __init__(self, times, sat_gcrs_km, sat_itrs_km, sunlit, target_elev, gs_elev):
+        self.times = times
+        self.sat_gcrs_km = sat_gcrs_km
+        self.sat_itrs_km = sat_itrs_km
+        self.sunlit = sunlit
+        self.target_elev = target_elev
+        self.gs_elev = gs_elev
+
+    @property
+    def steps(self):
+        return self.sunlit.shape[1]
+
+    def itrs_rotation(self, step):
+        """GCRS -> ITRS rotation matrix at `step`, or a stack for an array of steps."""
+        if getattr(self, '_itrs_rot', None) is None:
+            self._itrs_rot = np.moveaxis(itrs.rotation_at(self.times), 2, 0)
+        return self._itrs_rot[step]
+
+    def visible_targets(self, sat_idx, step, min_elev_deg):
+        """Indices of targets above the elevation mask, in catalog order."""
+        return np.flatnonzero(self.target_elev[sat_idx, step] > min_elev_deg)
+
+    def over_ground(self, sat_idx, step, min_elev_deg):
+        return bool((self.gs_elev[sat_idx, step] > min_elev_deg).any())
+
+    def visibility_pairs(self, sat_idx, min_elev_deg):
+        """(steps, target indices) of every target above the mask, ordered by step."""
+        return np.nonzero(self.target_elev[sat_idx] > min_elev_deg)
+
+    def ground_steps(self, sat_idx, min_elev_deg):
+        """Boolean [steps] mask of steps with any ground station in view."""
+        return (self.gs_elev[sat_idx] > min_elev_deg).any(axis=1)
+
+    def station_contacts(self, sat_idx, min_elev_deg):
+        """
+        Ground-station visibility windows as step intervals.
+
+        Returns:
+            tuple: (station index, first step, end step (exclusive)) arrays.
+        """
+        vis = self.gs_elev[sat_idx] > min_elev_deg
+        edges = np.diff(np.pad(vis, ((1, 1), (0, 0))).astype(np.int8), axis=0)
+        station, start = np.nonzero(edges.T == 1)
+        _, end = np.nonzero(edges.T == -1)
+        return station, start, end
+
+    def active_steps(self, sat_idx, min_elev_deg):
+        """Boolean [steps] mask of steps with any target or ground station in view."""
+        return ((self.target_elev[sat_idx] > min_elev_deg).any(axis=1)
+                | (self.gs_elev[sat_idx] > min_elev_deg).any(axis=1))
+
+    def window(self, lo, hi):
+        """Steps [lo, hi) as a Geometry of their own (arrays are views)."""
+        return Geometry(self.times[lo:hi], self.sat_gcrs_km[:, lo:hi], self.sat_itrs_km[:, lo:hi],
+                        self.sunlit[:, lo:hi], _step_slice(self.target_elev, lo, hi),
+                        _step_slice(self.gs_elev, lo, hi))
+
+    def extend(self, other):
+        """This geometry followed by `other`, the next steps of the same fleet and sites."""
+        return Geometry(join_times(self.times, other.times),
+                        np.concatenate((self.sat_gcrs_km, other.sat_gcrs_km), axis=1),
+                        np.concatenate((self.sat_itrs_km, other.sat_itrs_km), axis=1),
+                        np.concatenate((self.sunlit, other.sunlit), axis=1),
+                        _step_concat(self.target_elev, other.target_elev),
+                        _step_concat(self.gs_elev, other.gs_elev))
+
+
+def _step_slice(arr, lo, hi):
+    return None if arr is None else arr[:, lo:hi]
+
+
+def _step_concat(a, b):
+    return None if a is None else np.concatenate((a, b), axis=1)
+
+
+def join_times(a, b):
+    """Two array Times back to back, as one array Time."""
+    return a.ts.tt_jd(np.concatenate((a.whole, b.whole)), np.concatenate((a.tt_fraction, b.tt_fraction)))
+
+
+def precompute_geometry(satellites, targets, ground_stations, times, eph, elevations=True,
+                        cache=None, tles=None, workers=1):
+    """
+    Propagate the whole fleet once over the time grid and evaluate sunlight
+    and target / ground-station elevations with NumPy.
+
+    Args:
+        satellites (list): Skyfield EarthSatellite objects.
+        targets (list): Target dicts with 'lat' and 'lon'.
+        ground_stations (list): Ground station dicts with 'lat', 'lon', 'alt_m'.
+        times (Time): Array Time from build_time_grid().
+        eph: Loaded JPL ephemeris (for sunlight).
+        elevations (bool): Skip the elevation matrices when False (the
+            caller supplies visibility some other way, e.g. an AccessTable).
+        cache (PropagationCache): Optional on-disk propagation cache.
+        tles (list): TLE line pairs matching `satellites`, used as cache keys.
+        workers (int): Spread propagation and elevations over this many
+            processes (requires `tles`); results match the serial run.
+
+    Returns:
+        Geometry: Steps where SGP4 fails for a satellite have NaN
+        positions and no target or station in view (see
+        check_propagation()).
+    """
+    n_steps = len(times)
+    tgt_pos, tgt_up = site_positions(targets if elevations else [])
+    gs_pos, gs_up = site_positions(ground_stations if elevations else [])
+
+    if workers > 1 and tles is not None and len(satellites) > 1:
+        from core.parallel import parallel_fleet_geometry
+        sites = {"target_elev": (tgt_pos, tgt_up), "gs_elev": (gs_pos, gs_up)} if elevations else {}
+        out = parallel_fleet_geometry(tles, times, eph, sites, elevation_matrix,
+                                      min(workers, len(satellites)), cache)
+        check_propagation(satellites, out["gcrs_km"])
+        return Geometry(times, out["gcrs_km"], out["itrs_km"], out["sunlit"],
+                        out.get("target_elev"), out.get("gs_elev"))
+
+    # One vectorized SGP4 call for the whole fleet
+    sat_gcrs, _, sat_itrs, sunlit = propagate_many(satellites, times, eph, cache, tles)
+    check_propagation(satellites, sat_gcrs)
+    target_elev = np.empty((len(satellites), n_steps, len(tgt_pos)))
+    gs_elev = np.empty((len(satellites), n_steps, len(gs_pos)))
+
+    for i in range(len(satellites)):
+        target_elev[i] = elevation_matrix(sat_itrs[i], tgt_pos, tgt_up)
+        gs_elev[i] = elevation_matrix(sat_itrs[i], gs_pos, gs_up)
+
+    if not elevations:
+        target_elev = gs_elev = None
+    return Geometry(times, sat_gcrs, sat_itrs, sunlit, target_elev, gs_elev)
@@ -0,0 +1,240 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from core.targets import epoch_seconds
+from utils.config_loader import parse_start_time
+
+WEATHER_MODELS = ("clear_only", "cloud_raster")
+
+DEFAULT_FRAME_MINUTES = 60
+DEFAULT_MAX_CLOUD = 0.5
+DEFAULT_TILE_CELLS = 64
+DEFAULT_CACHE_TILES = 256
+# Lookups of more cells than this read straight from the map
+BULK_CELLS = 4096
+
+
+class CloudRaster:
+    """
+    Cloud-fraction time series on a regular lat/lon grid, read from a
+    memory-mapped .npy cube [frames x rows x cols].
+
+    Row 0 lies at lat_range[0] and the last row at lat_range[1] (either
+    order), likewise for columns and lon_range; longitudes wrap. On a grid
+    whose columns cover all 360 degrees without repeating the first one
+    (cell centres, e.g. -179.5 to 179.5), points past the last column
+    interpolate with the first. Frame k
+    holds from start + k * frame_sec until the next frame; times outside
+    the series use the first or last frame. Float rasters hold fractions
+    (0-1), integer rasters percent (0-100). Missing values (NaN) and points
+    off the grid count as clear.
+
+    Cells are read in tiles of `tile` x `tile`, kept in a least-recently-
+    used cache of `cache_tiles` tiles, so the scheduler's per-step lookups
+    (targets in one satellite's footprint) touch a few small tiles instead
+    of the whole frame. Batches of more than BULK_CELLS cells read straight
+    from the map.
+    """
+
+    def __init__(self, path, start_epoch, frame_sec, lat_range=(-90.0, 90.0), lon_range=(-180.0, 180.0),
+                 interpolation="bilinear", tile=DEFAULT_TILE_CELLS, cache_tiles=DEFAULT_CACHE_TILES):
+        if interpolation not in ("bilinear", "nearest"):
+            raise ValueError(f"Unknown cloud_interpolation '{interpolation}'; use bilinear or nearest")
+        self.path = path
+        self.data = np.load(path, mmap_mode="r")
+        if self.data.ndim != 3 or 0 in self.data.shape:
+            raise ValueError(f"Cloud raster {path} must be a non-empty [frames x rows x cols] array, "
+                             f"got shape {self.data.shape}")
+        self.frames, self.rows, self.cols = self.data.shape
+        self.start_epoch = float(start_epoch)
+        self.frame_sec = float(frame_sec)
+        self.lat_range = tuple(map(float, lat_range))
+        self.lon_range = tuple(map(float, lon_range))
+        self.bilinear = interpolation == "bilinear"
+        span = abs(self.lon_range[1] - self.lon_range[0])
+        self.wrap = self.cols > 1 and abs(span * self.cols / (self.cols - 1) - 360.0) < 1e-6
+        self.tile = int(tile)
+        self.n_ty = -(-self.rows // self.tile)
+        self.n_tx = -(-self.cols // self.tile)
+        self.cache_tiles = int(cache_tiles)
+        self._tiles = OrderedDict()
+        self.tile_reads = 0
+
+    def grid_coords(self, lat, lon):
+        """Fractional (row, col) of each point; NaN off the grid."""
+        lat0, lat1 = self.lat_range
+        lon0, lon1 = self.lon_range
+        y = (np.asarray(lat, dtype=float) - lat0) / (lat1 - lat0) * (self.rows - 1) if self.rows > 1 \
+            else np.zeros(np.shape(lat))
+        lon = np.asarray(lon, dtype=float)
+        # Wrap into the 360 degrees starting at the grid's first column
+        if lon1 >= lon0:
+            lon = lon0 + np.mod(lon - lon0, 360.0)
+        else:
+            lon = lon0 - np.mod(lon0 - lon, 360.0)
+        x = (lon - lon0) / (lon1 - lon0) * (self.cols - 1) if self.cols > 1 else np.zeros(lon.shape)
+        eps = 1e-9
+        # A wrapping grid covers every longitude, x in [0, cols)
+        last = self.cols if self.wrap else self.cols - 1
+        off = (y < -eps) | (y > self.rows - 1 + eps) | (x < -eps) | (x > last + eps)
+        y = np.where(off, np.nan, np.clip(y, 0, self.rows - 1))
+        x = np.where(off, np.nan, np.clip(x, 0, last))
+        return y, x
+
+    def frame_index(self, t_sec):
+        k = np.floor((np.asarray(t_sec, dtype=float) - self.start_epoch) / self.frame_sec)
+        return np.clip(k, 0, self.frames - 1).astype(np.int64)
+
+    def sample(self, frames, y, x):
+        """Cloud fraction at grid coordinates (y, x) of the given frames (arrays of equal length)."""
+        out = np.zeros(len(y))
+        on = ~np.isnan(y)
+        if not on.any():
+            return out
+        f, y, x = frames[on], y[on], x[on]
+        if not self.bilinear:
+            c = np.rint(x).astype(np.int64)
+            out[on] = self._cells(f, np.rint(y).astype(np.int64), c % self.cols if self.wrap else c)
+            return out
+        r0 = np.floor(y).astype(np.int64)
+        c0 = np.floor(x).astype(np.int64)
+        r1 = np.minimum(r0 + 1, self.rows - 1)
+        wy, wx = y - r0, x - c0
+        if self.wrap:
+            c0 %= self.cols
+            c1 = (c0 + 1) % self.cols
+        else:
+            c1 = np.minimum(c0 + 1, self.cols - 1)
+        n = len(f)
+        v = self._cells(np.tile(f, 4), np.concatenate((r0, r0, r1, r1)),
+                        np.concatenate((c0, c1, c0, c1))).reshape(4, n)
+        out[on] = ((v[0] * (1 - wx) + v[1] * wx) * (1 - wy)
+                   + (v[2] * (1 - wx) + v[3] * wx) * wy)
+        return out
+
+    def _convert(self, cells):
+        cells = np.asarray(cells, dtype=np.float32)
+        if np.issubdtype(self.data.dtype, np.integer):
+            cells = cells / np.float32(100.0)
+        return np.clip(np.nan_to_num(cells, nan=0.0), 0.0, 1.0)
+
+    def _cells(self, f, r, c):
+        t = self.tile
+        key = (f * self.n_ty + r // t) * self.n_tx + c // t
+        if len(key) > BULK_CELLS:
+            # Fancy indexing reads only the pages holding these cells
+            return self._convert(self.data[f, r, c])
+        if (key == key[0]).all():
+            # The usual per-step case: one footprint, one tile
+            cells, r0, c0 = self._tile(int(key[0]))
+            return cells[r - r0, c - c0]
+        uniq, inv = np.unique(key, return_inverse=True)
+        out = np.empty(len(key), dtype=np.float32)
+        order = np.argsort(inv, kind="stable")
+        bounds = np.searchsorted(inv[order], np.arange(len(uniq) + 1))
+        for n, k in enumerate(uniq.tolist()):
+            sel = order[bounds[n]:bounds[n + 1]]
+            cells, r0, c0 = self._tile(k)
+            out[sel] = cells[r[sel] - r0, c[sel] - c0]
+        return out
+
+    def _tile(self, key):
+        hit = self._tiles.get(key)
+        if hit is not None:
+            self._tiles.move_to_end(key)
+            return hit
+        frame, rest = divmod(key, self.n_ty * self.n_tx)
+        ty, tx = divmod(rest, self.n_tx)
+        r0, c0 = ty * self.tile, tx * self.tile
+        hit = (self._convert(self.data[frame, r0:r0 + self.tile, c0:c0 + self.tile]), r0, c0)
+        self.tile_reads += 1
+        self._tiles[key] = hit
+        if len(self._tiles) > self.cache_tiles:
+            self._tiles.popitem(last=False)
+        return hit
+
+
+class CloudCover:
+    """
+    Cloud screening of catalog targets: targets above `max_cloud` are
+    skipped and, with `rank`, the priority of the rest is scaled by their
+    clear fraction (1 - cloud) when choosing between them.
+    """
+
+    def __init__(self, raster, catalog, max_cloud=DEFAULT_MAX_CLOUD, rank=False):
+        self.raster = raster
+        self.max_cloud = float(max_cloud)
+        self.rank = rank
+        # Grid coordinates of every target, computed once
+        self.y, self.x = raster.grid_coords(catalog.lat, catalog.lon)
+
+    def cloud(self, t_sec, ids):
+        """Cloud fraction of targets `ids` at POSIX time(s) `t_sec`."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return np.zeros(0)
+        frames = np.broadcast_to(self.raster.frame_index(t_sec), ids.shape)
+        if len(ids) <= len(self.y):
+            return self.raster.sample(frames, self.y[ids], self.x[ids])
+        # Batches larger than the catalog (the planner's whole horizon):
+        # every target once per frame, then a gather
+        out = np.empty(len(ids))
+        order = np.argsort(frames, kind="stable")
+        uniq, bounds = np.unique(frames[order], return_index=True)
+        bounds = np.append(bounds, len(ids))
+        for n, k in enumerate(uniq.tolist()):
+            sel = order[bounds[n]:bounds[n + 1]]
+            out[sel] = self.raster.sample(np.full(len(self.y), k), self.y, self.x)[ids[sel]]
+        return out
+
+    def screen(self, t_sec, ids):
+        """
+        Returns:
+            tuple: (mask of targets clear enough to image, priority weight
+            per target or None when not ranking)
+        """
+        cloud = self.cloud(t_sec, ids)
+        return cloud <= self.max_cloud, (1.0 - cloud if self.rank else None)
+
+
+def open_weather(scenario, catalog):
+    """
+    The CloudCover for a scenario's 'weather_model', or None for
+    'clear_only' (every visible target is imageable).
+
+    Scenario keys: 'cloud_raster' (.npy path), 'cloud_raster_start' (time
+    of frame 0, default the scenario start), 'cloud_frame_minutes',
+    'cloud_lat_range', 'cloud_lon_range', 'cloud_interpolation' (bilinear
+    or nearest), 'max_cloud_fraction' and 'cloud_mode' (skip, or rank to
+    also prefer clearer targets).
+    """
+    model = scenario.get('weather_model') or 'clear_only'
+    if model not in WEATHER_MODELS:
+        raise ValueError(f"Unknown weather_model '{model}'; choose from {list(WEATHER_MODELS)}")
+    if model == 'clear_only':
+        return None
+    path = scenario.get('cloud_raster')
+    if not path or not os.path.exists(path):
+        raise ValueError(f"weather_model 'cloud_raster' needs an existing 'cloud_raster' file, got {path!r}")
+    mode = scenario.get('cloud_mode') or 'skip'
+    if mode not in ('skip', 'rank'):
+        raise ValueError(f"Unknown cloud_mode '{mode}'; use skip or rank")
+    start = scenario.get('cloud_raster_start') or scenario['start_time']
+    raster = CloudRaster(path, epoch_seconds(parse_start_time(start)),
+                         (scenario.get('cloud_frame_minutes') or DEFAULT_FRAME_MINUTES) * 60,
+                         scenario.get('cloud_lat_range') or (-90.0, 90.0),
+                         scenario.get('cloud_lon_range') or (-180.0, 180.0),
+                         scenario.get('cloud_interpolation') or 'bilinear')
+    max_cloud = scenario.get('max_cloud_fraction')
+    return CloudCover(raster, catalog, DEFAULT_MAX_CLOUD if max_cloud is None else max_cloud, mode == 'rank')
+
+
+def raster_fingerprint(scenario):
+    """Size and modification time of a scenario's cloud raster, for cache keys (None without one)."""
+    if (scenario.get('weather_model') or 'clear_only') == 'clear_only' or not scenario.get('cloud_raster'):
+        return None
+    try:
+        st = os.stat(scenario['cloud_raster'])
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
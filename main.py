@@ -1,34 +1,134 @@
 import argparse
 import os
-from core.scheduler import run_simulation
-from utils.config_loader import load_configs
+from utils.config_loader import load_scenario
 
-def main():
+# Scenario-file settings (see utils/config_loader.py) and the flags that
+# override them; a flag left unset keeps the file's value
+SETTING_FLAGS = (
+    ("stepping", "stepping"),
+    ("energy_integration", "energy_integration"),
+    ("lookahead", "lookahead"),
+    ("scheduler_mode", "scheduler_mode"),
+    ("contact_plan", "contact_plan"),
+    ("result_cache", "result_cache"),
+    ("output_format", "output_format"),
+    ("workers", "workers"),
+    ("profile", "profile"),
+    ("checkpoint_path", "checkpoint"),
+    ("checkpoint_every_minutes", "checkpoint_every"),
+    ("trace", "trace"),
+    ("trace_sample", "trace_sample"),
+)
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Constellation Scheduler")
-    parser.add_argument('--targets', default='targets.yaml', help='Path to targets YAML file')
+    parser.add_argument('--targets', default='targets.yaml',
+                        help='Path to the target catalog (YAML, CSV, .npz or Parquet)')
+    parser.add_argument('--no-catalog-cache', action='store_true',
+                        help='Do not keep a compiled .npz copy next to a YAML/CSV target catalog')
     parser.add_argument('--scenario', default='scenario.yaml', help='Path to scenario YAML file')
-    args = parser.parse_args()
-    print(f"Using scenario file: {args.scenario}")
-    # Load unified configuration
-    start_time, duration, timestep, satellites, ground_stations, targets = load_configs(
-        scenario_path=args.scenario,
-        targets_path=args.targets
-    )
-    print("[DEBUG] Sample target:", targets[0])
-    # Build scenario dict
+    parser.add_argument('--stepping', choices=['fixed', 'adaptive'], default=None,
+                        help='Uniform timesteps, or jump between state-change events')
+    parser.add_argument('--energy-integration', choices=['step', 'exact'], default=None,
+                        help='Charge per whole step, or integrate exactly over eclipse intervals')
+    parser.add_argument('--lookahead', choices=['oracle', 'heuristic'], default=None,
+                        help='Battery check against the predicted timeline, or a fixed 10-minute window')
+    parser.add_argument('--scheduler-mode', choices=['greedy', 'planner'], default=None,
+                        help='Pick targets step by step, or plan all imaging over the horizon first')
+    parser.add_argument('--contact-plan', action='store_true', default=None,
+                        help='Allocate ground-station antennas and bandwidth between satellites in view')
+    parser.add_argument('--output-format', default=None, metavar='FORMATS',
+                        help='Comma-separated output formats: csv, json, ndjson, npz, parquet '
+                             '(default: csv,json)')
+    parser.add_argument('--propagation-cache', default=None, metavar='DIR',
+                        help='Reuse propagated satellite states cached under DIR')
+    parser.add_argument('--result-cache', default=None, metavar='DIR',
+                        help='Reuse the stored result of an identical earlier run cached under DIR')
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help='Processes for the per-satellite geometry phase (0 = all cores)')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='Time each simulation phase; prints a table and writes <log>_profile.json')
+    parser.add_argument('--output-steps', action='store_true',
+                        help='With adaptive stepping, still write one row per timestep')
+    parser.add_argument('--checkpoint', default=None, metavar='PATH',
+                        help='Save the simulation state to PATH at the end (and with --checkpoint-every)')
+    parser.add_argument('--checkpoint-every', type=float, default=None, metavar='MINUTES',
+                        help='Also save the checkpoint every MINUTES of simulated time')
+    parser.add_argument('--resume', default=None, metavar='PATH',
+                        help='Continue from a checkpoint, appending to its log; the scenario may '
+                             'extend the horizon or add satellites and targets')
+    parser.add_argument('--rolling-horizon', type=float, default=None, metavar='MINUTES',
+                        help='Simulate in windows of MINUTES, each resumed from the previous one')
+    parser.add_argument('--overlap', type=float, default=None, metavar='MINUTES',
+                        help='Lookahead past each rolling window (default: the oracle horizon)')
+    parser.add_argument('--trace', choices=['rejections', 'decisions', 'candidates'], default=None,
+                        help='Record scheduler decisions and rejection reasons to <log>_trace.npz')
+    parser.add_argument('--trace-sample', type=float, default=None, metavar='FRACTION',
+                        help='Trace only this fraction of satellite steps (default: all)')
+    parser.add_argument('--cloud-raster', default=None, metavar='NPY',
+                        help='Cloud-fraction cube [frames x lat x lon] (.npy); turns on the cloud_raster weather model')
+    parser.add_argument('--cloud-mode', choices=['skip', 'rank'], default=None,
+                        help='Skip targets above max_cloud_fraction, or also prefer clearer targets')
+    return parser.parse_args(argv)
+
+def build_scenario(args, config):
+    """
+    The scenario dict to run: settings from the scenario file
+    (load_scenario()), overridden by the command-line flags given.
+    """
     scenario = {
-        "start_time": start_time,
-        "duration_minutes": duration.total_seconds() / 60,
-        "timestep_sec": timestep,
-        "satellites": satellites,
-        "ground_stations": ground_stations,
+        "start_time": config["start_time"],
+        "duration_minutes": config["duration_minutes"],
+        "timestep_sec": config["timestep_sec"],
+        "satellites": config["satellites"],
+        "ground_stations": config["ground_stations"],
     }
+    for key, flag in SETTING_FLAGS:
+        value = getattr(args, flag)
+        value = config.get(key) if value is None else value
+        if value is not None:
+            scenario[key] = value
+    if args.propagation_cache:
+        scenario["propagation_cache"] = args.propagation_cache
+    if args.output_steps:
+        scenario["output_steps"] = True
+    if args.resume:
+        scenario["resume_from"] = args.resume
+    if args.cloud_raster or config["weather_model"] != "clear_only":
+        for key in ("weather_model", "cloud_raster", "cloud_raster_start", "cloud_frame_minutes",
+                    "cloud_lat_range", "cloud_lon_range", "cloud_interpolation", "max_cloud_fraction",
+                    "cloud_mode"):
+            scenario[key] = config[key]
+    if args.cloud_raster:
+        scenario["weather_model"] = "cloud_raster"
+        scenario["cloud_raster"] = args.cloud_raster
+    if args.cloud_mode:
+        scenario["cloud_mode"] = args.cloud_mode
+    return scenario
+
+def main():
+    args = parse_args()
+    print(f"Using scenario file: {args.scenario}")
+    scenario = build_scenario(args, load_scenario(args.scenario))
+
+    # Deferred so argument errors and --help skip the skyfield / numpy import
+    from core.scheduler import run_simulation
+    from core.targets import TargetCatalog
+
+    # Columnar catalog straight from the file, no per-target dicts
+    targets = TargetCatalog.from_file(args.targets, cache=not args.no_catalog_cache)
+    print(f"Loaded {len(targets)} targets from {args.targets}")
 
     os.makedirs("outputs", exist_ok=True)
     output_path = "outputs/simulation_log.csv"
 
     print("▶ Starting simulation...")
-    run_simulation(scenario, targets, output_path)
+    if args.rolling_horizon:
+        from core.rolling import run_rolling_horizon
+        run_rolling_horizon(scenario, targets, output_path, args.rolling_horizon, args.overlap,
+                            scenario.get("checkpoint_path"))
+    else:
+        run_simulation(scenario, targets, output_path)
     print(f"✅ Simulation complete. Log written to {output_path}")
 
 if __name__ == "__main__":
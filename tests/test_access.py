@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timezone
+import numpy as np
+from skyfield.api import load, EarthSatellite
+from skyfield.framelib import itrs
+
+from core.access import compute_access, AccessGeometry, TARGET, GROUND_STATION
+from core.visibility import Geometry, build_time_grid, site_positions, elevation_matrix
+
+ISS_TLE = (
+    "1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+    "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154",
+)
+
+def test_access_windows_match_sampled_grid():
+    ts = load.timescale()
+    sat = EarthSatellite(ISS_TLE[0], ISS_TLE[1], "ISS", ts)
+    targets = [{"name": "Shanghai", "lat": 31.22, "lon": 121.46},
+               {"name": "Melbourne", "lat": -37.81, "lon": 144.96}]
+    stations = [{"name": "GS", "lat": 31.2304, "lon": 121.4737, "alt_m": 10}]
+
+    steps, dt = 24 * 60 * 6, 10
+    times = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), dt, steps)
+    t1 = ts.tt_jd(times.tt[0] + steps * dt / 86400.0)
+    access = compute_access([sat], targets, stations, times[0], t1, 10)
+    print("📡 Windows found:", len(access))
+    assert len(access) > 0
+
+    sat_itrs = sat.at(times).frame_xyz(itrs).km.T
+    pos, up = site_positions(targets)
+    visible = elevation_matrix(sat_itrs, pos, up) > 10
+
+    for step in range(0, steps, 7):
+        expected = np.flatnonzero(visible[step])
+        got = access.visible_sites(0, TARGET, step * dt)
+        assert list(got) == list(expected), step
+
+    for w in access.windows_for(0, GROUND_STATION):
+        assert w["rise_sec"] <= w["culminate_sec"] <= w["set_sec"]
+        assert w["max_elev_deg"] > 10
+
+def test_access_window_and_extend():
+    ts = load.timescale()
+    sat = EarthSatellite(ISS_TLE[0], ISS_TLE[1], "ISS", ts)
+    targets = [{"name": "Shanghai", "lat": 31.22, "lon": 121.46},
+               {"name": "Melbourne", "lat": -37.81, "lon": 144.96}]
+    steps, dt = 24 * 60, 60
+    times = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), dt, steps)
+
+    def table(lo, hi):
+        return compute_access([sat], targets, [], ts.tt_jd(times.tt[0] + lo * dt / 86400.0),
+                              ts.tt_jd(times.tt[0] + hi * dt / 86400.0), 10)
+
+    whole = table(0, steps)
+    # Split in the middle of a pass so extend() has to join it back
+    first = whole.windows_for(0)[1]
+    split = int((first["rise_sec"] + first["set_sec"]) / 2 // dt)
+    joined = table(0, split).extend(table(split, steps))
+    print(f"🔗 Windows: {len(whole)} whole, {len(joined)} joined at step {split}")
+    assert len(joined) == len(whole) and joined.duration_sec == whole.duration_sec
+
+    part = whole.window(split * dt, steps * dt)
+    assert part.duration_sec == (steps - split) * dt
+    for step in range(steps):
+        assert list(joined.visible_sites(0, TARGET, step * dt)) == list(whole.visible_sites(0, TARGET, step * dt))
+        if step >= split:
+            assert list(part.visible_sites(0, TARGET, (step - split) * dt)) == \
+                list(whole.visible_sites(0, TARGET, step * dt))
+
+    # Windows hold for the 10 deg mask they were found for, and only that one
+    assert joined.min_elev_deg == part.min_elev_deg == 10
+    geometry = AccessGeometry(Geometry(times, sat.at(times).position.km.T[None], sat.at(times).frame_xyz(itrs).km.T[None],
+                                       np.ones((1, steps), dtype=bool), None, None), whole, dt)
+    assert len(geometry.visibility_pairs(0, 10)[0]) > 0
+    for lookup in (lambda: geometry.visibility_pairs(0, 20), lambda: geometry.visible_targets(0, 0, 5),
+                   lambda: whole.extend(compute_access([sat], targets, [], times[0], times[10], 20))):
+        try:
+            lookup()
+            assert False, "a different mask should be refused"
+        except ValueError as e:
+            print("🚫", e)
+
+if __name__ == "__main__":
+    test_access_windows_match_sampled_grid()
+    test_access_window_and_extend()
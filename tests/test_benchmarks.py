@@ -0,0 +1,45 @@
+import sys
+import os
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sgp4.api import Satrec
+from benchmarks.generate import generate_scenario, generate_targets, walker_delta, _checksum
+from benchmarks.run_benchmarks import compare
+
+EPOCH = datetime(2025, 7, 17, tzinfo=timezone.utc)
+
+def test_walker_delta_tles():
+    sats = walker_delta(12, 3, 1, 53.0, 550.0, EPOCH)
+    assert len(sats) == 12 and len({s["name"] for s in sats}) == 12
+    raans = set()
+    for s in sats:
+        line1, line2 = s["tle"]
+        assert len(line1) == len(line2) == 69
+        assert int(line1[-1]) == _checksum(line1) and int(line2[-1]) == _checksum(line2)
+        rec = Satrec.twoline2rv(line1, line2)
+        err, pos, _ = rec.sgp4(rec.jdsatepoch, rec.jdsatepochF)
+        assert err == 0
+        assert abs(np.linalg.norm(pos) - 6928.0) < 30.0
+        raans.add(round(np.degrees(rec.nodeo), 3))
+    print("🛰️ Plane RAANs:", sorted(raans))
+    assert sorted(raans) == [0.0, 120.0, 240.0]
+
+    scenario = generate_scenario(10, 3)
+    assert len(scenario["satellites"]) == 10 and scenario["duration_minutes"] == 180
+
+def test_targets_and_compare():
+    for layout in ("random", "grid"):
+        cols = generate_targets(500, layout, seed=1)
+        assert len(cols["name"]) == 500 and np.abs(cols["lat"]).max() <= 70.0
+    assert np.array_equal(generate_targets(50, seed=3)["lat"], generate_targets(50, seed=3)["lat"])
+
+    old = {"cases": [{"case": "a", "wall_seconds": 1.0}, {"case": "b", "wall_seconds": 2.0}]}
+    new = {"cases": [{"case": "a", "wall_seconds": 1.5}, {"case": "b", "wall_seconds": 2.1}, {"case": "c", "wall_seconds": 1.0}]}
+    rows = compare(new, old, threshold=0.1)
+    assert [(r[0], r[4]) for r in rows] == [("a", True), ("b", False)]
+
+if __name__ == "__main__":
+    test_walker_delta_tles()
+    test_targets_and_compare()
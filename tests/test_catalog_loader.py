@@ -0,0 +1,74 @@
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import yaml
+from core.targets import TargetCatalog
+from utils.catalog_loader import load_target_columns, cache_path
+from utils.config_loader import normalize_targets
+
+RAW = [
+    {"name": "Shanghai", "lat": 31.2, "lon": 121.5, "priority": 3, "revisit_hours": 6},
+    {"name": "São Paulo, BR", "lat": -23.5, "lon": -46.6},
+    {"name": "Kinshasa", "lat": -4.3, "lon": 15.3, "priority": 2, "image_size_mb": 80},
+]
+
+def _same(a, b):
+    assert list(a.name) == list(b.name)
+    for col in ("lat", "lon", "alt_m", "priority", "revisit_seconds", "image_size_mb", "image_energy_wh"):
+        assert np.array_equal(getattr(a, col), getattr(b, col)), col
+
+def test_formats_match_dict_loader():
+    expected = TargetCatalog.from_dicts(normalize_targets(RAW))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "targets.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump({"targets": RAW}, f, allow_unicode=True)
+        _same(TargetCatalog.from_file(path), expected)
+        assert os.path.exists(cache_path(path))
+        _same(TargetCatalog.from_file(path), expected)  # from the compiled copy
+
+        csv_path = os.path.join(tmp, "targets.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("name,lat,lon,priority,revisit_hours,image_size_mb\n")
+            f.write('Shanghai,31.2,121.5,3,6,\n"São Paulo, BR",-23.5,-46.6,,,\nKinshasa,-4.3,15.3,2,,80\n')
+        _same(TargetCatalog.from_file(csv_path, cache=False), expected)
+        assert not os.path.exists(cache_path(csv_path))
+
+        npz_path = os.path.join(tmp, "targets.npz")
+        np.savez(npz_path, **load_target_columns(path))
+        _same(TargetCatalog.from_file(npz_path), expected)
+        # Relative to the scenario file, not the working directory
+        _same(TargetCatalog.from_configs(os.path.join(tmp, "scenario.yaml"), "targets.npz"), expected)
+    print("📚 YAML, CSV and .npz catalogs load identically")
+
+def test_cache_invalidated_on_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "targets.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(RAW, f)
+        assert len(load_target_columns(path)["name"]) == 3
+        with open(path, "w") as f:
+            yaml.safe_dump(RAW[:2], f)
+        os.utime(path, ns=(0, 0))
+        assert len(load_target_columns(path)["name"]) == 2
+
+def test_validation_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bad.yaml")
+        for bad in ([{"name": "A", "lat": 95, "lon": 0}], [{"name": "A", "lat": "north", "lon": 0}],
+                    [{"name": "A", "lon": 0}], [{"name": "A", "lat": None, "lon": 0}]):
+            with open(path, "w") as f:
+                yaml.safe_dump(bad, f)
+            try:
+                load_target_columns(path, cache=False)
+                assert False, bad
+            except ValueError as e:
+                print("🚫", e)
+
+if __name__ == "__main__":
+    test_formats_match_dict_loader()
+    test_cache_invalidated_on_change()
+    test_validation_errors()
@@ -0,0 +1,112 @@
+import sys
+import os
+import json
+from datetime import datetime, timezone
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from skyfield.api import load
+from core.checkpoint import Checkpoint, resumed_scenario
+from core.fleet import FleetState
+from core.output import OutputSinks, load_npz_columns
+from core.spatial_index import IndexedGeometry
+from core.targets import TargetCatalog
+from core.visibility import build_time_grid
+
+START = datetime(2025, 7, 15, tzinfo=timezone.utc)
+SATS = [{"name": n, "battery_wh": 100.0, "charge_rate_w": 10.0, "imaging_power_w": 5.0,
+         "downlink_power_w": 4.0, "idle_power_w": 1.0, "storage_capacity_mb": 500.0,
+         "downlink_bandwidth_mbps": 10.0} for n in ("A", "B")]
+
+def _row(k):
+    return {"timestamp": f"2025-07-15T00:{k:02d}:00", "satellite": "A", "action": "idle",
+            "in_sunlight": True, "over_target": False, "over_ground": False,
+            "energy_wh": 50.0 + k, "battery_pct": 50.0, "data_mb": 0.0, "storage_pct": 0.0}
+
+def test_sinks_resume_from_offsets(tmp_path):
+    formats = "csv,json,ndjson,npz"
+    with OutputSinks(str(tmp_path / "full.csv"), formats) as sinks:
+        for k in range(7):
+            sinks.write(_row(k))
+
+    # Interrupted after row 6, resumed from the offsets saved after row 4
+    path = str(tmp_path / "part.csv")
+    with OutputSinks(path, formats) as sinks:
+        for k in range(4):
+            sinks.write(_row(k))
+        offsets = sinks.checkpoint()
+        sinks.write(_row(99))
+    print("📍 Offsets:", offsets)
+    with OutputSinks(path, formats, resume=json.loads(json.dumps(offsets))) as sinks:
+        for k in range(4, 7):
+            sinks.write(_row(k))
+
+    for ext in ("csv", "json", "ndjson"):
+        assert (tmp_path / f"part.{ext}").read_text() == (tmp_path / f"full.{ext}").read_text(), ext
+    a, b = load_npz_columns(str(tmp_path / "full.npz")), load_npz_columns(str(tmp_path / "part.npz"))
+    assert all(np.array_equal(a[k], b[k]) for k in a)
+
+def test_checkpoint_roundtrip_by_name(tmp_path):
+    fleet = FleetState.from_configs(SATS)
+    fleet.energy_wh[:] = [42.0, 17.5]
+    fleet.att_vec[1] = [0.0, 0.0, 1.0]
+    catalog = TargetCatalog.from_dicts([{"name": f"T{j}", "lat": 0.0, "lon": float(j)} for j in range(3)])
+    catalog.last_imaged[:] = [100.0, -np.inf, 300.0]
+    t = datetime(2025, 7, 15, 1, 30, tzinfo=timezone.utc)
+    state = Checkpoint.capture(t, 60, ["A", "B"], fleet, catalog, {"images": 2}, "out.csv", {"csv": 123},
+                               np.array([True, False]))
+    state.save(str(tmp_path / "ck.npz"))
+    state = Checkpoint.load(str(tmp_path / "ck.npz"))
+    assert state.time == t and state.outputs == {"csv": 123} and state.summary == {"images": 2}
+
+    # Reordered fleet plus a new satellite; catalog with a new target, one dropped
+    fresh = FleetState.from_configs([dict(SATS[0], name="C")] + SATS[::-1])
+    targets = TargetCatalog.from_dicts([{"name": n, "lat": 0.0, "lon": 0.0} for n in ("T2", "NEW", "T0")])
+    assert state.restore(fresh, ["C", "B", "A"], targets) == (2, 2)
+    assert fresh.energy_wh.tolist() == [100.0, 17.5, 42.0]
+    assert fresh.att_vec[1].tolist() == [0.0, 0.0, 1.0] and np.isnan(fresh.att_vec[2]).all()
+    assert targets.last_imaged.tolist() == [300.0, -np.inf, 100.0]
+    print("💾 Restored energy:", fresh.energy_wh)
+
+    # Resuming a longer horizon runs only what is left
+    scenario = {"start_time": "2025-07-15T00:00:00Z", "duration_minutes": 180, "timestep_sec": 60}
+    rest, done = resumed_scenario(scenario, state)
+    assert done == 90 and int(rest["duration_minutes"] * 60 / 60) == 90 and rest["start_time"] == t
+    for bad in (dict(scenario, timestep_sec=30), dict(scenario, duration_minutes=60),
+                dict(scenario, start_time="2025-07-15T00:00:10Z")):
+        try:
+            resumed_scenario(bad, state)
+            assert False, bad
+        except ValueError:
+            pass
+
+def test_geometry_window_and_extend():
+    ts = load.timescale()
+    times = build_time_grid(ts, START, 60, 6)
+    rng = np.random.default_rng(0)
+    vis = []
+    for _ in range(2):
+        counts = rng.integers(0, 3, 6)
+        ptr = np.concatenate(([0], np.cumsum(counts)))
+        vis.append((ptr, rng.integers(0, 9, ptr[-1]), rng.uniform(10, 90, ptr[-1])))
+    geometry = IndexedGeometry(times, rng.normal(size=(2, 6, 3)), rng.normal(size=(2, 6, 3)),
+                               rng.random((2, 6)) > 0.5, vis, rng.uniform(-90, 90, (2, 6, 1)), 10.0)
+
+    joined = geometry.window(0, 2).extend(geometry.window(2, 6))
+    tail = geometry.window(3, 6)
+    assert joined.steps == 6 and tail.steps == 3
+    assert np.allclose(joined.times.tt, times.tt, rtol=0, atol=1e-12)
+    assert np.array_equal(joined.sat_itrs_km, geometry.sat_itrs_km)
+    for i in range(2):
+        for step in range(6):
+            assert np.array_equal(joined.visible_targets(i, step, 20), geometry.visible_targets(i, step, 20))
+        for step in range(3):
+            assert np.array_equal(tail.visible_targets(i, step, 10), geometry.visible_targets(i, step + 3, 10))
+        assert np.array_equal(tail.active_steps(i, 10), geometry.active_steps(i, 10)[3:])
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_sinks_resume_from_offsets(pathlib.Path(tmp))
+        test_checkpoint_roundtrip_by_name(pathlib.Path(tmp))
+    test_geometry_window_and_extend()
@@ -0,0 +1,53 @@
+import sys
+import os
+import math
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.contacts import CONTACT_DTYPE, ContactPlan, allocate_contacts
+from core.data_model import DataModel
+from core.visibility import Geometry
+
+def _windows(rows):
+    w = np.array([(s, st, a, b, 0.0) for s, st, a, b in rows], dtype=CONTACT_DTYPE)
+    return w[np.lexsort((w["station"], w["sat"], w["start"]))]
+
+def test_station_contacts_from_elevations():
+    gs_elev = np.full((1, 10, 2), -5.0)
+    gs_elev[0, 2:5, 0] = 20.0
+    gs_elev[0, 7:10, 0] = 20.0
+    gs_elev[0, 0:3, 1] = 20.0
+    geometry = Geometry(None, None, None, np.zeros((1, 10), dtype=bool), None, gs_elev)
+    station, start, end = geometry.station_contacts(0, 10)
+    assert list(zip(station, start, end)) == [(0, 2, 5), (0, 7, 10), (1, 0, 3)]
+
+def test_antennas_shared_between_satellites():
+    # Three satellites over station 0 at once, then one of them also sees station 1
+    windows = _windows([(0, 0, 0, 10), (1, 0, 2, 6), (2, 0, 4, 12), (1, 1, 6, 9)])
+    contacts = allocate_contacts(windows, [1, 1], [math.inf, math.inf], [10.0, 10.0, 10.0])
+    got = contacts[["sat", "station", "start", "end"]].tolist()
+    print("📡 One antenna:", got)
+    # Satellite 0 keeps the antenna for its pass; 2 gets it once 0 sets, 1 moves to station 1
+    assert got == [(0, 0, 0, 10), (1, 1, 6, 9), (2, 0, 10, 12)]
+
+    # Two antennas sharing 12 Mbps: rates split while both are in use
+    contacts = allocate_contacts(windows, [2, 1], [12.0, math.inf], [10.0, 10.0, 10.0])
+    plan = ContactPlan(windows, contacts, 3, 12)
+    assert plan.rate(0, 0) == 10.0 and plan.rate(0, 3) == 6.0 and plan.rate(1, 3) == 6.0
+    assert plan.rate(2, 3) == 0.0 and plan.rate(2, 6) == 6.0 and plan.rate(1, 7) == 10.0
+    # No satellite ever holds two antennas, no station serves more than it has
+    for step in range(12):
+        live = contacts[(contacts["start"] <= step) & (contacts["end"] > step)]
+        assert len(np.unique(live["sat"])) == len(live)
+        assert (np.bincount(live["station"], minlength=2) <= [2, 1]).all()
+    print("📊 Contact stats:", plan.stats)
+
+def test_downlink_at_allocated_rate():
+    model = DataModel(capacity_mb=500, downlink_rate_mbps=80, initial_mb=100)
+    assert model.downlink(1, rate_mbps=8) == 60.0
+    assert model.downlink(1) == 40.0
+
+if __name__ == "__main__":
+    test_station_contacts_from_elevations()
+    test_antennas_shared_between_satellites()
+    test_downlink_at_allocated_rate()
@@ -45,5 +45,24 @@ def test_energy_model():
 
     print(f"🔋 Final SOC: {model.get_soc():.2f}%")
 
+def test_step_n_matches_repeated_steps():
+    cases = [
+        (True, 'idle', 1, 500),      # sunlit, saturates at capacity
+        (False, 'idle', 1, 500),     # dark, drains to zero
+        (True, 'image', 0.5, 40),    # sunlit but net discharge
+        (True, 'idle', 5, 1),
+    ]
+    for in_sunlight, action, dt, n in cases:
+        kwargs = dict(capacity_wh=100.0, initial_wh=50.0, charge_rate_w=20.0,
+                      imaging_power_w=25.0, downlink_power_w=10.0, idle_power_w=2.0)
+        stepped = EnergyModel(**kwargs)
+        for _ in range(n):
+            stepped.step(in_sunlight, action, dt)
+        closed = EnergyModel(**kwargs)
+        closed.step_n(in_sunlight, action, dt, n)
+        print(f"⏩ {n} x {action} (sunlit={in_sunlight}): {stepped.energy:.4f} Wh vs {closed.energy:.4f} Wh")
+        assert abs(stepped.energy - closed.energy) < 1e-9
+
 if __name__ == "__main__":
     test_energy_model()
+    test_step_n_matches_repeated_steps()
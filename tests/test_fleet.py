@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.fleet import FleetState, ACTION_CODES, ACTION_NONE
+from core.energy_model import EnergyModel
+from core.data_model import DataModel
+
+def _configs(n, rng):
+    return [{
+        "battery_wh": float(rng.choice([100.0, 500.0])),
+        "initial_battery_wh": float(rng.uniform(0, 500)),
+        "charge_rate_w": float(rng.uniform(0, 300)),
+        "imaging_power_w": float(rng.uniform(0, 60)),
+        "downlink_power_w": float(rng.uniform(0, 60)),
+        "idle_power_w": float(rng.uniform(0, 10)),
+        "storage_capacity_mb": 500.0,
+        "initial_storage_mb": float(rng.uniform(0, 500)),
+        "downlink_bandwidth_mbps": float(rng.uniform(1, 50)),
+    } for _ in range(n)]
+
+def test_fleet_step_matches_per_satellite_models():
+    rng = np.random.default_rng(3)
+    cfgs = _configs(50, rng)
+    fleet = FleetState.from_configs(cfgs)
+    models = [EnergyModel(c["battery_wh"], c["initial_battery_wh"], c["charge_rate_w"],
+                          c["imaging_power_w"], c["downlink_power_w"], c["idle_power_w"]) for c in cfgs]
+    data = [DataModel(c["storage_capacity_mb"], c["downlink_bandwidth_mbps"], c["initial_storage_mb"]) for c in cfgs]
+
+    names = ["idle", "image", "downlink"]
+    for _ in range(100):
+        sunlit = rng.random(50) < 0.6
+        acts = [names[k] for k in rng.integers(0, 3, 50)]
+        codes = np.array([ACTION_CODES[a] for a in acts])
+        codes[rng.random(50) < 0.1] = ACTION_NONE
+        mask = codes != ACTION_NONE
+        fleet.step(sunlit, codes, 1.0, mask=mask)
+        for k in np.flatnonzero(mask):
+            models[k].step(bool(sunlit[k]), acts[k], 1.0)
+
+        stored = fleet.store(50.0, mask=~mask)
+        for k in np.flatnonzero(~mask):
+            assert data[k].store_image(50.0) == stored[k]
+        out = fleet.downlink(0.5, mask=mask)
+        for k in np.flatnonzero(mask):
+            assert data[k].downlink(0.5) == out[k]
+
+    assert np.array_equal(fleet.energy_wh, [m.energy for m in models])
+    assert np.array_equal(fleet.stored_mb, [d.stored_data for d in data])
+    print("🔋 Fleet energy after 100 steps:", np.round(fleet.energy_wh[:5], 2))
+
+def test_views_share_fleet_state():
+    fleet = FleetState.from_configs(_configs(3, np.random.default_rng(0)))
+    energy = fleet.energy_model(1)
+    energy.step(False, "image", 10)
+    assert energy.energy == fleet.energy_wh[1]
+    fleet.stored_mb[2] = 123.0
+    assert fleet.data_model(2).stored_data == 123.0
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timezone
+import numpy as np
+from skyfield.api import load, EarthSatellite
+from skyfield.framelib import itrs
+
+from core.propagation import propagate_fleet, check_propagation
+from core.visibility import build_time_grid, site_positions, elevation_matrix
+
+TLES = [
+    ("1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+     "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154"),
+    ("1 00005U 58002B   20058.83667824  .00000023  00000-0  28098-4 0  4753",
+     "2 00005  34.2682 348.7242 1859667 331.7664  19.3264 10.82419157413667"),
+]
+
+def test_fleet_propagation_matches_earth_satellite():
+    ts = load.timescale()
+    sats = [EarthSatellite(l1, l2, f"S{i}", ts) for i, (l1, l2) in enumerate(TLES)]
+    times = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), 60, 600)
+
+    gcrs, vel, itrs_km, sunlit = propagate_fleet([s.model for s in sats], times, None)
+    print("🛰️ Fleet position array:", itrs_km.shape)
+    assert itrs_km.shape == (len(sats), 600, 3)
+    assert sunlit is None
+
+    for k, sat in enumerate(sats):
+        geo = sat.at(times)
+        assert np.allclose(gcrs[k], geo.position.km.T, atol=1e-8)
+        assert np.allclose(vel[k], geo.velocity.km_per_s.T, atol=1e-10)
+        assert np.allclose(itrs_km[k], geo.frame_xyz(itrs).km.T, atol=1e-8)
+
+def test_fleet_propagation_masks_decayed_orbit():
+    ts = load.timescale()
+    # The first TLE with a drag term high enough to decay within days
+    healthy = EarthSatellite(*TLES[0], "S0", ts)
+    decaying = EarthSatellite(TLES[0][0].replace("29621-4", "99999-1"), TLES[0][1], "X", ts)
+    times = build_time_grid(ts, datetime(2020, 9, 8, tzinfo=timezone.utc), 3600, 24 * 60)
+    gcrs, vel, itrs_km, _ = propagate_fleet([healthy.model, decaying.model], times, None)
+
+    # The healthy satellite propagates as on its own; the decayed one is
+    # NaN from its first failed step on
+    assert np.allclose(gcrs[0], healthy.at(times).position.km.T, atol=1e-8)
+    failed = check_propagation([healthy, decaying], gcrs)
+    first = int(np.argmax(failed[1]))
+    print(f"🪂 Decayed satellite masked from step {first} of {len(times)}")
+    assert not failed[0].any() and 0 < first and failed[1, first:].all() and not failed[1, :first].any()
+    assert np.isnan(vel[1, first:]).all() and np.isfinite(itrs_km[1, :first]).all()
+
+    # Failed steps see no site at any mask
+    pos, up = site_positions([{"lat": 0.0, "lon": lon} for lon in range(-180, 180, 10)])
+    assert not (elevation_matrix(itrs_km[1, first:], pos, up) > -90.0).any()
+
+    try:
+        check_propagation([decaying], gcrs[1:])
+        assert False, "a fleet where every satellite fails should be refused"
+    except ValueError as e:
+        print("💥", e)
+
+if __name__ == "__main__":
+    test_fleet_propagation_matches_earth_satellite()
+    test_fleet_propagation_masks_decayed_orbit()
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import time
+from constellation_schedular.jobs import JobQueue, QueueFull, DONE, FAILED
+
+def test_job_queue_streams_rows_and_pushes_back(tmp_path):
+    release = threading.Event()
+
+    def fake_run(scenario, targets, output_path, extra_sinks=(), progress=None):
+        if scenario.get("fail"):
+            raise ValueError("bad scenario")
+        release.wait(5)
+        for step in range(scenario["steps"]):
+            for sink in extra_sinks:
+                sink.write({"step": step})
+            progress(step + 1, scenario["steps"])
+        return {"images": scenario["steps"]}
+
+    queue = JobQueue(workers=1, max_pending=2, output_root=str(tmp_path), run=fake_run)
+    first = queue.submit({"steps": 50}, [])
+    second = queue.submit({"fail": True}, [])
+    try:
+        queue.submit({"steps": 1}, [])
+        assert False, "third job should be refused"
+    except QueueFull as e:
+        print("🚦 Refused:", e)
+
+    # A reader following the first job sees every row, in order
+    release.set()
+    rows = list(first.rows.follow())
+    assert [r["step"] for r in rows] == list(range(50))
+    assert [r["step"] for r in first.rows.follow(45)] == list(range(45, 50))
+    # Read back from the job's spool file, not kept in memory
+    assert os.path.exists(os.path.join(first.output_dir, "rows.ndjson")) and not hasattr(first.rows, "rows")
+
+    queue.shutdown()
+    status = first.to_dict()
+    print("📋 Job status:", status["status"], status["progress"])
+    assert status["status"] == DONE and status["progress"] == 1.0 and status["summary"] == {"images": 50}
+    assert status["rows"] == 50
+    assert second.status == FAILED and "bad scenario" in second.error
+    assert queue.active == 0 and queue.get(first.id) is first
+
+def test_evicted_jobs_remove_their_output(tmp_path):
+    def fake_run(scenario, targets, output_path, extra_sinks=(), progress=None):
+        for sink in extra_sinks:
+            sink.write({"step": 0})
+        return {"images": 1}
+
+    queue = JobQueue(workers=1, max_pending=1, max_finished=2, output_root=str(tmp_path), run=fake_run)
+    jobs = []
+    for _ in range(5):
+        job = queue.submit({}, [])
+        jobs.append(job)
+        while queue.active:
+            time.sleep(0.01)
+    queue.shutdown()
+
+    kept = sorted(os.listdir(tmp_path))
+    print("🧹 Job directories left:", len(kept))
+    assert kept == sorted(j.id for j in jobs[-2:])
+    assert all(queue.get(j.id) is None for j in jobs[:3])
+
+if __name__ == "__main__":
+    import tempfile
+    test_job_queue_streams_rows_and_pushes_back(tempfile.mkdtemp())
+    test_evicted_jobs_remove_their_output(tempfile.mkdtemp())
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.lookahead import EnergyOracle
+
+def _brute_min(oracle, i, step, energy, spend):
+    level = oracle.energy_after(i, step, energy, spend)
+    lowest = level
+    for t in range(step + 1, oracle.window_end(i, step) + 1):
+        level = min(oracle.capacity_wh[i], level + oracle.gain_wh[i, t] - oracle.draw_wh[i, t])
+        lowest = min(lowest, level)
+    return lowest
+
+def test_oracle_matches_step_by_step_prediction():
+    rng = np.random.default_rng(7)
+    steps = 300
+    # Orbit-like sunlight: 60 steps sun, 35 steps dark
+    sun = (np.arange(steps) % 95) < 60
+    gain = np.where(sun, 4.0, 0.0)[None, :].repeat(2, axis=0)
+    draw = rng.uniform(0.2, 2.5, size=(2, steps))
+    oracle = EnergyOracle(gain, draw, capacity_wh=[100.0, 60.0], horizon_steps=120)
+
+    for _ in range(200):
+        i = int(rng.integers(2))
+        step = int(rng.integers(steps))
+        energy = float(rng.uniform(10, oracle.capacity_wh[i]))
+        spend = float(rng.uniform(0, 20))
+        assert abs(oracle.min_energy(i, step, energy, spend) - _brute_min(oracle, i, step, energy, spend)) < 1e-9
+
+    # Decisions in sunlight look ahead through the next eclipse to sunrise
+    assert oracle.window_end(0, 10) == 95
+    assert oracle.window_end(0, 70) == 95
+    print("🔮 Min energy from step 50:", round(oracle.min_energy(0, 50, 50.0, 10.0), 2))
+    assert oracle.energy_ok(0, 50, 90.0, 5.0) and not oracle.energy_ok(1, 50, 12.0, 10.0)
+
+def test_oracle_trees_cover_one_block_per_satellite():
+    rng = np.random.default_rng(3)
+    steps, horizon = 5000, 40
+    gain = np.where((np.arange(steps) % 95) < 60, 4.0, 0.0)[None, :].repeat(3, axis=0)
+    draw = rng.uniform(0.2, 2.5, size=(3, steps))
+    oracle = EnergyOracle(gain, draw, capacity_wh=[100.0, 60.0, 80.0], horizon_steps=horizon)
+    series = gain.nbytes + draw.nbytes + oracle.prefix.nbytes
+
+    # Step-major like the scheduler, then jumping around like a replan
+    queries = [(step, i) for step in range(0, steps, 7) for i in range(3)]
+    queries += [(int(rng.integers(steps)), int(rng.integers(3))) for _ in range(300)]
+    for step, i in queries:
+        energy = float(rng.uniform(10, oracle.capacity_wh[i]))
+        assert abs(oracle.min_energy(i, step, energy, 5.0) - _brute_min(oracle, i, step, energy, 5.0)) < 1e-9
+    print(f"🌳 Tree bytes: {oracle.nbytes - series}")
+    # One tree of 2 * horizon + 1 leaves (padded to 128) per satellite
+    assert 0 < oracle.nbytes - series <= 3 * 3 * 2 * 128 * 8
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import parse_args, build_scenario
+from utils.config_loader import load_scenario
+
+SCENARIO_YAML = """
+simulation:
+  start_time: "2025-07-15T00:00:00Z"
+  duration_minutes: 60
+  scheduler_mode: planner
+  stepping: adaptive
+  workers: 4
+  contact_plan: true
+  trace: decisions
+satellites:
+  - name: "A"
+"""
+
+def test_scenario_file_settings_with_flag_overrides(tmp_path):
+    path = tmp_path / "scenario.yaml"
+    path.write_text(SCENARIO_YAML)
+    config = load_scenario(str(path))
+
+    # Settings from the file reach the scenario when no flag is given
+    scenario = build_scenario(parse_args([]), config)
+    assert scenario["scheduler_mode"] == "planner"
+    assert scenario["stepping"] == "adaptive"
+    assert scenario["workers"] == 4
+    assert scenario["contact_plan"] is True
+    assert scenario["trace"] == "decisions"
+    assert scenario["lookahead"] == "oracle"
+    assert "checkpoint_path" not in scenario
+
+    # Flags win over the file
+    args = parse_args(["--scheduler-mode", "greedy", "--workers", "2", "--checkpoint", "run.ckpt"])
+    scenario = build_scenario(args, config)
+    assert scenario["scheduler_mode"] == "greedy"
+    assert scenario["workers"] == 2
+    assert scenario["checkpoint_path"] == "run.ckpt"
+    assert scenario["stepping"] == "adaptive"
+    print("✅ Scenario file settings apply, command-line flags override them")
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_scenario_file_settings_with_flag_overrides(Path(tempfile.mkdtemp()))
@@ -0,0 +1,49 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import numpy as np
+from core.output import OutputSinks, NpzSink, load_npz_columns, parse_formats, FIELDNAMES
+
+def _rows(n):
+    for k in range(n):
+        yield {
+            "timestamp": f"2025-07-17T00:{k:02d}:00+00:00", "satellite": "ISS" if k % 2 else "Sat-2",
+            "action": "idle", "in_sunlight": bool(k % 3), "over_target": False, "over_ground": k == 4,
+            "energy_wh": 500.0 - k * 0.25, "battery_pct": 50.0, "data_mb": 0.0, "storage_pct": 0.0,
+        }
+
+def test_sinks_stream_every_format(tmp_path):
+    path = str(tmp_path / "log.csv")
+    with OutputSinks(path, "csv,json,ndjson,npz") as sinks:
+        for row in _rows(25):
+            sinks.write(row)
+    print("📁 Written:", sorted(os.listdir(tmp_path)))
+
+    expected = list(_rows(25))
+    with open(tmp_path / "log.json") as f:
+        text = f.read()
+    assert text == json.dumps(expected, indent=2)
+    with open(tmp_path / "log.ndjson") as f:
+        assert [json.loads(line) for line in f] == expected
+    with open(path) as f:
+        assert f.readline().strip() == ",".join(FIELDNAMES)
+    cols = load_npz_columns(str(tmp_path / "log.npz"))
+    assert cols["energy_wh"].tolist() == [r["energy_wh"] for r in expected]
+
+def test_npz_chunks_and_empty_outputs(tmp_path):
+    sink = NpzSink(str(tmp_path / "log.npz"), chunk_rows=4)
+    for row in _rows(10):
+        sink.write(row)
+    sink.close()
+    with np.load(tmp_path / "log.npz") as npz:
+        assert len(npz.files) == 3 * len(FIELDNAMES)
+    cols = load_npz_columns(str(tmp_path / "log.npz"))
+    assert cols["over_ground"].dtype == bool and cols["over_ground"].sum() == 1
+
+    with OutputSinks(str(tmp_path / "empty.csv"), ["json"]):
+        pass
+    with open(tmp_path / "empty.json") as f:
+        assert f.read() == "[]"
+    assert parse_formats(None) == ["csv", "json"]
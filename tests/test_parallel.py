@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timezone
+import numpy as np
+from skyfield.api import load, EarthSatellite
+
+from core.parallel import parallel_fleet_geometry, resolve_workers
+from core.propagation import propagate_fleet
+from core.spatial_index import precompute_indexed_geometry
+from core.visibility import Geometry, build_time_grid, site_positions, elevation_matrix
+
+TLES = [
+    ("1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+     "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154"),
+    ("1 00005U 58002B   20058.83667824  .00000023  00000-0  28098-4 0  4753",
+     "2 00005  34.2682 348.7242 1859667 331.7664  19.3264 10.82419157413667"),
+    ("1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+     "2 25544  97.6445 149.2431 0001235 131.1758 284.5727 15.49211630243154"),
+]
+
+def test_parallel_geometry_matches_serial():
+    ts = load.timescale()
+    sats = [EarthSatellite(l1, l2, f"S{i}", ts) for i, (l1, l2) in enumerate(TLES)]
+    times = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), 60, 300)
+    rng = np.random.default_rng(5)
+    targets = [{"lat": float(a), "lon": float(b)}
+               for a, b in zip(rng.uniform(-60, 60, 400), rng.uniform(-180, 180, 400))]
+    pos, up = site_positions(targets)
+
+    out = parallel_fleet_geometry(TLES, times, None, {"target_elev": (pos, up)}, elevation_matrix, workers=2)
+    gcrs, _, itrs_km, _ = propagate_fleet([s.model for s in sats], times, None)
+    print("⚙️ Parallel target elevations:", out["target_elev"].shape)
+    assert np.array_equal(out["gcrs_km"], gcrs)
+    assert np.array_equal(out["itrs_km"], itrs_km)
+    for i in range(len(sats)):
+        # precompute_geometry() holds each satellite's states contiguously
+        serial = elevation_matrix(np.ascontiguousarray(itrs_km[i]), pos, up)
+        assert np.array_equal(out["target_elev"][i], serial)
+
+    # Spatial-index visibility fanned out per satellite shard
+    geometry = Geometry(times, gcrs, itrs_km, np.ones((3, 300), dtype=bool), None, np.zeros((3, 300, 0)))
+    serial = precompute_indexed_geometry(geometry, targets, 10.0)
+    parallel = precompute_indexed_geometry(geometry, targets, 10.0, workers=2)
+    for a, b in zip(serial.target_vis, parallel.target_vis):
+        assert all(np.array_equal(x, y) for x, y in zip(a, b))
+
+    assert resolve_workers(None) == 1 and resolve_workers(0) >= 1
+
+if __name__ == "__main__":
+    test_parallel_geometry_matches_serial()
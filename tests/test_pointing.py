@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timezone
+import numpy as np
+from skyfield.api import load, EarthSatellite
+from skyfield.framelib import itrs
+
+from core.pointing import line_of_sight, slew_angles, slew_angle_matrix, SlewModel
+from core.scheduler import vector_to_target, angle_between
+from core.visibility import build_time_grid, site_positions
+
+ISS_TLE = (
+    "1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+    "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154",
+)
+
+def test_batched_los_matches_scalar_helpers():
+    ts = load.timescale()
+    sat = EarthSatellite(ISS_TLE[0], ISS_TLE[1], "ISS", ts)
+    t = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), 60, 5)[3]
+    targets = [{"lat": 31.2, "lon": 121.5}, {"lat": -23.5, "lon": -46.6}, {"lat": 51.5, "lon": -0.1}]
+
+    pos, _ = site_positions(targets)
+    sat_itrs = sat.at(t).frame_xyz(itrs).km
+    los = line_of_sight(sat_itrs, pos) @ itrs.rotation_at(t)
+    att = vector_to_target(sat, 10.0, 10.0, t)
+    angles = slew_angles(los, att)
+
+    for k, tgt in enumerate(targets):
+        ref = vector_to_target(sat, tgt["lat"], tgt["lon"], t)
+        assert np.allclose(los[k], ref, atol=1e-9)
+        assert abs(angles[k] - angle_between(ref, att)) < 1e-6
+    print("🎯 Slew angles:", np.round(angles, 2))
+
+    matrix = slew_angle_matrix(los, np.vstack([att, [np.nan] * 3]))
+    assert np.allclose(matrix[0], angles) and not matrix[1].any()
+
+def test_slew_model_profiles():
+    model = SlewModel(max_rate_deg_s=2.0, max_accel_deg_s2=0.5)
+    # Ramp angle = rate^2 / accel = 8 deg: triangular below, trapezoidal above
+    t = model.slew_time([0.0, 2.0, 8.0, 20.0])
+    assert np.allclose(t, [0.0, 4.0, 8.0, 14.0])
+    assert list(model.reachable([2.0, 20.0], 10.0)) == [True, False]
+    assert SlewModel.from_config({}) is None
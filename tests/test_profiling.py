@@ -0,0 +1,44 @@
+import sys
+import os
+import json
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core import profiling
+from core.profiling import Profiler, timed
+
+def test_profiler_counts_and_metrics(tmp_path):
+    profiling.reset()
+    prof = Profiler()
+    for _ in range(3):
+        with prof.phase("geometry", items=10):
+            pass
+    prof.add("output", 0.5, 7)
+    with timed(None, "ignored"):
+        pass
+
+    summary = prof.summary()
+    assert summary["phases"]["geometry"]["calls"] == 3
+    assert summary["phases"]["geometry"]["items"] == 30
+    assert summary["phases"]["output"] == {"calls": 1, "seconds": 0.5, "items": 7}
+    assert "ignored" not in summary["phases"]
+    for line in prof.report():
+        print(line)
+    assert "output" in prof.report()[1]  # slowest phase first
+
+    prof.write(tmp_path / "run_profile.json")
+    assert json.loads((tmp_path / "run_profile.json").read_text())["phases"]["output"]["items"] == 7
+
+    profiling.record(prof)
+    profiling.record(prof)
+    text = profiling.prometheus_text({"constellation_jobs_active": ("gauge", "Jobs.", 2)})
+    print(text)
+    assert "constellation_profiled_runs_total 2" in text
+    assert 'constellation_phase_items_total{phase="output"} 14' in text
+    assert "# TYPE constellation_phase_seconds_total counter" in text
+    assert "constellation_jobs_active 2" in text
+    profiling.reset()
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_profiler_counts_and_metrics(pathlib.Path(tmp))
@@ -0,0 +1,33 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.propagation import PropagationCache
+
+def _arrays(n, seed):
+    rng = np.random.default_rng(seed)
+    return (rng.normal(size=(n, 3)), rng.normal(size=(n, 3)), rng.normal(size=(n, 3)), rng.random(n) > 0.5)
+
+def test_cache_roundtrip_and_lru_eviction(tmp_path):
+    entry_bytes = sum(a.nbytes for a in _arrays(1000, 0)) + 4 * 128  # + .npy headers
+    cache = PropagationCache(str(tmp_path), max_bytes=int(2.5 * entry_bytes))
+
+    cache.put("a", _arrays(1000, 1))
+    time.sleep(0.01)
+    cache.put("b", _arrays(1000, 2))
+
+    # A fresh cache object reads from disk (memory-mapped), not from the memo
+    reader = PropagationCache(str(tmp_path), max_bytes=cache.max_bytes)
+    got = reader.get("a")
+    assert isinstance(got[0], np.memmap)
+    assert np.array_equal(got[0], _arrays(1000, 1)[0])
+    print("💾 Cache hit for 'a':", reader.hits, "hits,", reader.misses, "misses")
+
+    # 'a' was just used, so adding 'c' must evict 'b'
+    time.sleep(0.01)
+    reader.put("c", _arrays(1000, 3))
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert reader.size_bytes() <= reader.max_bytes
+    assert PropagationCache(str(tmp_path)).get("b") is None
@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from skyfield.api import load
+from core import resources
+
+ISS_TLE = (
+    "1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+    "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154",
+)
+
+def test_registry_memoizes_timescale_and_satellites():
+    resources.clear()
+    ts = resources.timescale()
+    assert resources.timescale() is ts
+
+    sat = resources.satellite(ISS_TLE, "ISS")
+    assert resources.satellite(list(ISS_TLE), "ISS") is sat
+    assert resources.satellite(ISS_TLE, "ISS-2") is not sat
+    print("🛰️ Satellite memo:", resources.stats)
+    assert resources.stats == {"satellite_hits": 1, "satellite_misses": 2}
+
+    # A different timescale gets its own object
+    other = load.timescale()
+    assert resources.satellite(ISS_TLE, "ISS", other) is not sat
+
+    resources.clear()
+    assert resources.timescale() is not ts
+
+if __name__ == "__main__":
+    test_registry_memoizes_timescale_and_satellites()
@@ -0,0 +1,74 @@
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.output import FIELDNAMES, MemorySink
+from core.result_cache import ResultCache, result_key, replay_rows
+from utils.config_loader import normalize_targets
+
+SCENARIO = {
+    "start_time": "2025-07-15T00:00:00Z",
+    "duration_minutes": 10,
+    "timestep_sec": 60,
+    "min_elevation_deg": 10,
+    "satellites": [{"name": "A", "battery_wh": 100.0}],
+}
+TARGETS = normalize_targets([{"name": "T0", "lat": 0.0, "lon": 1.0, "priority": 2}])
+
+def _rows(n, tag):
+    return [{"timestamp": f"2025-07-15T00:{k:02d}:00", "satellite": tag, "action": "idle",
+             "in_sunlight": k % 2 == 0, "over_target": False, "over_ground": False,
+             "energy_wh": 100.0 - k, "battery_pct": 99.5, "data_mb": 0.0, "storage_pct": 0.0}
+            for k in range(n)]
+
+def test_key_ignores_output_settings():
+    key = result_key(SCENARIO, TARGETS)
+    same = dict(SCENARIO, duration_minutes=10.0, workers=4, output_format="npz", result_cache="/tmp/x")
+    assert result_key(same, TARGETS) == key
+    # Target defaults are filled in before hashing
+    assert result_key(SCENARIO, [{"name": "T0", "lat": 0, "lon": 1, "priority": 2}]) == key
+    assert result_key(dict(SCENARIO, min_elevation_deg=20), TARGETS) != key
+    assert result_key(SCENARIO, normalize_targets([{"name": "T0", "lat": 0.0, "lon": 1.0, "priority": 3}])) != key
+    print("🔑 Result key:", key[:12])
+
+def test_store_replay_and_evict():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(tmp, max_bytes=10 ** 9)
+        assert cache.get("a") is None
+
+        entry = cache.writer("a")
+        for row in _rows(5, "A"):
+            entry.sink.write(row)
+        entry.commit({"images": 0})
+
+        # Fresh object: read from disk, then from memory
+        cache = ResultCache(tmp, max_bytes=10 ** 9)
+        columns, summary = cache.get("a")
+        assert cache.get("a")[1] == summary == {"images": 0}
+        sink = MemorySink()
+        replay_rows(columns, sink)
+        assert sink.rows == _rows(5, "A")
+        assert [type(v) for v in sink.rows[0].values()] == [type(v) for v in _rows(1, "A")[0].values()]
+        assert list(sink.rows[0]) == FIELDNAMES
+
+        # An aborted run leaves nothing behind
+        entry = cache.writer("b")
+        entry.abort()
+        assert cache.get("b") is None
+        print("♻️ Cache stats:", cache.stats())
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+        assert cache.stats()["entries"] == 1
+
+        # Least recently used results go once the cache is over its limit
+        entry = cache.writer("c")
+        for row in _rows(5, "C"):
+            entry.sink.write(row)
+        cache.max_bytes = cache.size_bytes() * 3 // 2
+        os.utime(os.path.join(tmp, "a"), (0, 0))
+        entry.commit({"images": 1})
+        assert sorted(os.listdir(tmp)) == ["c"]
+
+if __name__ == "__main__":
+    test_key_ignores_output_settings()
+    test_store_replay_and_evict()
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.spatial_index import TargetIndex, footprint_radius_deg, subsatellite_points
+from core.visibility import site_positions, elevation_matrix
+
+def test_index_candidates_cover_all_visible_targets():
+    rng = np.random.default_rng(7)
+    n = 20000
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lons = rng.uniform(-180, 180, n)
+    targets = [{"lat": a, "lon": b} for a, b in zip(lats, lons)]
+    pos, up = site_positions(targets)
+    index = TargetIndex(lats, lons)
+
+    # Satellites at 550 km over random points, including near the pole and antimeridian
+    sub = [(0.0, 0.0), (88.5, 40.0), (-60.0, 179.5), (10.0, -179.9)] + [
+        (float(np.degrees(np.arcsin(rng.uniform(-1, 1)))), float(rng.uniform(-180, 180))) for _ in range(20)]
+    for lat, lon in sub:
+        r = 6371.0 + 550.0
+        la, lo = np.radians(lat), np.radians(lon)
+        sat = np.array([[r * np.cos(la) * np.cos(lo), r * np.cos(la) * np.sin(lo), r * np.sin(la)]])
+        s_lat, s_lon, alt = subsatellite_points(sat)
+        cand = index.query(s_lat[0], s_lon[0], footprint_radius_deg(alt[0], 10))
+        visible = np.flatnonzero(elevation_matrix(sat, pos, up)[0] > 10)
+        assert set(visible) <= set(cand), (lat, lon)
+        assert len(cand) < n / 10
+
+    print(f"🗺️ Index over {n} targets returned supersets of exact visibility for {len(sub)} footprints")
+
+if __name__ == "__main__":
+    test_index_candidates_cover_all_visible_targets()
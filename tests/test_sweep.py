@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.sweep import expand_variants, apply_variant
+
+SCENARIO = {
+    "min_elevation_deg": 10,
+    "satellites": [{"name": "A", "battery_wh": 100.0, "charge_rate_w": 10.0},
+                   {"name": "B", "battery_wh": 200.0, "charge_rate_w": 10.0}],
+}
+TARGETS = [{"name": f"T{j}", "lat": 0.0, "lon": float(j), "priority": 1} for j in range(5)]
+
+def test_variants_grid_and_draws():
+    grid = {"battery_wh": [50, 500], "min_elevation_deg": [10, 20, 30]}
+    dists = {"targets.priority": {"randint": [1, 5]}, "charge_rate_w": {"uniform": [10, 20]}}
+    variants = expand_variants(SCENARIO, TARGETS, grid, dists, samples=4, seed=1)
+    print("🧪 Variants:", len(variants))
+    assert len(variants) == 2 * 3 * 4
+    assert variants == expand_variants(SCENARIO, TARGETS, grid, dists, samples=4, seed=1)
+    assert all(len(v["targets.priority"]) == len(TARGETS) for v in variants)
+    assert all(10 <= v["charge_rate_w"] <= 20 for v in variants)
+
+    scenario, targets = apply_variant(SCENARIO, TARGETS, variants[-1])
+    assert [s["battery_wh"] for s in scenario["satellites"]] == [500, 500]
+    assert scenario["min_elevation_deg"] == 30
+    assert [t["priority"] for t in targets] == variants[-1]["targets.priority"]
+    # The base scenario and targets are left untouched
+    assert SCENARIO["satellites"][0]["battery_wh"] == 100.0 and TARGETS[0]["priority"] == 1
+
+    # Unprefixed keys must name a satellite field or scenario setting
+    assert len(expand_variants(SCENARIO, TARGETS, {"lookahead_reserve_wh": [5, 10]})) == 2
+    assert len(expand_variants(SCENARIO, TARGETS, {"scenario.my_setting": [1, 2]})) == 2
+    for bad in ({"tle": [1]}, {"targets.lat": [1.0]}, {"orbit.altitude": [1]}, {"priority": [1, 2]},
+                {"charge_rate": [1, 2]}):
+        try:
+            expand_variants(SCENARIO, TARGETS, bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    test_variants_grid_and_draws()
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.targets import TargetCatalog
+
+def _catalog():
+    return TargetCatalog.from_dicts([
+        {"name": "A", "lat": 10.0, "lon": 20.0, "priority": 1, "revisit_hours": 1},
+        {"name": "B", "lat": 11.0, "lon": 21.0, "priority": 3, "revisit_hours": 2},
+        {"name": "C", "lat": 12.0, "lon": 22.0, "priority": 3, "revisit_hours": 0.5},
+        {"name": "D", "lat": 13.0, "lon": 23.0, "priority": 2},
+    ])
+
+def test_select_best_priority_then_oldest_then_lowest_id():
+    cat = _catalog()
+    ids = np.arange(4)
+    # B and C tie on priority, neither imaged: lowest ID wins
+    assert cat.name[cat.select_best(ids)] == "B"
+    # Once B has been imaged, the never-imaged C wins the tie
+    cat.mark_imaged(1, 1000.0)
+    assert cat.name[cat.select_best(ids)] == "C"
+    cat.mark_imaged(2, 500.0)
+    assert cat.name[cat.select_best(ids)] == "C"   # imaged longer ago than B
+    assert cat.select_best(np.array([], dtype=np.int64)) is None
+    print("🎯 Best target selection OK")
+
+def test_revisit_ok_is_one_array_comparison():
+    cat = _catalog()
+    cat.mark_imaged(0, 0.0)
+    cat.mark_imaged(2, 0.0)
+    ok = cat.revisit_ok(np.arange(4), 1800.0)
+    assert list(ok) == [False, True, True, True]
+    assert cat.revisit_seconds[3] == 12 * 3600   # default revisit_hours
+    assert cat[1]["priority"] == 3
@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.fleet import FleetState
+from core.scheduler import _step_satellite
+from core.targets import TargetCatalog
+from core.trace import (TraceLog, Trace, trace_level, LEVELS, IMAGE, DOWNLINK, CANDIDATE,
+                        OK, ENERGY, STORAGE, LOOKAHEAD, SLEW)
+
+class _OneTargetGeometry:
+    """One satellite over one target for one step."""
+    sunlit = np.array([[True]])
+    sat_itrs_km = np.array([[[7000.0, 0.0, 0.0]]])
+
+    def visible_targets(self, i, step, min_elev):
+        return np.array([0])
+
+    def itrs_rotation(self, step):
+        return np.eye(3)
+
+    def over_ground(self, i, step, min_elev):
+        return False
+
+def _write(path, resume=None, steps=range(6), chunk_rows=4):
+    offset = None
+    with TraceLog(path, LEVELS["candidates"], 1.0, ["A", "B"], ["T0", "T1", "T2"], chunk_rows,
+                  resume) as log:
+        for step in steps:
+            log.record(60.0 * step, step % 2, step % 3, IMAGE, OK if step % 3 else STORAGE, 2)
+            log.record_many(60.0 * step, step % 2, np.array([0, 2]), CANDIDATE, SLEW)
+            if step == 2:
+                offset = log.checkpoint()
+        log.record(600.0, 1, -1, DOWNLINK, ENERGY)
+    return offset
+
+def test_trace_roundtrip_and_rejections(tmp_path):
+    path = str(tmp_path / "run_trace.npz")
+    _write(path)
+    trace = Trace(path)
+    assert len(trace) == 6 * 3 + 1
+    assert trace.satellites.tolist() == ["A", "B"] and trace.targets.tolist() == ["T0", "T1", "T2"]
+    assert trace.events["time"][:4].tolist() == [0.0, 0.0, 0.0, 60.0]
+
+    by_sat = trace.rejections()
+    print("🔎 By satellite:", by_sat)
+    assert by_sat == {"A": {"storage": 1, "slew": 6}, "B": {"energy": 1, "storage": 1, "slew": 6}}
+    assert trace.rejections(by="target", kind="image") == {"T0": {"storage": 2}}
+    assert trace.rejections(kind="downlink") == {"B": {"energy": 1}}
+
+    # Resumed from the chunk offset saved after step 2: same events
+    part = str(tmp_path / "part_trace.npz")
+    offset = _write(part, steps=range(4))
+    _write(part, resume=offset, steps=range(3, 6))
+    assert np.array_equal(Trace(part).events, trace.events)
+
+def test_levels_and_sampling(tmp_path):
+    assert trace_level(None) == trace_level(False) == trace_level("off") == 0
+    assert trace_level(True) == LEVELS["decisions"] and trace_level("candidates") == 3
+    try:
+        trace_level("verbose")
+        assert False
+    except ValueError:
+        pass
+
+    log = TraceLog(str(tmp_path / "s.npz"), 1, sample=0.25, satellites=["A"])
+    picked = [step for step in range(4000) if log.sampled(0, step)]
+    again = [step for step in range(4000) if log.sampled(0, step)]
+    log.close()
+    print(f"🎲 Sampled {len(picked)}/4000 steps")
+    assert picked == again and 800 < len(picked) < 1200
+
+def test_rejected_image_keeps_storage(tmp_path):
+    fleet = FleetState.from_configs([{"name": "A", "battery_wh": 100.0, "charge_rate_w": 10.0,
+                                      "imaging_power_w": 5.0, "downlink_power_w": 4.0, "idle_power_w": 1.0,
+                                      "storage_capacity_mb": 500.0, "downlink_bandwidth_mbps": 10.0}])
+    catalog = TargetCatalog.from_dicts([{"name": "T0", "lat": 0.0, "lon": 0.0}])
+    s = {"energy": fleet.energy_model(0), "data": fleet.data_model(0), "slew_model": None}
+    with TraceLog(str(tmp_path / "t.npz"), LEVELS["decisions"], satellites=["A"]) as log:
+        # A reserve the battery can never keep: the lookahead refuses the image
+        _, _, action, _ = _step_satellite(s, 0, 0, 0.0, _OneTargetGeometry(), fleet, catalog, 10, 180, 60,
+                                          reserve_wh=1e9, trace=log)
+        assert action == "idle" and fleet.stored_mb[0] == 0.0
+        assert log.counts[IMAGE, LOOKAHEAD] == 1 and log.counts[IMAGE, STORAGE] == 0
+        _, _, action, _ = _step_satellite(s, 0, 0, 0.0, _OneTargetGeometry(), fleet, catalog, 10, 180, 60,
+                                          reserve_wh=0.0, trace=log)
+        assert action == "image:T0" and fleet.stored_mb[0] == catalog.image_size_mb[0]
+    print("💾 Stored after a refused and an accepted image:", fleet.stored_mb[0])
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_trace_roundtrip_and_rejections(pathlib.Path(tmp))
+        test_levels_and_sampling(pathlib.Path(tmp))
+        test_rejected_image_keeps_storage(pathlib.Path(tmp))
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime, timezone
+import numpy as np
+from skyfield.api import load, EarthSatellite, wgs84
+from skyfield.framelib import itrs
+
+from core.visibility import build_time_grid, site_positions, elevation_matrix
+from core.scheduler import is_visible
+
+ISS_TLE = (
+    "1 25544U 98067A   20252.54846065  .00001264  00000-0  29621-4 0  9993",
+    "2 25544  51.6445  49.2431 0001235 131.1758 284.5727 15.49211630243154",
+)
+
+def test_elevation_matrix_matches_altaz():
+    ts = load.timescale()
+    sat = EarthSatellite(ISS_TLE[0], ISS_TLE[1], "ISS", ts)
+    sites = [
+        {"lat": 31.2304, "lon": 121.4737, "alt_m": 10},
+        {"lat": -23.5475, "lon": -46.63611},
+        {"lat": 51.5, "lon": -0.12},
+    ]
+    times = build_time_grid(ts, datetime(2025, 7, 17, tzinfo=timezone.utc), 60, 180)
+
+    sat_itrs = sat.at(times).frame_xyz(itrs).km.T
+    pos, up = site_positions(sites)
+    elev = elevation_matrix(sat_itrs, pos, up)
+    print("🛰️ Elevation matrix shape:", elev.shape)
+
+    for j, site in enumerate(sites):
+        loc = wgs84.latlon(site["lat"], site["lon"], elevation_m=site.get("alt_m", 0.0))
+        alt, _, _ = (sat - loc).at(times).altaz()
+        err = np.max(np.abs(alt.degrees - elev[:, j]))
+        print(f"📐 Max elevation error for site {j}: {err:.2e} deg")
+        assert err < 1e-6
+
+    # Scalar helper and matrix must agree on visibility at a sampled step
+    loc = wgs84.latlon(sites[0]["lat"], sites[0]["lon"], elevation_m=10)
+    step = int(np.argmax(elev[:, 0]))
+    assert is_visible(sat, loc, times[step], 10) == (elev[step, 0] > 10)
+
+if __name__ == "__main__":
+    test_elevation_matrix_matches_altaz()
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from core.targets import TargetCatalog
+from core.weather import CloudRaster, CloudCover, open_weather, raster_fingerprint
+
+START = "2025-07-15T00:00:00Z"
+T0 = 1752537600.0  # POSIX seconds of START
+
+def _raster(path, frames):
+    np.save(path, frames)
+    return str(path)
+
+def test_raster_lookup(tmp_path):
+    # 2 hourly frames on a 10-degree grid: frame 0 is lat / 100 (clipped) with one
+    # missing cell at (10, -130), frame 1 fully clear
+    lat = np.linspace(-90, 90, 19)
+    cube = np.zeros((2, 19, 37), dtype=np.float32)
+    cube[0] = np.clip(lat / 100.0, 0, 1)[:, None]
+    cube[0, 10, 5] = np.nan
+    path = _raster(tmp_path / "c.npy", cube)
+
+    raster = CloudRaster(path, T0, 3600)
+    y, x = raster.grid_coords([45.0, 55.0, 10.0, 30.0], [0.0, 12.0, -130.0, 540.0])
+    cloud = raster.sample(raster.frame_index(np.full(4, T0 - 60)), y, x)
+    print("☁️ Bilinear:", cloud)
+    assert np.allclose(cloud, [0.45, 0.55, 0.0, 0.30])
+    assert np.allclose(raster.sample(raster.frame_index(np.full(4, T0 + 99 * 3600)), y, x), 0.0)
+
+    nearest = CloudRaster(path, T0, 3600, interpolation="nearest")
+    assert np.allclose(nearest.sample(np.zeros(2, dtype=np.int64), *nearest.grid_coords([44.0, 46.0], [0.0, 0.0])),
+                       [0.4, 0.5])
+
+    # Cell-centred global grid (-175 to 175): east of the last column
+    # interpolates with the first one across the antimeridian
+    ring = np.zeros((1, 1, 36), dtype=np.float32)
+    ring[0, 0, 0], ring[0, 0, -1] = 1.0, 0.5
+    wrapped = CloudRaster(_raster(tmp_path / "w.npy", ring), T0, 3600, lat_range=(0.0, 0.0),
+                          lon_range=(-175.0, 175.0))
+    y, x = wrapped.grid_coords([0.0, 0.0, 0.0], [178.0, -178.0, 180.0])
+    assert np.allclose(wrapped.sample(np.zeros(3, dtype=np.int64), y, x), [0.65, 0.85, 0.75])
+
+    # Regional integer (percent) raster: off-grid points count as clear
+    regional = CloudRaster(_raster(tmp_path / "r.npy", np.full((1, 3, 3), 80, dtype=np.uint8)), T0, 3600,
+                           lat_range=(40.0, 60.0), lon_range=(0.0, 20.0))
+    y, x = regional.grid_coords([50.0, 50.0, 10.0], [10.0, 30.0, 10.0])
+    assert np.allclose(regional.sample(np.zeros(3, dtype=np.int64), y, x), [0.8, 0.0, 0.0])
+
+def test_cloud_cover_screens_targets(tmp_path):
+    cube = np.zeros((1, 19, 37), dtype=np.float32)
+    cube[0, 9:] = 0.9  # cloudy from the equator north
+    catalog = TargetCatalog.from_dicts([{"name": f"T{j}", "lat": lat, "lon": 5.0, "priority": p}
+                                        for j, (lat, p) in enumerate([(-30.0, 1), (30.0, 5), (-60.0, 2)])])
+    scenario = {"start_time": START, "weather_model": "cloud_raster",
+                "cloud_raster": _raster(tmp_path / "c.npy", cube)}
+    cover = open_weather(scenario, catalog)
+    clear, weight = cover.screen(T0, np.arange(3))
+    assert clear.tolist() == [True, False, True] and weight is None
+    assert catalog.select_best(np.flatnonzero(clear)) == 2
+
+    # Ranking keeps cloudy targets up to max_cloud_fraction at reduced priority
+    cover = open_weather(dict(scenario, cloud_mode="rank", max_cloud_fraction=1.0), catalog)
+    clear, weight = cover.screen(T0, np.arange(3))
+    assert clear.all() and np.allclose(weight, [1.0, 0.1, 1.0])
+    assert catalog.select_best(np.arange(3)) == 1 and catalog.select_best(np.arange(3), weight) == 2
+
+    # Bulk (planner) lookups match per-step ones
+    ids = np.tile(np.arange(3), 3)
+    assert np.array_equal(cover.cloud(np.full(9, T0), ids), np.tile(cover.cloud(T0, np.arange(3)), 3))
+
+    assert open_weather({"start_time": START}, catalog) is None
+    assert raster_fingerprint({"start_time": START}) is None and raster_fingerprint(scenario) is not None
+    for bad in (dict(scenario, weather_model="radar"), dict(scenario, cloud_raster=str(tmp_path / "missing.npy")),
+                dict(scenario, cloud_mode="avoid")):
+        try:
+            open_weather(bad, catalog)
+            assert False, bad
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    with tempfile.TemporaryDirectory() as tmp:
+        test_raster_lookup(pathlib.Path(tmp))
+        test_cloud_cover_screens_targets(pathlib.Path(tmp))
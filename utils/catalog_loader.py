@@ -0,0 +1,181 @@
+import csv
+import os
+import numpy as np
+from utils.config_loader import load_yaml
+
+# Bump when the compiled layout changes, so old cache files are rebuilt
+CATALOG_CACHE_VERSION = 1
+
+REQUIRED = ("name", "lat", "lon")
+
+# Optional numeric columns and the value used where one is missing
+DEFAULTS = {
+    "alt_m": 0.0,
+    "priority": 1,
+    "revisit_hours": 12,
+    "image_size_mb": 50,
+    "image_energy_wh": 5,
+}
+
+NUMERIC = ("lat", "lon") + tuple(DEFAULTS)
+
+
+def _read_yaml(path):
+    raw = load_yaml(path)
+    raw = raw if isinstance(raw, list) else (raw or {}).get("targets", [])
+    keys = dict.fromkeys(k for t in raw for k in t)
+    return {k: [t.get(k) for t in raw] for k in keys}
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        rows = [r for r in reader if r]
+    values = list(zip(*rows)) if rows else [()] * len(header)
+    return {h: np.asarray(v, dtype=str) for h, v in zip(header, values)}
+
+
+def _read_npz(path):
+    with np.load(path, allow_pickle=False) as npz:
+        return {k: npz[k] for k in npz.files}
+
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet target catalogs require pyarrow (pip install pyarrow)") from e
+    table = pyarrow.parquet.read_table(path)
+    return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+
+READERS = {
+    ".yaml": _read_yaml,
+    ".yml": _read_yaml,
+    ".csv": _read_csv,
+    ".npz": _read_npz,
+    ".parquet": _read_parquet,
+}
+
+
+def _numeric(name, values, n):
+    """Float column; None, NaN and empty strings count as missing (NaN)."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "US":
+        arr = np.where(np.char.strip(arr) == "", "nan", arr)
+    try:
+        arr = np.asarray(arr, dtype=float)
+    except (TypeError, ValueError):
+        for k, v in enumerate(values):
+            try:
+                float("nan" if v is None or v == "" else v)
+            except (TypeError, ValueError):
+                raise ValueError(f"Target {k}: '{name}' is not a number: {v!r}") from None
+        raise
+    if arr.shape != (n,):
+        raise ValueError(f"Target column '{name}' has {arr.size} values, expected {n}")
+    return arr
+
+
+def normalize_columns(raw):
+    """
+    Validate raw target columns and fill in defaults, column by column.
+
+    Args:
+        raw (dict): {column: sequence}; needs name, lat and lon, takes the
+            optional DEFAULTS columns and ignores any others.
+
+    Returns:
+        dict: name (str array) plus one float array per NUMERIC column.
+
+    Raises:
+        ValueError: On a missing required column, a non-numeric or
+            missing required value, or a latitude outside [-90, 90].
+    """
+    missing = [k for k in REQUIRED if k not in raw]
+    if missing:
+        raise ValueError(f"Target catalog is missing column(s) {missing}")
+    names = np.asarray(raw["name"])
+    n = len(names)
+    if names.dtype.kind not in "US":
+        blank = [k for k, v in enumerate(names) if v is None]
+        if blank:
+            raise ValueError(f"Target {blank[0]}: missing 'name'")
+        names = names.astype(str)
+
+    columns = {"name": names}
+    for key in NUMERIC:
+        if key not in raw:
+            columns[key] = np.full(n, float(DEFAULTS[key]))
+            continue
+        arr = _numeric(key, raw[key], n)
+        gaps = np.isnan(arr)
+        if gaps.any():
+            if key in REQUIRED:
+                raise ValueError(f"Target {int(np.argmax(gaps))}: missing '{key}'")
+            arr[gaps] = DEFAULTS[key]
+        columns[key] = arr
+
+    bad = np.flatnonzero(np.abs(columns["lat"]) > 90)
+    if bad.size:
+        raise ValueError(f"Target {bad[0]}: latitude {columns['lat'][bad[0]]} outside [-90, 90]")
+    return columns
+
+
+def cache_path(path):
+    """Compiled .npz kept next to a text catalog: 'dir/.name.ext.npz'."""
+    head, tail = os.path.split(path)
+    return os.path.join(head, f".{tail}.npz")
+
+
+def _read_cache(path, source):
+    try:
+        with np.load(cache_path(path), allow_pickle=False) as npz:
+            stamp = npz["_source"]
+            if (int(stamp[0]), int(stamp[1]), int(stamp[2])) != (
+                    CATALOG_CACHE_VERSION, source.st_mtime_ns, source.st_size):
+                return None
+            return {k: npz[k] for k in npz.files if k != "_source"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_cache(path, source, columns):
+    target = cache_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp.npz"
+    try:
+        np.savez(tmp, _source=np.array([CATALOG_CACHE_VERSION, source.st_mtime_ns, source.st_size]),
+                 **columns)
+        os.replace(tmp, target)
+    except OSError:
+        # Read-only catalog directory: just go without the cache
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_target_columns(path, cache=True):
+    """
+    Target catalog file as validated columns (see normalize_columns()).
+
+    YAML (a list, or a mapping with 'targets'), CSV with a header row,
+    .npz with one array per column, and Parquet (needs pyarrow) are read.
+    For YAML and CSV, `cache` keeps a compiled .npz next to the file
+    (see cache_path()) and reuses it until the file's mtime or size
+    changes.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unknown target catalog format '{ext}'; use one of {sorted(READERS)}")
+    compiled = cache and ext in (".yaml", ".yml", ".csv")
+    if compiled:
+        source = os.stat(path)
+        columns = _read_cache(path, source)
+        if columns is not None:
+            return columns
+    columns = normalize_columns(READERS[ext](path))
+    if compiled:
+        _write_cache(path, source, columns)
+    return columns
@@ -2,9 +2,24 @@ import yaml
 from datetime import datetime, timedelta
 
 
+# libyaml's C parser when PyYAML was built with it; same results, much faster
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def load_yaml(path):
     with open(path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def parse_start_time(value):
+    """Accept a datetime or an ISO string, with or without a trailing 'Z'."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except Exception:
+            # fallback: try parsing without timezone
+            return datetime.fromisoformat(value)
+    return value
 
 
 def normalize_ground_stations(gs_list):
@@ -24,10 +39,8 @@ def normalize_ground_stations(gs_list):
 
 def load_scenario(path="scenario.yaml"):
     data = load_yaml(path)
-    print("Loaded scenario data:", data)  #
     sim = data.get("simulation", {})
-    print("sim:", sim)
-    start_time = datetime.fromisoformat(sim["start_time"].replace("Z", "+00:00"))
+    start_time = parse_start_time(sim["start_time"])
 
     return {
         "name": data.get("scenario_name", "UnnamedScenario"),
@@ -35,8 +48,29 @@ def load_scenario(path="scenario.yaml"):
         "duration_minutes": sim["duration_minutes"],
         "timestep_sec": sim.get("timestep_seconds", 60),
         "weather_model": sim.get("weather_model", "clear_only"),
+        "cloud_raster": sim.get("cloud_raster"),
+        "cloud_raster_start": sim.get("cloud_raster_start"),
+        "cloud_frame_minutes": sim.get("cloud_frame_minutes", 60),
+        "cloud_lat_range": sim.get("cloud_lat_range", [-90.0, 90.0]),
+        "cloud_lon_range": sim.get("cloud_lon_range", [-180.0, 180.0]),
+        "cloud_interpolation": sim.get("cloud_interpolation", "bilinear"),
+        "max_cloud_fraction": sim.get("max_cloud_fraction", 0.5),
+        "cloud_mode": sim.get("cloud_mode", "skip"),
         "min_elevation_deg": sim.get("min_elevation_deg", 15),
         "imaging_mode": sim.get("imaging_mode", "priority"),
+        "stepping": sim.get("stepping", "fixed"),
+        "energy_integration": sim.get("energy_integration", "step"),
+        "output_format": sim.get("output_format"),
+        "lookahead": sim.get("lookahead", "oracle"),
+        "scheduler_mode": sim.get("scheduler_mode", "greedy"),
+        "workers": sim.get("workers", 1),
+        "contact_plan": sim.get("contact_plan", False),
+        "profile": sim.get("profile", False),
+        "result_cache": sim.get("result_cache", False),
+        "checkpoint_path": sim.get("checkpoint_path"),
+        "checkpoint_every_minutes": sim.get("checkpoint_every_minutes"),
+        "trace": sim.get("trace"),
+        "trace_sample": sim.get("trace_sample", 1.0),
         "satellites": data["satellites"],
         "ground_stations": normalize_ground_stations(data.get("ground_stations", [
             {"name": "DefaultGS", "lat": 0.0, "lon": 0.0, "alt_m": 0.0}
@@ -49,11 +83,8 @@ def load_targets(path="targets.yaml"):
     return targets if isinstance(targets, list) else targets.get("targets", [])
 
 
-def load_configs(scenario_path="scenario.yaml", targets_path="targets.yaml"):
-    scenario = load_scenario(scenario_path)
-    raw_targets = load_targets(targets_path)
-
-    # Normalize and validate target fields
+def normalize_targets(raw_targets):
+    """Target dicts with every field the scheduler reads, defaults filled in."""
     targets = []
     for t in raw_targets:
         targets.append({
@@ -65,6 +96,14 @@ def load_configs(scenario_path="scenario.yaml", targets_path="targets.yaml"):
             "image_size_mb": t.get("image_size_mb", 50), 
             "image_energy_wh": t.get("image_energy_wh", 5) 
         })
+    return targets
+
+
+def load_configs(scenario_path="scenario.yaml", targets_path="targets.yaml"):
+    scenario = load_scenario(scenario_path)
+    raw_targets = load_targets(targets_path)
+
+    targets = normalize_targets(raw_targets)
 
     start_time = scenario["start_time"]
     duration = timedelta(minutes=scenario["duration_minutes"])